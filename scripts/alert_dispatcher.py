@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Background alert dispatcher: queued, rate-limited and coalescing
+
+Callers submit() and return immediately; one worker thread delivers alerts
+through a sink, so a slow SMS API never holds up the test loop.
+
+- Rate limits: at most N alerts per priority per window (RATE_LIMITS).
+  CRITICAL is never limited or coalesced.
+- Coalescing: the first alert for a category (or priority, if none is given)
+  goes out at once and opens a COALESCE_WINDOW. Alerts arriving inside the
+  window, or held back by the rate limit, are counted, and one summary is sent
+  when the window closes, e.g. "37 failures in last 5 min; latest: ...".
+- Sinks are any object with send(message, priority) -> bool. twilio_alert
+  provides the SMS sink. LogSink and ConsoleSink let the dispatcher run
+  offline.
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+PRIORITIES = ["INFO", "MEDIUM", "HIGH", "CRITICAL"]
+
+# (max alerts, per seconds) for each priority; CRITICAL is unlimited
+RATE_LIMITS = {
+    "INFO": (4, 3600),
+    "MEDIUM": (6, 3600),
+    "HIGH": (10, 3600),
+}
+COALESCE_WINDOW = 300
+QUEUE_SIZE = 1000
+
+
+class ConsoleSink:
+    """Print alerts to stdout"""
+
+    def send(self, message: str, priority: str) -> bool:
+        print(f"[{priority}] FLOWBOTS: {message}")
+        return True
+
+
+class LogSink:
+    """Append alerts as JSON lines to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, message: str, priority: str) -> bool:
+        entry = {"timestamp": datetime.now().isoformat(), "priority": priority, "message": message}
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return True
+
+
+class Alert:
+    def __init__(self, message: str, priority: str, category: Optional[str]):
+        self.message = message
+        self.priority = priority if priority in PRIORITIES else "INFO"
+        self.category = category
+        self.created = time.time()
+
+    @property
+    def key(self) -> str:
+        return self.category or self.priority
+
+
+class AlertDispatcher:
+    """Deliver alerts from a queue on a background thread"""
+
+    def __init__(
+        self,
+        sink,
+        rate_limits: Dict[str, tuple] = None,
+        coalesce_window: float = COALESCE_WINDOW,
+        queue_size: int = QUEUE_SIZE,
+    ):
+        self.sink = sink
+        self.rate_limits = RATE_LIMITS if rate_limits is None else rate_limits
+        self.coalesce_window = coalesce_window
+        self.stats = {"submitted": 0, "sent": 0, "coalesced": 0, "dropped": 0, "failed": 0}
+        self._queue: "queue.Queue[Optional[Alert]]" = queue.Queue(maxsize=queue_size)
+        self._sent: Dict[str, deque] = {}
+        # key -> {"start": float, "held": [Alert, ...]}
+        self._windows: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, message: str, priority: str = "INFO", category: str = None) -> bool:
+        """Queue an alert without blocking; False if the queue is full"""
+        self.start()
+        try:
+            self._queue.put_nowait(Alert(message, priority, category))
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["submitted"] += 1
+        return True
+
+    def close(self, timeout: float = 10):
+        """Drain the queue, send pending summaries and stop the worker"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                alert = self._queue.get(timeout=1)
+            except queue.Empty:
+                alert = False
+            if alert is None:
+                self._flush_windows(force=True)
+                return
+            if alert:
+                self._handle(alert)
+            self._flush_windows()
+
+    def _allow(self, priority: str, now: float) -> bool:
+        limit = self.rate_limits.get(priority)
+        if limit is None:
+            return True
+        count, period = limit
+        sent = self._sent.setdefault(priority, deque())
+        while sent and now - sent[0] >= period:
+            sent.popleft()
+        return len(sent) < count
+
+    def _deliver(self, message: str, priority: str):
+        self._sent.setdefault(priority, deque()).append(time.time())
+        try:
+            if self.sink.send(message, priority):
+                self.stats["sent"] += 1
+            else:
+                self.stats["failed"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            print(f"Failed to send alert: {e}")
+
+    def _handle(self, alert: Alert):
+        if alert.priority == "CRITICAL":
+            self._deliver(alert.message, alert.priority)
+            return
+
+        now = time.time()
+        window = self._windows.get(alert.key)
+        if window is None and self._allow(alert.priority, now):
+            self._deliver(alert.message, alert.priority)
+            self._windows[alert.key] = {"start": now, "held": []}
+            return
+
+        if window is None:
+            window = self._windows[alert.key] = {"start": now, "held": []}
+        window["held"].append(alert)
+        self.stats["coalesced"] += 1
+
+    def _flush_windows(self, force: bool = False):
+        now = time.time()
+        for key in list(self._windows):
+            window = self._windows[key]
+            if not force and now - window["start"] < self.coalesce_window:
+                continue
+            held: List[Alert] = window["held"]
+            if not held:
+                del self._windows[key]
+                continue
+            priority = max((a.priority for a in held), key=PRIORITIES.index)
+            if not force and not self._allow(priority, now):
+                continue
+            self._deliver(self.summary(key, held, now - window["start"]), priority)
+            del self._windows[key]
+
+    @staticmethod
+    def summary(key: str, held: List[Alert], elapsed: float) -> str:
+        if len(held) == 1:
+            return held[0].message
+        minutes = max(1, round(elapsed / 60))
+        label = held[-1].category or f"{key} alerts"
+        return f"{len(held)} {label} in last {minutes} min; latest: {held[-1].message}"
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Prebuilt index of source artifacts: (platform, tier, test_id) -> path
+
+Built with one os.scandir walk of artifacts_source/<platform>/<tier>/ and
+persisted with each tier directory's mtime, so a refresh only rescans the
+directories that changed since the last run. Lookups are dict hits.
+
+An artifact is indexed under every ID it can be asked for:
+- a test-ID token in its name (e.g. "S01" in "Simple_S01_File_Create.zip")
+- the test ID whose spec name it carries (e.g. "Simple_File_Create" -> S01)
+- its file stem (e.g. "Simple_File_Create"), as flowbots_converter uses
+"""
+
+import os
+import re
+import sys
+import json
+from typing import Optional, Dict, List, Tuple
+
+from create_uipath_simple import SIMPLE_TESTS
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+ARTIFACTS_SOURCE = os.path.join(LAB_DIR, "artifacts_source")
+INDEX_FILE = os.path.join(LAB_DIR, "cache", "artifact_index.json")
+
+# Primary artifact extension per platform directory
+PLATFORM_EXT = {
+    "uipath": ".nupkg",
+    "pad": ".zip",
+    "pacloud": ".json",
+    "blueprism": ".bprelease",
+    "aa": ".zip",
+}
+
+# Map directory names to API platform names
+DIR_TO_API = {
+    "uipath": "uipath",
+    "pad": "powerAutomate",
+    "pacloud": "powerAutomateCloud",
+    "blueprism": "bluePrism",
+    "aa": "automationAnywhere",
+}
+
+API_TO_DIR = {v: k for k, v in DIR_TO_API.items()}
+
+# Spec names per tier, used to recover test IDs from descriptive file names
+TIER_SPEC_NAMES = {
+    "simple": {name.upper(): test_id for test_id, (name, _) in SIMPLE_TESTS.items()},
+}
+
+TEST_ID_PATTERN = re.compile(r"^(S|M|C|SC|E)\d{2}$", re.IGNORECASE)
+KNOWN_EXTENSIONS = (".bprelease.zip", ".nupkg", ".zip", ".bprelease", ".json")
+
+
+def split_ext(filename: str) -> Tuple[str, str]:
+    """Split off a known artifact extension (handles .bprelease.zip)"""
+    lower = filename.lower()
+    for ext in KNOWN_EXTENSIONS:
+        if lower.endswith(ext):
+            return filename[: -len(ext)], ext
+    return os.path.splitext(filename)
+
+
+def artifact_ids(filename: str, tier: str) -> List[str]:
+    """Every (upper-case) ID a file should be found under"""
+    stem, _ = split_ext(filename)
+    ids = [stem.upper()]
+    parts = stem.split("_")
+    ids.extend(part.upper() for part in parts if TEST_ID_PATTERN.match(part))
+
+    names = TIER_SPEC_NAMES.get(tier, {})
+    if len(parts) > 1 and parts[0].lower() == tier:
+        spec_id = names.get("_".join(parts[1:]).upper())
+        if spec_id:
+            ids.append(spec_id)
+    return ids
+
+
+class ArtifactIndex:
+    """Persisted, incrementally refreshed artifact lookup table"""
+
+    def __init__(self, root: str = ARTIFACTS_SOURCE, index_path: str = INDEX_FILE):
+        self.root = root
+        self.index_path = index_path
+        # "platform/tier" -> {"path": str, "mtime_ns": int, "files": [filename, ...]}
+        self.dirs: Dict[str, Dict] = {}
+        self._lookup: Dict[Tuple[str, str, str], str] = {}
+        self._load()
+
+    def _load(self):
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("root") == self.root:
+            self.dirs = data.get("dirs", {})
+            self._rebuild_lookup()
+
+    def save(self):
+        if not self.index_path:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"root": self.root, "dirs": self.dirs}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self) -> int:
+        """Rescan tier directories whose mtime changed; returns how many were rescanned"""
+        seen = set()
+        rescanned = 0
+        if os.path.isdir(self.root):
+            for platform_entry in os.scandir(self.root):
+                if not platform_entry.is_dir():
+                    continue
+                for tier_entry in os.scandir(platform_entry.path):
+                    if not tier_entry.is_dir():
+                        continue
+                    key = f"{platform_entry.name}/{tier_entry.name.lower()}"
+                    seen.add(key)
+                    mtime_ns = tier_entry.stat().st_mtime_ns
+                    cached = self.dirs.get(key)
+                    if cached and cached.get("mtime_ns") == mtime_ns:
+                        continue
+                    files = sorted(e.name for e in os.scandir(tier_entry.path) if e.is_file())
+                    self.dirs[key] = {"path": tier_entry.path, "mtime_ns": mtime_ns, "files": files}
+                    rescanned += 1
+
+        removed = [key for key in self.dirs if key not in seen]
+        for key in removed:
+            del self.dirs[key]
+
+        if rescanned or removed:
+            self._rebuild_lookup()
+            self.save()
+        return rescanned
+
+    def _rebuild_lookup(self):
+        lookup = {}
+        for key, entry in self.dirs.items():
+            platform, tier = key.split("/", 1)
+            primary_ext = PLATFORM_EXT.get(platform, ".zip")
+            dir_path = entry["path"]
+            # Primary-extension files last, so they win over companions
+            # such as the .bprelease.zip next to each .bprelease
+            ordered = sorted(entry["files"], key=lambda f: split_ext(f)[1] == primary_ext)
+            for filename in ordered:
+                for test_id in artifact_ids(filename, tier):
+                    lookup[(platform, tier, test_id)] = os.path.join(dir_path, filename)
+        self._lookup = lookup
+
+    def find(self, platform: str, tier: str, test_id: str) -> Optional[str]:
+        """Path of the artifact for a test, or None"""
+        return self._lookup.get((platform, tier.lower(), test_id.upper()))
+
+    def list(self, platform: str, tier: str, ext: str = None) -> List[str]:
+        """Sorted artifact paths in a tier directory, optionally filtered by extension"""
+        entry = self.dirs.get(f"{platform}/{tier.lower()}")
+        if not entry:
+            return []
+        dir_path = entry["path"]
+        return [
+            os.path.join(dir_path, f)
+            for f in entry["files"]
+            if ext is None or split_ext(f)[1] == ext
+        ]
+
+    def count(self, platform: str, tier: str) -> int:
+        return len(self.dirs.get(f"{platform}/{tier.lower()}", {}).get("files", []))
+
+
+_shared_index: Optional[ArtifactIndex] = None
+
+
+def get_index(root: str = ARTIFACTS_SOURCE) -> ArtifactIndex:
+    """Process-wide index, refreshed once on first use"""
+    global _shared_index
+    if _shared_index is None or _shared_index.root != root:
+        _shared_index = ArtifactIndex(root)
+        _shared_index.refresh()
+    return _shared_index
+
+
+if __name__ == "__main__":
+    index = ArtifactIndex(sys.argv[1] if len(sys.argv) > 1 else ARTIFACTS_SOURCE)
+    print(f"Rescanned {index.refresh()} directories")
+    for key, entry in sorted(index.dirs.items()):
+        print(f"  {key}: {len(entry['files'])} artifacts")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Structural validation of converted artifacts, straight from the zip
+
+Nothing is extracted to disk: each relevant member is streamed out of the
+archive. XAML and .bprelease go through ElementTree.iterparse, project.json and
+package.json through json, and Robin .pad scripts through a line parser.
+Checks:
+
+- required files for the target platform are present and non-empty
+- every XML/JSON member is well-formed; Robin blocks are balanced
+- the activity count is not below the source artifact's
+
+Activities are leaf actions: XAML elements that are not containers or
+property elements, Blue Prism stages other than Start/End/Data/structure,
+and Robin action/SET lines.
+
+Usage:
+    python artifact_validator.py <converted.zip|dir> [target_platform] [source_artifact]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Optional, Dict, Any, List, IO
+
+# XAML elements that structure a workflow rather than act
+XAML_NON_ACTIVITIES = {
+    "Activity", "Sequence", "If", "ForEach", "While", "DoWhile", "TryCatch", "Catch", "Flowchart",
+    "FlowStep", "FlowDecision", "Switch", "Variable", "InArgument", "OutArgument", "InOutArgument",
+    "Members", "Property", "TextExpression", "Literal", "Reference", "AssemblyReference",
+}
+# Blue Prism stage types that are not actions
+BP_NON_ACTIONS = {"Start", "End", "Data", "Collection", "SubSheet", "SubSheetInfo", "Block", "Anchor", "Note",
+                  "LoopStart", "LoopEnd", "Recover", "Resume", "Decision", "ChoiceStart", "ChoiceEnd"}
+
+ROBIN_ACTION = re.compile(r"^[A-Z][A-Za-z0-9]*(\.[A-Za-z0-9]+)+\b")
+ROBIN_OPENERS = re.compile(r"^(IF\b.*\bTHEN$|LOOP\b|WHILE\b|BLOCK\b|ON BLOCK ERROR\b|FUNCTION\b|SWITCH\b|[A-Z][A-Za-z0-9]*\.If)")
+ROBIN_CLOSERS = re.compile(r"^END( FUNCTION| IF| LOOP| SWITCH| BLOCK)?$")
+
+# Required members per target platform (API names); "*.ext" means at least one
+REQUIRED_FILES = {
+    "flowbots": ["package.json"],
+    "uipath": ["project.json", "*.xaml"],
+    "powerAutomate": ["*.pad"],
+    "bluePrism": ["*.bprelease"],
+}
+# Targets whose activities can be counted and compared with the source
+COUNTED_TARGETS = {"uipath", "powerAutomate", "bluePrism"}
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def count_xaml(stream: IO[bytes]) -> int:
+    """Leaf activities in a XAML document (raises ET.ParseError if malformed)"""
+    count = 0
+    for _, elem in ET.iterparse(stream, events=("start",)):
+        name = _local(elem.tag)
+        if "." not in name and name not in XAML_NON_ACTIVITIES:
+            count += 1
+    return count
+
+
+def count_bprelease(stream: IO[bytes]) -> int:
+    """Action stages in a Blue Prism release (raises ET.ParseError if malformed)"""
+    count = 0
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if _local(elem.tag) == "stage":
+            if elem.get("type") not in BP_NON_ACTIONS:
+                count += 1
+            elem.clear()
+    return count
+
+
+def parse_robin(lines) -> Dict[str, Any]:
+    """Action count and block balance of a Robin script"""
+    actions = depth = 0
+    errors = []
+    for number, raw in enumerate(lines, 1):
+        line = (raw.decode("utf-8", "replace") if isinstance(raw, bytes) else raw).strip()
+        if not line or line.startswith("#"):
+            continue
+        if ROBIN_CLOSERS.match(line):
+            depth -= 1
+            if depth < 0:
+                errors.append(f"line {number}: END without open block")
+                depth = 0
+            continue
+        if ROBIN_ACTION.match(line) or line.startswith("SET "):
+            actions += 1
+        if ROBIN_OPENERS.match(line):
+            depth += 1
+    if depth:
+        errors.append(f"{depth} unclosed block(s)")
+    return {"activities": actions, "errors": errors}
+
+
+def _check_required(names: List[str], platform: str) -> List[str]:
+    errors = []
+    basenames = {n.rsplit("/", 1)[-1] for n in names}
+    for required in REQUIRED_FILES.get(platform, []):
+        if required.startswith("*"):
+            if not any(n.endswith(required[1:]) for n in basenames):
+                errors.append(f"missing {required} file")
+        elif required not in basenames:
+            errors.append(f"missing {required}")
+    return errors
+
+
+def inspect_zip(zf: zipfile.ZipFile, platform: str = None) -> Dict[str, Any]:
+    """Well-formedness and activity count of every member that can be parsed"""
+    report = {"files": 0, "activities": 0, "errors": [], "warnings": []}
+    names = [info.filename for info in zf.infolist() if not info.is_dir()]
+    report["files"] = len(names)
+    by_name = {n.rsplit("/", 1)[-1]: n for n in names}
+
+    if platform:
+        report["errors"].extend(_check_required(names, platform))
+
+    for info in zf.infolist():
+        if info.is_dir():
+            continue
+        name = info.filename
+        lower = name.lower()
+        if info.file_size == 0 and lower.endswith((".xaml", ".json", ".pad", ".bprelease", ".js")):
+            report["errors"].append(f"{name}: empty file")
+            continue
+        try:
+            with zf.open(info) as stream:
+                if lower.endswith(".xaml"):
+                    report["activities"] += count_xaml(stream)
+                elif lower.endswith(".bprelease"):
+                    report["activities"] += count_bprelease(stream)
+                elif lower.endswith(".pad"):
+                    robin = parse_robin(stream)
+                    report["activities"] += robin["activities"]
+                    report["errors"].extend(f"{name}: {e}" for e in robin["errors"])
+                elif lower.endswith(".json"):
+                    data = json.load(stream)
+                    entry = data.get("main") if isinstance(data, dict) else None
+                    base = name.rsplit("/", 1)[-1]
+                    if base == "project.json" and not entry:
+                        report["errors"].append(f"{name}: no main workflow")
+                    if base in ("project.json", "package.json"):
+                        entry = entry or ("index.js" if base == "package.json" else None)
+                        if entry and entry.rsplit("/", 1)[-1] not in by_name:
+                            report["errors"].append(f"{name}: main file {entry} missing")
+        except (ET.ParseError, ValueError) as e:
+            report["errors"].append(f"{name}: malformed ({e})")
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError) as e:
+            report["errors"].append(f"{name}: unreadable ({e})")
+    return report
+
+
+def count_source_activities(path: str) -> Optional[int]:
+    """Activity count of a source artifact (.nupkg/.zip/.bprelease[.zip]), or None"""
+    try:
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as zf:
+                report = inspect_zip(zf)
+            return None if report["errors"] else report["activities"]
+        with open(path, "rb") as f:
+            if path.lower().endswith(".bprelease"):
+                return count_bprelease(f)
+            if path.lower().endswith(".xaml"):
+                return count_xaml(f)
+            if path.lower().endswith(".pad"):
+                return parse_robin(f)["activities"]
+    except (ET.ParseError, ValueError, OSError, zipfile.BadZipFile):
+        return None
+    return None
+
+
+def validate_artifact(
+    path: str,
+    target_platform: str = None,
+    source_path: str = None,
+) -> Dict[str, Any]:
+    """Validate one converted zip; "ok" is False on any error"""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            report = inspect_zip(zf, target_platform)
+    except (zipfile.BadZipFile, OSError) as e:
+        return {"ok": False, "errors": [f"not a readable zip: {e}"], "warnings": [], "files": 0, "activities": 0}
+
+    if source_path:
+        source_count = count_source_activities(source_path)
+        report["source_activities"] = source_count
+        if source_count is None:
+            report["warnings"].append("source activity count unavailable")
+        elif target_platform in COUNTED_TARGETS and report["activities"] < source_count:
+            report["errors"].append(f"{report['activities']} activities, source has {source_count}")
+
+    report["ok"] = not report["errors"]
+    return report
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+    target = sys.argv[1]
+    platform = sys.argv[2] if len(sys.argv) > 2 else None
+    source = sys.argv[3] if len(sys.argv) > 3 else None
+
+    if os.path.isdir(target):
+        paths = [os.path.join(root, f) for root, _, files in os.walk(target) for f in files if f.endswith(".zip")]
+    else:
+        paths = [target]
+
+    start = time.perf_counter()
+    failed = 0
+    for path in paths:
+        report = validate_artifact(path, platform, source)
+        if not report["ok"]:
+            failed += 1
+            print(f"FAIL {path}: {'; '.join(report['errors'])}")
+    elapsed = time.perf_counter() - start
+    rate = len(paths) / elapsed if elapsed > 0 else 0
+    print(f"{len(paths) - failed}/{len(paths)} valid ({rate:.0f} artifacts/s)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
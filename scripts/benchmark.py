@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the conversion harness
+
+Drives run_conversion_test (sync, thread pool over one FlowBotsClient) and
+run_conversion_tests_async (one AsyncFlowBotsClient) at increasing concurrency
+against a configurable endpoint, normally mock_flowbots_server.py. Per level
+it reports jobs/sec, p50/p95/p99 end-to-end job latency, client CPU and RSS,
+and the share of requests that reused a pooled connection.
+
+Each level gets a private retry policy and circuit breaker and an unlimited
+rate limiter, so the numbers measure the harness rather than the token
+buckets, and a run neither spends nor trips the machine-wide budget that real
+conversions share.
+
+End-to-end latency is the sum of a job's upload, queue_wait, processing and
+download spans, so cache hits and connect probes do not skew it.
+
+Reports are written to results/benchmarks/; --save-baseline NAME stores one as
+a baseline and --compare NAME flags throughput or latency regressions against
+it (exit code 1).
+
+Usage:
+    python mock_flowbots_server.py --latency fixed:0.5 --workers 64 &
+    python benchmark.py --base-url http://127.0.0.1:8765 --levels 1,4,16 --save-baseline main
+    python benchmark.py --base-url http://127.0.0.1:8765 --levels 1,4,16 --compare main
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import zipfile
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from flowbots_converter import API_BASE, FlowBotsClient, run_conversion_test
+from polling import AdaptivePoller
+from retry import RetryPolicy, CircuitBreaker
+from rate_limiter import RateLimiter
+from artifact_index import get_index
+from timing import percentile
+
+try:
+    from flowbots_async import AsyncFlowBotsClient, run_conversion_tests_async
+except ImportError:
+    AsyncFlowBotsClient = None
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+BENCHMARK_DIR = os.path.join(LAB_DIR, "results", "benchmarks")
+DEFAULT_LEVELS = [1, 2, 4, 8, 16]
+# Jobs per level: JOBS_PER_WORKER per concurrent worker, at least MIN_JOBS
+JOBS_PER_WORKER = 4
+MIN_JOBS = 8
+
+# Regression thresholds against a baseline, as fractions
+THROUGHPUT_DROP = 0.10
+LATENCY_RISE = 0.15
+
+E2E_PHASES = ["upload", "queue_wait", "processing", "download"]
+
+
+def rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB (peak RSS without psutil)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+    return None
+
+
+def end_to_end_ms(result: Dict[str, Any]) -> Optional[float]:
+    timings = result.get("timings") or {}
+    spans = [timings[phase]["ms"] for phase in E2E_PHASES if phase in timings]
+    return sum(spans) if spans else None
+
+
+def summarize(
+    mode: str,
+    level: int,
+    results: List[Dict[str, Any]],
+    wall: float,
+    cpu: float,
+    connections: Dict[str, int],
+) -> Dict[str, Any]:
+    """One report row for a concurrency level"""
+    latencies = [ms for ms in map(end_to_end_ms, results) if ms is not None]
+    statuses = {}
+    for r in results:
+        statuses[r["status"]] = statuses.get(r["status"], 0) + 1
+    completed = statuses.get("success", 0) + statuses.get("failed", 0) + statuses.get("invalid", 0)
+    used = connections["created"] + connections["reused"]
+    rss = rss_mb()
+    return {
+        "mode": mode,
+        "concurrency": level,
+        "jobs": len(results),
+        "statuses": statuses,
+        "wall_s": round(wall, 3),
+        "jobs_per_sec": round(completed / wall, 3) if wall > 0 else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "cpu_percent": round(cpu / wall * 100, 1) if wall > 0 else None,
+        "rss_mb": round(rss, 1) if rss is not None else None,
+        "connections_created": connections["created"],
+        "connection_reuse_rate": round(connections["reused"] / used, 3) if used else None,
+    }
+
+
+def isolated(output_root: str) -> Dict[str, Any]:
+    """Client arguments that keep a benchmark level off the process-wide state"""
+    return {
+        "poller": AdaptivePoller(),
+        "retry": RetryPolicy(breaker=CircuitBreaker()),
+        "limiter": RateLimiter(os.path.join(output_root, "rate_limits.json"), limits={}),
+    }
+
+
+def run_sync_level(args, level: int, jobs: int, output_root: str) -> Dict[str, Any]:
+    """jobs conversions on `level` threads sharing one FlowBotsClient"""
+    client = FlowBotsClient(base_url=args.base_url, **isolated(output_root))
+
+    def one(i: int) -> Dict[str, Any]:
+        return run_conversion_test(
+            client, args.artifact, args.source, args.target, f"bench_sync_{level}_{i:04d}",
+            output_root=output_root,
+        )
+
+    cpu_start, start = time.process_time(), time.perf_counter()
+    with ThreadPoolExecutor(max_workers=level) as pool:
+        results = list(pool.map(one, range(jobs)))
+    wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    return summarize("sync", level, results, wall, cpu, client.connection_stats())
+
+
+def run_async_level(args, level: int, jobs: int, output_root: str) -> Dict[str, Any]:
+    """jobs conversions with `level` in flight on one AsyncFlowBotsClient"""
+    tests = [(args.artifact, args.source, args.target, f"bench_async_{level}_{i:04d}") for i in range(jobs)]
+
+    async def run():
+        async with AsyncFlowBotsClient(
+            base_url=args.base_url,
+            max_concurrency=max(level, 1),
+            pool_size=max(level, 1),
+            **isolated(output_root),
+        ) as client:
+            results = await run_conversion_tests_async(client, tests, max_jobs=level, output_root=output_root)
+            return results, dict(client.connection_stats)
+
+    cpu_start, start = time.process_time(), time.perf_counter()
+    results, connections = asyncio.run(run())
+    wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    return summarize("async", level, results, wall, cpu, connections)
+
+
+def default_artifact(tmp_dir: str) -> str:
+    """First UiPath simple artifact in the lab, else a small placeholder package"""
+    artifacts = get_index().list("uipath", "simple", ".nupkg")
+    if artifacts:
+        return artifacts[0]
+    path = os.path.join(tmp_dir, "Benchmark.1.0.0.nupkg")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("lib/net45/Main.xaml", '<Activity x:Class="Main" />')
+        zf.writestr("lib/net45/project.json", json.dumps({"name": "Benchmark", "main": "Main.xaml"}))
+    return path
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Regressions of report against baseline, one message per mode/level"""
+    previous = {(row["mode"], row["concurrency"]): row for row in baseline["levels"]}
+    regressions = []
+    for row in report["levels"]:
+        base = previous.get((row["mode"], row["concurrency"]))
+        if not base:
+            continue
+        label = f"{row['mode']} x{row['concurrency']}"
+        if base["jobs_per_sec"] and row["jobs_per_sec"] is not None:
+            if row["jobs_per_sec"] < base["jobs_per_sec"] * (1 - THROUGHPUT_DROP):
+                regressions.append(
+                    f"{label}: throughput {row['jobs_per_sec']} jobs/s vs baseline {base['jobs_per_sec']}"
+                )
+        for key in ["p95_ms", "p99_ms"]:
+            if base[key] and row[key] is not None and row[key] > base[key] * (1 + LATENCY_RISE):
+                regressions.append(f"{label}: {key} {row[key]:.0f} vs baseline {base[key]:.0f}")
+    return regressions
+
+
+def print_row(row: Dict[str, Any]):
+    def fmt(value, spec=".0f"):
+        return "-" if value is None else format(value, spec)
+
+    print(
+        f"  {row['mode']:<5} x{row['concurrency']:<4} jobs={row['jobs']:<5} "
+        f"{fmt(row['jobs_per_sec'], '.2f'):>7} jobs/s  "
+        f"p50={fmt(row['p50_ms'])}ms p95={fmt(row['p95_ms'])}ms p99={fmt(row['p99_ms'])}ms  "
+        f"cpu={fmt(row['cpu_percent'], '.1f')}% rss={fmt(row['rss_mb'], '.0f')}MB  "
+        f"reuse={fmt(row['connection_reuse_rate'], '.0%')} ({row['connections_created']} conns)"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Conversion harness throughput benchmark")
+    parser.add_argument("--base-url", default=API_BASE)
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--levels", default=",".join(map(str, DEFAULT_LEVELS)),
+                        help="comma-separated concurrency levels")
+    parser.add_argument("--jobs", type=int, default=None, help="jobs per level (default scales with level)")
+    parser.add_argument("--artifact", default=None, help="source file to convert")
+    parser.add_argument("--source", default="uipath")
+    parser.add_argument("--target", default="flowbots")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument("--verbose", action="store_true", help="show per-job progress output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    levels = [int(level) for level in args.levels.split(",") if level]
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+    if "async" in modes and AsyncFlowBotsClient is None:
+        print("aiohttp not installed; skipping async mode")
+        modes.remove("async")
+
+    print("=" * 60)
+    print(f"Conversion harness benchmark: {args.base_url}")
+    print("=" * 60)
+
+    report = {
+        "created": datetime.now().isoformat(),
+        "base_url": args.base_url,
+        "direction": f"{args.source}->{args.target}",
+        "levels": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="flowbots_bench_") as tmp_dir:
+        args.artifact = args.artifact or default_artifact(tmp_dir)
+        report["artifact"] = args.artifact
+        print(f"Artifact: {args.artifact}\n")
+
+        for mode in modes:
+            run_level = run_sync_level if mode == "sync" else run_async_level
+            for level in levels:
+                jobs = args.jobs or max(MIN_JOBS, level * JOBS_PER_WORKER)
+                output_root = os.path.join(tmp_dir, f"{mode}_{level}")
+                if args.verbose:
+                    row = run_level(args, level, jobs, output_root)
+                else:
+                    with redirect_stdout(io.StringIO()):
+                        row = run_level(args, level, jobs, output_root)
+                report["levels"].append(row)
+                print_row(row)
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    report_path = os.path.join(BENCHMARK_DIR, f"run_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport: {report_path}")
+
+    if args.save_baseline:
+        baseline_path = os.path.join(BENCHMARK_DIR, f"baseline_{args.save_baseline}.json")
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved: {baseline_path}")
+
+    if args.compare:
+        baseline_path = os.path.join(BENCHMARK_DIR, f"baseline_{args.compare}.json")
+        with open(baseline_path) as f:
+            regressions = compare(report, json.load(f))
+        if regressions:
+            print(f"\nRegressions vs baseline '{args.compare}':")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions vs baseline '{args.compare}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Append-only checkpoint journal of completed tests
+
+One line per finished test ("<test_id>\t<status>"), flushed and fsync'd before
+record() returns, so a crash or reboot loses at most the test that was running.
+A torn final line from a crash mid-write is cut off before the file is
+appended to again, so the next record cannot merge with it.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+TAIL_CHUNK = 4096
+
+
+def truncate_torn_tail(path: str) -> int:
+    """Cut a partial final line (no trailing newline) off a line journal
+
+    Returns the number of bytes removed.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end > 0:
+            start = max(0, end - TAIL_CHUNK)
+            f.seek(start)
+            chunk = f.read(end - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+        return size - end
+
+
+class CheckpointJournal:
+    """Durable set of completed test IDs with their final status"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: Dict[str, str] = {}
+        self.last_test_id: Optional[str] = None
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> Dict[str, str]:
+        """Read completed tests from disk (later lines win)"""
+        self.completed = {}
+        self.last_test_id = None
+        if os.path.exists(self.path):
+            with self._lock:
+                if self._file is None:
+                    truncate_torn_tail(self.path)
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break
+                    test_id, _, status = line.rstrip("\n").partition("\t")
+                    if test_id:
+                        self.completed[test_id] = status
+                        self.last_test_id = test_id
+        return self.completed
+
+    def reset(self):
+        """Start a fresh journal, discarding previous progress"""
+        with self._lock:
+            self.close()
+            self.completed = {}
+            self.last_test_id = None
+            open(self.path, "w").close()
+
+    def record(self, test_id: str, status: str):
+        """Append one completed test and fsync"""
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                truncate_torn_tail(self.path)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(f"{test_id}\t{status}\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.completed[test_id] = status
+            self.last_test_id = test_id
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __contains__(self, test_id: str) -> bool:
+        return test_id in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
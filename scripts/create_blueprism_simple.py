@@ -3,42 +3,91 @@
 
 import os
 import json
-import zipfile
 from pathlib import Path
 from datetime import datetime
+import itertools
 import uuid
 
+from artifact_io import build_zip, write_atomic, seeded_uuid, build_timestamp
+
 # Output directory
 OUTPUT_DIR = r"C:\flowbots_lab\artifacts_source\blueprism\simple"
 
 # Blue Prism uses XML-based .bprelease format
 # Each release contains a process definition
 
-def generate_bp_xml(test_id: str, name: str, description: str, actions: list) -> str:
-    """Generate Blue Prism process XML"""
-    process_id = str(uuid.uuid4())
-    timestamp = datetime.now().isoformat()
+def generate_bp_xml(
+    test_id: str,
+    name: str,
+    description: str,
+    actions: list,
+    project_name: str = None,
+    seed: str = None,
+    pages: list = None,
+) -> str:
+    """Generate Blue Prism process XML
+
+    With a seed, stage/process IDs are derived from it and the created
+    timestamp is the fixed build time, so the same inputs give identical XML.
+
+    An action may carry its own "stageid", the "subsheetid" of the page it is
+    on (default: Main Page) and "onsuccess" / "ontrue" / "onfalse" links to
+    other stage IDs, where "@end" is the Main Page End stage. pages adds
+    {"id", "name"} page definitions for SubSheet stages to call. When actions
+    are linked, the Main Page Start stage links to the first Main Page action.
+    """
+    project_name = project_name or f"Simple_{name}"
+    if seed is None:
+        new_id = lambda: str(uuid.uuid4())
+        timestamp = datetime.now().isoformat()
+    else:
+        ids = (str(seeded_uuid(seed, n)) for n in itertools.count())
+        new_id = lambda: next(ids)
+        timestamp = build_timestamp()
+    process_id = new_id()
+    start_id = new_id()
+    end_id = new_id()
 
     # Build actions XML
     actions_xml = ""
+    first_main = None
+    linked = any("onsuccess" in action or "ontrue" in action for action in actions)
     for i, action in enumerate(actions):
-        action_id = str(uuid.uuid4())
+        action_id = action.get("stageid") or new_id()
+        subsheet_id = action.get("subsheetid") or process_id
+        if first_main is None and subsheet_id == process_id and action["type"] != "Data":
+            first_main = action_id
+        links = "".join(
+            f"\n            <{key}>{end_id if action[key] == '@end' else action[key]}</{key}>"
+            for key in ("onsuccess", "ontrue", "onfalse") if action.get(key)
+        )
         actions_xml += f"""
         <stage stageid="{action_id}" name="{action['name']}" type="{action['type']}">
-            <subsheetid>{process_id}</subsheetid>
+            <subsheetid>{subsheet_id}</subsheetid>
             <loginhibit alialialialialialiased="true" />
-            {action.get('content', '')}
+            {action.get('content', '')}{links}
         </stage>"""
 
+    start_link = f"\n                <onsuccess>{first_main or end_id}</onsuccess>" if linked else ""
+    pages_xml = "".join(f"""
+            <subsheet subsheetid="{page['id']}" type="Normal" published="False">
+                <name>{page['name']}</name>
+                <view>
+                    <camerax>0</camerax>
+                    <cameray>0</cameray>
+                    <zoom>1</zoom>
+                </view>
+            </subsheet>""" for page in pages or [])
+
     return f'''<?xml version="1.0" encoding="utf-8"?>
 <bpr:release xmlns:bpr="http://www.blueprism.co.uk/product/release">
     <bpr:name>{name}</bpr:name>
     <bpr:release-notes>{description} - Test ID: {test_id}</bpr:release-notes>
     <bpr:created>{timestamp}</bpr:created>
     <bpr:package-id>{process_id}</bpr:package-id>
-    <bpr:package-name>Simple_{name}</bpr:package-name>
+    <bpr:package-name>{project_name}</bpr:package-name>
     <bpr:contents>
-        <process name="Simple_{name}" id="{process_id}" byrefcollection="true">
+        <process name="{project_name}" id="{process_id}" byrefcollection="true">
             <view>
                 <camerax>0</camerax>
                 <cameray>0</cameray>
@@ -54,14 +103,14 @@ def generate_bp_xml(test_id: str, name: str, description: str, actions: list) ->
                     <cameray>0</cameray>
                     <zoom>1</zoom>
                 </view>
-            </subsheet>
-            <stage stageid="{str(uuid.uuid4())}" name="Start" type="Start">
+            </subsheet>{pages_xml}
+            <stage stageid="{start_id}" name="Start" type="Start">
                 <subsheetid>{process_id}</subsheetid>
                 <loginhibit onnever="True" />
-                <narrative>Process start point</narrative>
+                <narrative>Process start point</narrative>{start_link}
             </stage>
             {actions_xml}
-            <stage stageid="{str(uuid.uuid4())}" name="End" type="End">
+            <stage stageid="{end_id}" name="End" type="End">
                 <subsheetid>{process_id}</subsheetid>
                 <loginhibit onnever="True" />
                 <narrative>Process end point</narrative>
@@ -163,30 +212,32 @@ BP_TESTS = {
 }
 
 
+def build_bp_release_zip(test_id: str, project_name: str, description: str, xml_content: str) -> bytes:
+    """Build the .bprelease.zip companion (release XML + metadata) in memory"""
+    metadata = {
+        "name": project_name,
+        "description": description,
+        "version": "1.0.0",
+        "testId": test_id,
+        "platform": "Blue Prism"
+    }
+    return build_zip([
+        (f"{project_name}.bprelease", xml_content),
+        ("metadata.json", json.dumps(metadata, indent=2)),
+    ])
+
+
 def create_bp_package(test_id: str, name: str, description: str, actions: list) -> str:
     """Create a Blue Prism .bprelease package"""
     project_name = f"Simple_{name}"
     output_path = os.path.join(OUTPUT_DIR, f"{project_name}.bprelease")
 
     # Generate XML content
-    xml_content = generate_bp_xml(test_id, name, description, actions)
-
-    # Write as .bprelease (XML file)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(xml_content)
-
-    # Also create a .zip version with metadata
-    zip_path = output_path + ".zip"
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr(f"{project_name}.bprelease", xml_content)
-        metadata = {
-            "name": project_name,
-            "description": description,
-            "version": "1.0.0",
-            "testId": test_id,
-            "platform": "Blue Prism"
-        }
-        zf.writestr("metadata.json", json.dumps(metadata, indent=2))
+    xml_content = generate_bp_xml(test_id, name, description, actions, seed=project_name)
+
+    # Write as .bprelease (XML file), plus a .zip version with metadata
+    write_atomic(output_path, xml_content)
+    write_atomic(output_path + ".zip", build_bp_release_zip(test_id, project_name, description, xml_content))
 
     return output_path
 
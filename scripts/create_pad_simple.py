@@ -3,9 +3,10 @@
 
 import os
 import json
-import zipfile
 from pathlib import Path
 
+from artifact_io import build_zip, write_atomic
+
 # Output directory
 OUTPUT_DIR = r"C:\flowbots_lab\artifacts_source\pad\simple"
 
@@ -74,11 +75,8 @@ PAD_SCRIPTS = {
 }
 
 
-def create_pad_package(test_id: str, name: str, description: str, script: str) -> str:
-    """Create a PAD .zip package"""
-    project_name = f"Simple_{name}"
-    output_path = os.path.join(OUTPUT_DIR, f"{project_name}.zip")
-
+def build_pad_package(test_id: str, project_name: str, description: str, script: str) -> bytes:
+    """Build PAD .zip bytes in memory"""
     # Create .pad file content (Robin script)
     pad_content = f"""# Power Automate Desktop Flow
 # Name: {project_name}
@@ -88,20 +86,23 @@ def create_pad_package(test_id: str, name: str, description: str, script: str) -
 {script.strip()}
 """
 
-    # Create .zip package
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr(f"{project_name}.pad", pad_content)
+    metadata = {
+        "name": project_name,
+        "description": description,
+        "version": "1.0.0",
+        "testId": test_id
+    }
+    return build_zip([
+        (f"{project_name}.pad", pad_content),
+        ("metadata.json", json.dumps(metadata, indent=2)),
+    ])
 
-        # Add metadata
-        metadata = {
-            "name": project_name,
-            "description": description,
-            "version": "1.0.0",
-            "testId": test_id
-        }
-        zf.writestr("metadata.json", json.dumps(metadata, indent=2))
 
-    return output_path
+def create_pad_package(test_id: str, name: str, description: str, script: str) -> str:
+    """Create a PAD .zip package"""
+    project_name = f"Simple_{name}"
+    output_path = os.path.join(OUTPUT_DIR, f"{project_name}.zip")
+    return write_atomic(output_path, build_pad_package(test_id, project_name, description, script))
 
 
 def main():
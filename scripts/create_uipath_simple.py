@@ -3,9 +3,10 @@
 
 import os
 import json
-import zipfile
 from pathlib import Path
 
+from artifact_io import build_zip, write_atomic
+
 # Output directory
 OUTPUT_DIR = r"C:\flowbots_lab\artifacts_source\uipath\simple"
 
@@ -341,33 +342,23 @@ def create_project_json(name: str, description: str) -> str:
     }, indent=2)
 
 
+def build_uipath_nupkg(project_name: str, description: str, xaml: str, extra_files: list = None) -> bytes:
+    """Build .nupkg bytes (it's just a zip file) in memory
+
+    extra_files are (name, content) pairs such as invoked sub-workflows.
+    """
+    return build_zip([
+        ("Main.xaml", xaml),
+        ("project.json", create_project_json(project_name, description)),
+        *(extra_files or []),
+    ])
+
+
 def create_uipath_nupkg(test_id: str, name: str, description: str, xaml: str) -> str:
     """Create a UiPath .nupkg package"""
     project_name = f"Simple_{name}"
     output_path = os.path.join(OUTPUT_DIR, f"{project_name}.nupkg")
-
-    # Create temp directory structure
-    temp_dir = os.path.join(OUTPUT_DIR, f"temp_{test_id}")
-    os.makedirs(temp_dir, exist_ok=True)
-
-    # Write Main.xaml
-    with open(os.path.join(temp_dir, "Main.xaml"), "w", encoding="utf-8") as f:
-        f.write(xaml)
-
-    # Write project.json
-    with open(os.path.join(temp_dir, "project.json"), "w", encoding="utf-8") as f:
-        f.write(create_project_json(project_name, description))
-
-    # Create .nupkg (it's just a zip file)
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-        zf.write(os.path.join(temp_dir, "Main.xaml"), "Main.xaml")
-        zf.write(os.path.join(temp_dir, "project.json"), "project.json")
-
-    # Cleanup temp
-    import shutil
-    shutil.rmtree(temp_dir)
-
-    return output_path
+    return write_atomic(output_path, build_uipath_nupkg(project_name, description, xaml))
 
 
 def main():
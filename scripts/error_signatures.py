@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Error-signature classifier for the Auto-Heal engine
+
+Job errors are free text. normalize() strips what varies between runs
+(GUIDs, job IDs, URLs, paths, numbers) so the same failure always gives the
+same signature. classify() then scans the text once with a precompiled regex
+that alternates over every known pattern. Each pattern is a named group, so
+each match names its category; the highest-priority category found wins and
+maps to the heal action from AUTOHEAL_PIPELINE.md:
+
+| Category            | Heal action            |
+|---------------------|------------------------|
+| missing_dependency  | inject_dependencies    |
+| path_mismatch       | normalize_paths        |
+| selector_format     | convert_selectors      |
+| variable_naming     | rename_variables       |
+| action_unavailable  | map_equivalent_action  |
+| timeout, transient  | retry                  |
+| malformed_output    | escalate               |
+| unknown             | escalate               |
+
+Results repeat the same few errors many times, so classify() is memoized on
+the raw text.
+
+Usage:
+    python error_signatures.py [run_id]     # triage failures in the results store
+"""
+
+import re
+import sys
+import json
+import time
+import hashlib
+from collections import Counter, namedtuple
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Iterable
+
+# (category, heal action, patterns) in priority order; patterns match normalized text
+SIGNATURES = [
+    ("missing_dependency", "inject_dependencies", [
+        r"could not load (file or )?assembly",
+        r"missing (dependency|dependencies|package|module|reference)",
+        r"(package|dependency|module) .{0,60}(not found|missing|could not be resolved)",
+        r"unable to resolve (package|dependency)",
+        r"no module named",
+        r"cannot find module",
+    ]),
+    ("path_mismatch", "normalize_paths", [
+        r"could not find (a part of )?(the )?path",
+        r"the system cannot find the (file|path)",
+        r"no such file or directory",
+        r"(file|directory|folder) not found",
+        r"path .{0,60}(not found|does not exist|is invalid)",
+        r"invalid path",
+    ]),
+    ("selector_format", "convert_selectors", [
+        r"selector",
+        r"xpath",
+        r"ui element .{0,40}not found",
+        r"element not found",
+        r"invalid (target|anchor)",
+    ]),
+    ("variable_naming", "rename_variables", [
+        r"variable .{0,60}(not declared|undefined|not defined|invalid name|already (declared|defined))",
+        r"undeclared variable",
+        r"invalid (identifier|variable name)",
+        r"name .{0,60}is not (defined|declared)",
+    ]),
+    ("action_unavailable", "map_equivalent_action", [
+        r"(action|activity) .{0,60}(not supported|unavailable|not available|unknown)",
+        r"unsupported (action|activity)",
+        r"unknown (action|activity)",
+        r"no equivalent",
+        r"not implemented",
+        r"activities, source has",
+    ]),
+    ("timeout", "retry", [
+        r"timed? ?out",
+        r"deadline exceeded",
+    ]),
+    ("transient", "retry", [
+        r"http (429|500|502|503|504)",
+        r"too many requests",
+        r"connection (reset|refused|aborted|error)",
+        r"(temporarily|service) unavailable",
+        r"max retries exceeded",
+    ]),
+    ("malformed_output", "escalate", [
+        r"malformed",
+        r"not a readable zip",
+        r"missing [^ ]+ file",
+        r"missing project\.json|missing package\.json",
+        r"empty file",
+        r"unclosed block|end without open block",
+        r"no main workflow",
+    ]),
+]
+UNKNOWN = ("unknown", "escalate")
+
+HEAL_ACTIONS = {category: heal for category, heal, _ in SIGNATURES}
+HEAL_ACTIONS[UNKNOWN[0]] = UNKNOWN[1]
+
+# Statuses that are not failures
+PASS_STATUSES = ("PASS", "success", "pending")
+
+# Normalization, applied in order
+_NORMALIZE = [
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"), "<guid>"),
+    (re.compile(r"\b[a-z]+://[^\s'\"<>]+"), "<url>"),
+    (re.compile(r"\b[a-z]:\\[^\s'\"<>]*|\\\\[^\s'\"<>]+"), "<path>"),
+    (re.compile(r"(?<![\w<])/(?:[\w.-]+/)+[\w.-]*"), "<path>"),
+    (re.compile(r"\bjob[_-]?[0-9a-z]{4,}\b"), "<job>"),
+    (re.compile(r"\b(0x)?[0-9a-f]{10,}\b"), "<id>"),
+    (re.compile(r"\b(?![45]\d\d\b)\d+(\.\d+)?\b"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+_COMBINED = re.compile("|".join(
+    f"(?P<s{i}_{j}>{pattern})"
+    for i, (_, _, patterns) in enumerate(SIGNATURES)
+    for j, pattern in enumerate(patterns)
+))
+
+Signature = namedtuple("Signature", "category heal_action signature signature_id")
+
+
+def normalize(error: str) -> str:
+    """Lowercase the error and replace run-specific values with placeholders"""
+    text = error.lower()
+    for pattern, placeholder in _NORMALIZE:
+        text = pattern.sub(placeholder, text)
+    return text.strip()[:300]
+
+
+@lru_cache(maxsize=65536)
+def classify(error: str) -> Signature:
+    """Category, heal action and stable signature of one error message"""
+    text = normalize(error or "")
+    # Highest-priority category that matches anywhere, not just the leftmost
+    best = None
+    for match in _COMBINED.finditer(text):
+        index = int(match.lastgroup[1:].split("_")[0])
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    category, heal = (SIGNATURES[best][0], SIGNATURES[best][1]) if best is not None else UNKNOWN
+    signature_id = hashlib.sha1(f"{category}|{text}".encode("utf-8")).hexdigest()[:12]
+    return Signature(category, heal, text, signature_id)
+
+
+def error_text(result: Dict[str, Any]) -> Optional[str]:
+    """The error message of a failed result, or None if it passed"""
+    status = result.get("status")
+    if status in PASS_STATUSES:
+        return None
+    error = result.get("error")
+    if not error:
+        job_status = result.get("job_status") or {}
+        error = job_status.get("error") if isinstance(job_status, dict) else None
+    if not error and result.get("validation"):
+        error = "; ".join(result["validation"].get("errors", []))
+    return str(error) if error else str(status or "unknown")
+
+
+def classify_result(result: Dict[str, Any]) -> Optional[Signature]:
+    """Signature for a failed result dict; None for passes"""
+    error = error_text(result)
+    return classify(error) if error is not None else None
+
+
+def triage(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Failure counts per category, heal action and signature"""
+    categories: Counter = Counter()
+    heal_actions: Counter = Counter()
+    signatures: Counter = Counter()
+    examples: Dict[str, Signature] = {}
+    failures = 0
+    for result in results:
+        signature = classify_result(result)
+        if signature is None:
+            continue
+        failures += 1
+        categories[signature.category] += 1
+        heal_actions[signature.heal_action] += 1
+        signatures[signature.signature_id] += 1
+        examples.setdefault(signature.signature_id, signature)
+    return {
+        "failures": failures,
+        "categories": dict(categories.most_common()),
+        "heal_actions": dict(heal_actions.most_common()),
+        "signatures": [
+            {"id": sig_id, "count": count, "category": examples[sig_id].category,
+             "heal_action": examples[sig_id].heal_action, "signature": examples[sig_id].signature}
+            for sig_id, count in signatures.most_common()
+        ],
+    }
+
+
+def main():
+    from results_store import ResultsStore
+
+    run_id = sys.argv[1] if len(sys.argv) > 1 else None
+    with ResultsStore(runner="triage") as store:
+        sql = "SELECT data FROM results"
+        params = ()
+        if run_id:
+            sql += " WHERE run_id = ?"
+            params = (run_id,)
+        start = time.perf_counter()
+        results: List[Dict[str, Any]] = [json.loads(row[0]) for row in store.conn.execute(sql, params)]
+        report = triage(results)
+        elapsed = time.perf_counter() - start
+
+    print(f"{report['failures']} failures in {len(results)} results ({elapsed:.2f}s)")
+    print("\nBy heal action:")
+    for heal, count in report["heal_actions"].items():
+        print(f"  {heal:24} {count}")
+    print("\nTop signatures:")
+    for entry in report["signatures"][:20]:
+        print(f"  {entry['count']:6}  {entry['category']:20} {entry['signature'][:80]}")
+
+
+if __name__ == "__main__":
+    main()
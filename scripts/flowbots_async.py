@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""Async FLOWBOTS Conversion API Client - concurrent job submission over pooled connections"""
+
+import os
+import sys
+import time
+import asyncio
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+import aiohttp
+
+from flowbots_converter import (
+    API_BASE, ARTIFACTS_SOURCE, ARTIFACTS_CONVERTED, LOGS_DIR, POLL_HISTORY_FILE,
+    DOWNLOAD_CHUNK_SIZE, DOWNLOAD_MAX_RESUMES, ResumableDownload,
+)
+from polling import AdaptivePoller, parse_retry_after
+from retry import RetryPolicy, shared_breaker
+from rate_limiter import RateLimiter, shared_limiter
+from job_tracker import JobTracker
+from artifact_index import get_index
+from results_store import ResultsStore
+from timing import Spans, export_histogram, print_histogram_summary
+from resource_sampler import ResourceSampler
+from artifact_validator import validate_artifact
+from workflow_ir import diff_artifacts, summarize
+
+# Max HTTP requests in flight at once (uploads, polls and downloads combined)
+DEFAULT_MAX_CONCURRENCY = 16
+# Max conversion jobs in flight at once in run_conversion_tests_async
+DEFAULT_MAX_JOBS = 32
+# Batch status endpoint probed by JobTracker; absent servers answer 404/405
+BATCH_STATUS_PATH = "/api/v1/jobs/status"
+# Keep-alive connection pool shared by every request of a client
+POOL_SIZE = 32
+KEEPALIVE_TIMEOUT = 60
+
+
+class AsyncFlowBotsClient:
+    """Asyncio client for FLOWBOTS Conversion API
+
+    Mirrors FlowBotsClient, but every call is a coroutine. All requests share one
+    keep-alive connection pool, and a semaphore caps how many are in flight.
+    Requests go through the same retry policy and process-wide circuit
+    breaker as FlowBotsClient, so an outage pauses every job instead of each
+    spending its full timeout, and take tokens from the same machine-wide
+    rate limiter buckets.
+
+    Usage:
+        async with AsyncFlowBotsClient() as client:
+            job = await client.convert(path, "uipath", "flowbots")
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        pool_size: int = POOL_SIZE,
+        poller: AdaptivePoller = None,
+        base_url: str = None,
+        retry: RetryPolicy = None,
+        limiter: RateLimiter = None,
+    ):
+        self.base_url = (base_url or API_BASE).rstrip("/")
+        self.api_key = api_key or os.environ.get("FLOWBOTS_API_KEY", "")
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        # History is saved off the event loop in close(), never from record()
+        self.poller = poller or AdaptivePoller(POLL_HISTORY_FILE, save_interval=None)
+        # Transient failures are retried; the breaker is shared with the sync client
+        self.retry = retry or RetryPolicy(breaker=shared_breaker())
+        # Request rate per bucket is shared with every client on this machine
+        self.limiter = limiter or shared_limiter()
+        self.retry_after: Dict[str, float] = {}
+        self.downloads: Dict[str, Dict[str, Any]] = {}
+        # New vs reused pooled connections, counted by a session trace hook
+        self.connection_stats = {"created": 0, "reused": 0}
+
+    async def __aenter__(self) -> "AsyncFlowBotsClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the shared session and connection pool"""
+        if self._session is None or self._session.closed:
+            headers = {"X-API-Key": self.api_key} if self.api_key else {}
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection_created)
+            trace.on_connection_reuseconn.append(self._on_connection_reused)
+            self._session = aiohttp.ClientSession(connector=connector, headers=headers, trace_configs=[trace])
+
+    async def _on_connection_created(self, session, context, params):
+        self.connection_stats["created"] += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connection_stats["reused"] += 1
+
+    async def close(self):
+        """Close the session, release pooled connections and save poll history"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await asyncio.to_thread(self.poller.save)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("AsyncFlowBotsClient is not open; use 'async with' or await open()")
+        return self._session
+
+    @staticmethod
+    def _form(file_path: str, content: bytes, fields: Dict[str, str]) -> aiohttp.FormData:
+        form = aiohttp.FormData()
+        form.add_field("file", content, filename=os.path.basename(file_path))
+        for key, value in fields.items():
+            form.add_field(key, value)
+        return form
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        upload: str = None,
+        fields: Dict[str, str] = None,
+        bucket: str = None,
+        stream: bool = False,
+        **kwargs,
+    ) -> aiohttp.ClientResponse:
+        """One API request through the rate limiter and retry policy
+
+        upload is a file path sent with fields as a multipart form; the file is
+        read once, off the event loop, and the form rebuilt for every attempt.
+        The body is read inside a concurrency slot and the connection released,
+        so resp.json()/text() need no further I/O. With stream=True the caller
+        holds the slot, reads the body and releases the response. bucket
+        names the rate-limit bucket; every attempt takes a token and reports
+        its response back. The limiter's file lock and sleeps run in a worker
+        thread so they never block the event loop.
+        """
+        url = f"{self.base_url}{path}"
+        content = await asyncio.to_thread(_read_bytes, upload) if upload else None
+
+        async def send():
+            if content is not None:
+                kwargs["data"] = self._form(upload, content, fields or {})
+            if bucket is None:
+                return await self.session.request(method, url, **kwargs)
+            await asyncio.to_thread(self.limiter.acquire, bucket)
+            resp = await self.session.request(method, url, **kwargs)
+            await asyncio.to_thread(self.limiter.observe, bucket, resp.status, resp.headers)
+            return resp
+
+        async def attempt():
+            if stream:
+                return await send()
+            async with self._limit:
+                resp = await send()
+                try:
+                    await resp.read()
+                finally:
+                    resp.release()
+                return resp
+
+        return await self.retry.call_async(attempt)
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Check API health"""
+        resp = await self._request("GET", "/health", timeout=aiohttp.ClientTimeout(total=30))
+        return await resp.json(content_type=None)
+
+    async def convert(
+        self,
+        file_path: str,
+        source_platform: str,
+        target_platform: str,
+        generate_api: bool = False,
+        generate_docker: bool = False,
+        generate_documentation: bool = True,
+        use_agent: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Start a conversion job.
+
+        Returns: {"jobId": "...", "status": "pending", "statusUrl": "...", "filesUrl": "..."}
+        """
+        fields = {
+            "sourcePlatform": source_platform,
+            "targetPlatform": target_platform,
+            "generateApi": str(generate_api).lower(),
+            "generateDocker": str(generate_docker).lower(),
+            "generateDocumentation": str(generate_documentation).lower(),
+            "useAgent": str(use_agent).lower(),
+        }
+        resp = await self._request(
+            "POST", "/api/v1/convert", upload=file_path, fields=fields, bucket="upload",
+            timeout=aiohttp.ClientTimeout(total=120),
+        )
+        if resp.status == 202:
+            return await resp.json(content_type=None)
+        text = await resp.text()
+        return {"error": f"HTTP {resp.status}", "message": text[:500]}
+
+    async def get_job_status(self, job_id: str) -> Dict[str, Any]:
+        """Get job status (remembers any Retry-After hint for the job)"""
+        resp = await self._request(
+            "GET", f"/api/v1/jobs/{job_id}", bucket="poll", timeout=aiohttp.ClientTimeout(total=30),
+        )
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        if retry_after is None:
+            self.retry_after.pop(job_id, None)
+        else:
+            self.retry_after[job_id] = retry_after
+        return await resp.json(content_type=None)
+
+    async def get_job_statuses(self, job_ids: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get many job statuses in one request
+
+        Returns {jobId: status}, or None when the server has no batch endpoint
+        (404, 405 or 501). Any other error status raises, since it says
+        nothing about whether the endpoint exists.
+        """
+        resp = await self._request(
+            "POST", BATCH_STATUS_PATH, bucket="poll", json={"jobIds": job_ids}, timeout=aiohttp.ClientTimeout(total=30),
+        )
+        if resp.status in (404, 405, 501):
+            return None
+        resp.raise_for_status()
+        body = await resp.json(content_type=None)
+
+        jobs = body.get("jobs", body) if isinstance(body, dict) else body
+        if isinstance(jobs, list):
+            return {job.get("jobId"): job for job in jobs if isinstance(job, dict)}
+        if isinstance(jobs, dict):
+            return jobs
+        return None
+
+    async def wait_for_job(
+        self,
+        job_id: str,
+        timeout: int = 300,
+        poll_interval: Optional[float] = None,
+        tier: str = "simple",
+        source_platform: str = None,
+        target_platform: str = None,
+    ) -> Dict[str, Any]:
+        """Wait for job to complete without blocking other jobs
+
+        Pacing matches FlowBotsClient.wait_for_job: adaptive unless a fixed
+        poll_interval is given.
+        """
+        start = time.time()
+        schedule = self.poller.schedule(tier, source_platform, target_platform)
+        try:
+            while time.time() - start < timeout:
+                status = await self.get_job_status(job_id)
+                job_status = status.get("status", "unknown")
+
+                if job_status in ["completed", "failed"]:
+                    if job_status == "completed":
+                        self.poller.record(tier, source_platform, target_platform, time.time() - start)
+                    return status
+
+                if poll_interval is not None:
+                    delay = max(poll_interval, self.retry_after.get(job_id, 0))
+                else:
+                    delay = schedule.next_delay(self.retry_after.get(job_id))
+                await asyncio.sleep(min(delay, max(0, timeout - (time.time() - start))))
+        finally:
+            self.retry_after.pop(job_id, None)
+
+        return {"error": "timeout", "message": f"Job did not complete within {timeout}s"}
+
+    async def get_converted_files(
+        self,
+        job_id: str,
+        output_dir: str,
+        extract: bool = False,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_resumes: int = DOWNLOAD_MAX_RESUMES,
+    ) -> Optional[str]:
+        """Download converted files as ZIP
+
+        Same behavior as FlowBotsClient.get_converted_files (both use
+        ResumableDownload): streamed to <job_id>.zip.part, resumed with a
+        Range request after a dropped connection, Content-Range checked, and
+        with extract=True entries written into output_dir from the stream.
+        Re-reading a leftover .part and the final rename/extraction run in a
+        worker thread.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        zip_path = os.path.join(output_dir, f"{job_id}.zip")
+        download = await asyncio.to_thread(
+            ResumableDownload, zip_path, output_dir, extract, chunk_size, max_resumes,
+        )
+
+        while True:
+            async with self._limit:
+                resp = await self._request(
+                    "GET", f"/api/v1/jobs/{job_id}/files", bucket="download", stream=True,
+                    params={"format": "zip"}, headers=download.range_headers(),
+                    timeout=aiohttp.ClientTimeout(total=120),
+                )
+                async with resp:
+                    action = download.accept(resp.status, resp.headers.get("Content-Range"))
+                    if action == "done":
+                        break
+                    if action == "retry":
+                        continue
+                    if action == "fail":
+                        return None
+                    try:
+                        with download.open_part() as f:
+                            async for chunk in resp.content.iter_chunked(chunk_size):
+                                download.write(f, chunk)
+                        break
+                    except (aiohttp.ClientPayloadError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                        if not download.interrupted():
+                            print(f"    Download of {job_id} failed after {max_resumes} resumes: {e}")
+                            return None
+                        print(f"    Download interrupted at {download.offset} bytes, resuming: {e}")
+
+        self.downloads[job_id] = await asyncio.to_thread(download.finish)
+        return zip_path
+
+    async def assess(self, file_path: str, source_platform: str, target_platform: str) -> Dict[str, Any]:
+        """Assess workflow for migration"""
+        fields = {
+            "sourcePlatform": source_platform,
+            "targetPlatform": target_platform,
+            "includeEstimation": "true",
+            "includeSecurityScan": "true",
+            "includeStatistics": "true",
+        }
+        resp = await self._request(
+            "POST", "/api/v1/assess", upload=file_path, fields=fields, bucket="upload",
+            timeout=aiohttp.ClientTimeout(total=120),
+        )
+        return await resp.json(content_type=None)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def run_conversion_test_async(
+    client: AsyncFlowBotsClient,
+    source_file: str,
+    source_platform: str,
+    target_platform: str,
+    test_id: str,
+    tracker: "JobTracker" = None,
+    output_root: str = ARTIFACTS_CONVERTED,
+) -> Dict[str, Any]:
+    """Run a single conversion test (async counterpart of run_conversion_test)
+
+    With a tracker, status polling is left to its shared sweep instead of a
+    per-job wait_for_job loop.
+    """
+    result = {
+        "test_id": test_id,
+        "source_platform": source_platform,
+        "target_platform": target_platform,
+        "source_file": source_file,
+        "tier": "simple",
+        "timestamp": datetime.now().isoformat(),
+        "status": "pending",
+    }
+    spans = Spans()
+    result["timings"] = spans.spans
+
+    try:
+        with spans.span("upload", bytes=os.path.getsize(source_file)):
+            conv_result = await client.convert(source_file, source_platform, target_platform)
+
+        if "error" in conv_result:
+            result["status"] = "error"
+            result["error"] = conv_result.get("message", conv_result.get("error"))
+            return result
+
+        job_id = conv_result.get("jobId")
+        if not job_id:
+            result["status"] = "error"
+            result["error"] = "No job ID returned"
+            return result
+
+        result["job_id"] = job_id
+        print(f"  [{test_id}] Job ID: {job_id}")
+
+        wait = tracker.wait if tracker is not None else client.wait_for_job
+        with spans.span("processing"):
+            job_status = await wait(
+                job_id,
+                timeout=300,
+                tier="simple",
+                source_platform=source_platform,
+                target_platform=target_platform,
+            )
+        result["job_status"] = job_status
+
+        if job_status.get("status") == "completed":
+            result["status"] = "success"
+
+            output_dir = os.path.join(
+                output_root,
+                target_platform,
+                "simple",
+                test_id,
+            )
+            with spans.span("download") as download:
+                zip_path = await client.get_converted_files(job_id, output_dir)
+                if zip_path:
+                    download["bytes"] = client.downloads[job_id]["bytes"]
+            if not zip_path:
+                result["status"] = "error"
+                result["error"] = "Converted files could not be downloaded"
+            else:
+                result["output_file"] = zip_path
+                result["output_sha256"] = client.downloads[job_id]["sha256"]
+
+                with spans.span("validate"):
+                    validation = validate_artifact(zip_path, target_platform, source_file)
+                result["validation"] = validation
+                if not validation["ok"]:
+                    result["status"] = "invalid"
+                    result["error"] = "; ".join(validation["errors"])
+                else:
+                    # Source vs converted actions, for the auto-heal stage
+                    with spans.span("diff"):
+                        diff = diff_artifacts(source_file, zip_path)
+                    result["diff"] = summarize(diff)
+
+        elif job_status.get("status") == "failed":
+            result["status"] = "failed"
+            result["error"] = job_status.get("error", "Unknown error")
+        else:
+            result["status"] = "timeout"
+
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+
+    return result
+
+
+async def run_conversion_tests_async(
+    client: AsyncFlowBotsClient,
+    tests: List[Tuple[str, str, str, str]],
+    max_jobs: int = DEFAULT_MAX_JOBS,
+    store: Optional[ResultsStore] = None,
+    output_root: str = ARTIFACTS_CONVERTED,
+    sampler: Optional[ResourceSampler] = None,
+) -> List[Dict[str, Any]]:
+    """Run many conversion tests with at most max_jobs in flight
+
+    All jobs share one JobTracker, so status polling does not multiply with
+    max_jobs. With a sampler, fewer than max_jobs run while the box is busy.
+
+    Args:
+        tests: (source_file, source_platform, target_platform, test_id) tuples
+
+    Returns results in the same order as tests.
+    """
+    jobs = asyncio.Semaphore(max_jobs)
+    active = 0
+
+    async with JobTracker(client) as tracker:
+        async def run_one(source_file, source_platform, target_platform, test_id):
+            nonlocal active
+            async with jobs:
+                while sampler is not None and active >= sampler.recommended_workers(max_jobs):
+                    await asyncio.sleep(1)
+                active += 1
+                try:
+                    result = await run_conversion_test_async(
+                        client, source_file, source_platform, target_platform, test_id,
+                        tracker=tracker, output_root=output_root,
+                    )
+                finally:
+                    active -= 1
+                print(f"  [{test_id}] Result: {result['status']} (queue depth {tracker.queue_depth})")
+                if store is not None:
+                    store.add(result)
+                return result
+
+        results = await asyncio.gather(*(run_one(*test) for test in tests))
+        print(f"  Status requests: {tracker.status_requests}")
+        return results
+
+
+def collect_tests() -> List[Tuple[str, str, str, str]]:
+    """Collect the same directions as flowbots_converter.main, without the first-3 limit"""
+    tests = []
+    index = get_index(ARTIFACTS_SOURCE)
+    directions = [
+        ("uipath", ".nupkg", "uipath", "flowbots"),
+        ("pad", ".zip", "powerAutomate", "uipath"),
+    ]
+    for platform_dir, ext, source, target in directions:
+        for artifact_path in index.list(platform_dir, "simple", ext):
+            test_id = os.path.basename(artifact_path)[: -len(ext)]
+            tests.append((artifact_path, source, target, test_id))
+    return tests
+
+
+async def main_async(max_jobs: int = DEFAULT_MAX_JOBS):
+    """Main entry point"""
+    print("=" * 60)
+    print("FLOWBOTS Conversion API Test Runner (async)")
+    print("=" * 60)
+
+    async with AsyncFlowBotsClient() as client:
+        print("\nChecking API health...")
+        try:
+            health = await client.health_check()
+            print(f"  API Status: {health.get('status', 'unknown')}")
+        except Exception as e:
+            print(f"  Error: {e}")
+            return
+
+        tests = collect_tests()
+        print(f"\nRunning {len(tests)} conversions ({max_jobs} jobs in flight)...")
+        start = time.time()
+        with ResultsStore(runner="flowbots_async") as store, ResourceSampler() as sampler:
+            results = await run_conversion_tests_async(client, tests, max_jobs=max_jobs, store=store, sampler=sampler)
+        elapsed = time.time() - start
+
+    print(f"\n" + "=" * 60)
+    print(f"Results saved to: {store.db_path} (run {store.run_id})")
+    print(f"Elapsed: {elapsed:.1f}s")
+
+    latency_file = export_histogram(results, LOGS_DIR)
+    if latency_file:
+        print(f"Latency histogram: {latency_file}")
+        print_histogram_summary(results)
+
+    statuses = {}
+    for r in results:
+        s = r["status"]
+        statuses[s] = statuses.get(s, 0) + 1
+
+    print("\nSummary:")
+    for status, count in statuses.items():
+        print(f"  {status}: {count}")
+
+
+if __name__ == "__main__":
+    max_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MAX_JOBS
+    asyncio.run(main_async(max_jobs))
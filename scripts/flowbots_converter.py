@@ -3,15 +3,29 @@
 
 import os
 import sys
-import json
 import time
+import shutil
+import hashlib
+import threading
 import requests
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from polling import AdaptivePoller, parse_retry_after
+from zipstream import StreamingZipExtractor, extract_zip_file
+from artifact_index import get_index, DIR_TO_API
+from results_store import ResultsStore
+from timing import Spans, measure_connect, export_histogram, print_histogram_summary
+from result_cache import ConversionCache, API_VERSION, cache_key, file_sha256
+from artifact_validator import validate_artifact
+from workflow_ir import diff_artifacts, summarize
+from retry import RetryPolicy, shared_breaker
+from rate_limiter import RateLimiter, shared_limiter
+
 # Configuration
-API_BASE = "https://api.flowbotsai.com"
+# Override with FLOWBOTS_API_BASE (e.g. http://127.0.0.1:8765 for mock_flowbots_server.py)
+API_BASE = os.environ.get("FLOWBOTS_API_BASE", "https://api.flowbotsai.com").rstrip("/")
 LAB_DIR = r"C:\flowbots_lab"
 ARTIFACTS_SOURCE = os.path.join(LAB_DIR, "artifacts_source")
 ARTIFACTS_CONVERTED = os.path.join(LAB_DIR, "artifacts_converted")
@@ -22,31 +36,220 @@ LOGS_DIR = os.path.join(LAB_DIR, "logs")
 SOURCE_PLATFORMS = ["uipath", "automationAnywhere", "powerAutomate", "bluePrism", "flowbots"]
 TARGET_PLATFORMS = ["flowbots", "automationAnywhere", "powerAutomate", "powerAutomateCloud", "uipath"]
 
-# Map directory names to API platform names
-DIR_TO_API = {
-    "uipath": "uipath",
-    "pad": "powerAutomate",
-    "pacloud": "powerAutomateCloud",
-    "blueprism": "bluePrism",
-    "aa": "automationAnywhere",
+# Learned job durations per tier/direction, used to pace status polling
+POLL_HISTORY_FILE = os.path.join(LOGS_DIR, "poll_history.json")
+
+# Converted-file downloads are streamed to disk in chunks and resumed with
+# HTTP Range requests after a dropped connection
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_MAX_RESUMES = 3
+
+# Convert flags used by run_conversion_test (part of the result cache key)
+CONVERT_OPTIONS = {
+    "generate_api": False,
+    "generate_docker": False,
+    "generate_documentation": True,
+    "use_agent": False,
 }
 
-API_TO_DIR = {v: k for k, v in DIR_TO_API.items()}
+
+def _content_range_start(value: Optional[str]) -> Optional[int]:
+    """First byte of a "bytes start-end/total" Content-Range, or None"""
+    if not value or not value.startswith("bytes "):
+        return None
+    try:
+        return int(value[6:].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+class ResumableDownload:
+    """Disk state of one ZIP download, shared by FlowBotsClient and AsyncFlowBotsClient
+
+    The body goes to <zip_path>.part and is renamed into place by finish().
+    A .part left by an earlier attempt or run is re-read on construction, so
+    the next request asks for the rest with range_headers(). Each response's
+    status and Content-Range go through accept() before its body is written
+    with write(). A SHA-256 (and, with extract, a StreamingZipExtractor) is
+    kept up to date on the way through.
+    """
+
+    def __init__(
+        self,
+        zip_path: str,
+        output_dir: str,
+        extract: bool = False,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_resumes: int = DOWNLOAD_MAX_RESUMES,
+    ):
+        self.zip_path = zip_path
+        self.part_path = zip_path + ".part"
+        self.output_dir = output_dir
+        self.extract = extract
+        self.max_resumes = max_resumes
+        self.resumes = 0
+        self.extractor = None
+        self._restart()
+        if os.path.exists(self.part_path):
+            with open(self.part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    self._consume(chunk)
+        self.resumed_from = self.offset
+
+    def _restart(self, drop_part: bool = False):
+        if self.extractor:
+            self.extractor.close()
+        self.sha = hashlib.sha256()
+        self.extractor = StreamingZipExtractor(self.output_dir) if self.extract else None
+        self.offset = 0
+        if drop_part and os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+    def _consume(self, chunk: bytes):
+        self.sha.update(chunk)
+        if self.extractor:
+            self.extractor.feed(chunk)
+        self.offset += len(chunk)
+
+    def range_headers(self) -> Dict[str, str]:
+        return {"Range": f"bytes={self.offset}-"} if self.offset else {}
+
+    def accept(self, status: int, content_range: Optional[str]) -> str:
+        """What to do with a response: "write" its body, "done", "retry" or "fail"
+
+        416 on a resume means the .part already holds the whole body. A 206
+        that does not start at our offset would corrupt the zip, so the .part
+        is dropped and the whole file requested again. A 200 to a Range
+        request means the server ignored it; the body replaces the .part.
+        """
+        if status == 416 and self.offset:
+            return "done"
+        if status == 206 and _content_range_start(content_range) != self.offset:
+            self._restart(drop_part=True)
+            return "retry" if self.interrupted() else "fail"
+        if status == 200 and self.offset:
+            self._restart()
+        elif status not in (200, 206):
+            self.abort()
+            return "fail"
+        return "write"
+
+    def open_part(self):
+        return open(self.part_path, "ab" if self.offset else "wb")
+
+    def write(self, f, chunk: bytes):
+        if chunk:
+            f.write(chunk)
+            self._consume(chunk)
+
+    def interrupted(self) -> bool:
+        """Count a resume; False (and the download abandoned) once past max_resumes"""
+        self.resumes += 1
+        if self.resumes > self.max_resumes:
+            self.abort()
+            return False
+        return True
+
+    def abort(self):
+        if self.extractor:
+            self.extractor.close()
+
+    def finish(self) -> Dict[str, Any]:
+        """Move the .part into place; returns the download record"""
+        os.replace(self.part_path, self.zip_path)
+        files = []
+        if self.extractor:
+            if self.extractor.unsupported or not self.extractor.done:
+                self.extractor.close()
+                files = extract_zip_file(self.zip_path, self.output_dir)
+            else:
+                files = self.extractor.files
+        return {
+            "path": self.zip_path,
+            "bytes": self.offset,
+            "sha256": self.sha.hexdigest(),
+            "files": files,
+        }
 
 
 class FlowBotsClient:
     """Client for FLOWBOTS Conversion API"""
 
-    def __init__(self, api_key: str = None):
-        self.base_url = API_BASE
+    def __init__(
+        self,
+        api_key: str = None,
+        poller: AdaptivePoller = None,
+        base_url: str = None,
+        retry: RetryPolicy = None,
+        limiter: RateLimiter = None,
+    ):
+        self.base_url = (base_url or API_BASE).rstrip("/")
         self.api_key = api_key or os.environ.get("FLOWBOTS_API_KEY", "")
         self.session = requests.Session()
         if self.api_key:
             self.session.headers["X-API-Key"] = self.api_key
+        self.poller = poller or AdaptivePoller(POLL_HISTORY_FILE)
+        # Transient failures are retried; the breaker is shared by every client
+        self.retry = retry or RetryPolicy(breaker=shared_breaker())
+        # Request rate per bucket is shared with every client on this machine
+        self.limiter = limiter or shared_limiter()
+        self.retry_after: Dict[str, float] = {}
+        self.downloads: Dict[str, Dict[str, Any]] = {}
+        self._connect_timing: Optional[Dict[str, float]] = None
+
+    def connection_timing(self) -> Dict[str, float]:
+        """DNS and TCP connect time to the API host (probed once per client)"""
+        if self._connect_timing is None:
+            try:
+                self._connect_timing = measure_connect(self.base_url)
+            except OSError as e:
+                print(f"    Connect timing unavailable: {e}")
+                self._connect_timing = {}
+        return self._connect_timing
+
+    def connection_stats(self) -> Dict[str, int]:
+        """New vs reused pooled connections, from the session's urllib3 pools"""
+        created = requests_sent = 0
+        for adapter in self.session.adapters.values():
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is not None:
+                    created += pool.num_connections
+                    requests_sent += pool.num_requests
+        return {"created": created, "reused": max(0, requests_sent - created)}
+
+    def _request(
+        self, method: str, path: str, upload: str = None, bucket: str = None, **kwargs
+    ) -> requests.Response:
+        """One API request through the rate limiter and retry policy
+
+        upload is a file path sent as the "file" form field; it is reopened
+        for every attempt so a retry re-sends the whole body. bucket names the
+        rate-limit bucket ("upload", "poll", "download"); every attempt takes
+        a token and reports its response back so the rate adapts.
+        """
+        url = f"{self.base_url}{path}"
+
+        def send():
+            if upload is None:
+                return self.session.request(method, url, **kwargs)
+            with open(upload, "rb") as f:
+                files = {"file": (os.path.basename(upload), f)}
+                return self.session.request(method, url, files=files, **kwargs)
+
+        def attempt():
+            if bucket is None:
+                return send()
+            self.limiter.acquire(bucket)
+            resp = send()
+            self.limiter.observe(bucket, resp.status_code, resp.headers)
+            return resp
+
+        return self.retry.call(attempt)
 
     def health_check(self) -> Dict[str, Any]:
         """Check API health"""
-        resp = self.session.get(f"{self.base_url}/health", timeout=30)
+        resp = self._request("GET", "/health", timeout=30)
         return resp.json()
 
     def convert(
@@ -58,28 +261,30 @@ class FlowBotsClient:
         generate_docker: bool = False,
         generate_documentation: bool = True,
         use_agent: bool = False,
+        spans: Optional[Spans] = None,
     ) -> Dict[str, Any]:
         """
         Start a conversion job.
 
         Returns: {"jobId": "...", "status": "pending", "statusUrl": "...", "filesUrl": "..."}
         """
-        with open(file_path, "rb") as f:
-            files = {"file": (os.path.basename(file_path), f)}
-            data = {
-                "sourcePlatform": source_platform,
-                "targetPlatform": target_platform,
-                "generateApi": str(generate_api).lower(),
-                "generateDocker": str(generate_docker).lower(),
-                "generateDocumentation": str(generate_documentation).lower(),
-                "useAgent": str(use_agent).lower(),
-            }
-
-            resp = self.session.post(
-                f"{self.base_url}/api/v1/convert",
-                files=files,
-                data=data,
-                timeout=120,
+        upload_start = time.perf_counter()
+        data = {
+            "sourcePlatform": source_platform,
+            "targetPlatform": target_platform,
+            "generateApi": str(generate_api).lower(),
+            "generateDocker": str(generate_docker).lower(),
+            "generateDocumentation": str(generate_documentation).lower(),
+            "useAgent": str(use_agent).lower(),
+        }
+        resp = self._request("POST", "/api/v1/convert", upload=file_path, bucket="upload", data=data, timeout=120)
+
+        if spans is not None:
+            spans.record(
+                "upload",
+                time.perf_counter() - upload_start,
+                bytes=os.path.getsize(file_path),
+                http_status=resp.status_code,
             )
 
         if resp.status_code == 202:
@@ -88,59 +293,153 @@ class FlowBotsClient:
             return {"error": f"HTTP {resp.status_code}", "message": resp.text[:500]}
 
     def get_job_status(self, job_id: str) -> Dict[str, Any]:
-        """Get job status"""
-        resp = self.session.get(f"{self.base_url}/api/v1/jobs/{job_id}", timeout=30)
+        """Get job status (remembers any Retry-After hint for the job)"""
+        resp = self._request("GET", f"/api/v1/jobs/{job_id}", bucket="poll", timeout=30)
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        if retry_after is None:
+            self.retry_after.pop(job_id, None)
+        else:
+            self.retry_after[job_id] = retry_after
         return resp.json()
 
-    def wait_for_job(self, job_id: str, timeout: int = 300, poll_interval: int = 5) -> Dict[str, Any]:
-        """Wait for job to complete"""
-        start = time.time()
-        while time.time() - start < timeout:
-            status = self.get_job_status(job_id)
-            job_status = status.get("status", "unknown")
+    def wait_for_job(
+        self,
+        job_id: str,
+        timeout: int = 300,
+        poll_interval: Optional[float] = None,
+        tier: str = "simple",
+        source_platform: str = None,
+        target_platform: str = None,
+        spans: Optional[Spans] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """Wait for job to complete
 
-            if job_status in ["completed", "failed"]:
-                return status
+        With no poll_interval the delay between polls adapts to the expected
+        duration for this tier and direction, backs off with jitter and honors
+        Retry-After. A fixed poll_interval restores the old constant pacing.
 
-            time.sleep(poll_interval)
+        With spans, records queue_wait (until the job is first seen
+        in_progress) and processing; both are bounded by poll granularity.
+        """
+        start = time.time()
+        wait_start = time.perf_counter()
+        in_progress_at = None
+        polls = 0
+        schedule = self.poller.schedule(tier, source_platform, target_platform)
+        try:
+            while time.time() - start < timeout:
+                if cancel is not None and cancel.is_set():
+                    return {"jobId": job_id, "status": "preempted"}
+                status = self.get_job_status(job_id)
+                polls += 1
+                job_status = status.get("status", "unknown")
+                if in_progress_at is None and job_status in ["in_progress", "processing", "running"]:
+                    in_progress_at = time.perf_counter()
+
+                if job_status in ["completed", "failed"]:
+                    if job_status == "completed":
+                        self.poller.record(tier, source_platform, target_platform, time.time() - start)
+                    if spans is not None:
+                        done_at = time.perf_counter()
+                        if in_progress_at is not None:
+                            spans.record("queue_wait", in_progress_at - wait_start)
+                            spans.record("processing", done_at - in_progress_at, polls=polls)
+                        else:
+                            spans.record("processing", done_at - wait_start, polls=polls)
+                    return status
+
+                if poll_interval is not None:
+                    delay = max(poll_interval, self.retry_after.get(job_id, 0))
+                else:
+                    delay = schedule.next_delay(self.retry_after.get(job_id))
+                delay = min(delay, max(0, timeout - (time.time() - start)))
+                if cancel is not None:
+                    cancel.wait(delay)
+                else:
+                    time.sleep(delay)
+        finally:
+            self.retry_after.pop(job_id, None)
 
         return {"error": "timeout", "message": f"Job did not complete within {timeout}s"}
 
-    def get_converted_files(self, job_id: str, output_dir: str) -> str:
-        """Download converted files as ZIP"""
-        resp = self.session.get(
-            f"{self.base_url}/api/v1/jobs/{job_id}/files",
-            params={"format": "zip"},
-            timeout=120,
-        )
-
-        if resp.status_code == 200:
-            os.makedirs(output_dir, exist_ok=True)
-            zip_path = os.path.join(output_dir, f"{job_id}.zip")
-            with open(zip_path, "wb") as f:
-                f.write(resp.content)
-            return zip_path
-        else:
-            return None
+    def get_converted_files(
+        self,
+        job_id: str,
+        output_dir: str,
+        extract: bool = False,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        max_resumes: int = DOWNLOAD_MAX_RESUMES,
+        spans: Optional[Spans] = None,
+    ) -> Optional[str]:
+        """Download converted files as ZIP
+
+        The body is streamed to <job_id>.zip.part and renamed into place once
+        complete. An interrupted transfer (or a .part left by an earlier run)
+        resumes with a Range request. A SHA-256 of the zip is computed on the
+        way through, and with extract=True every entry is written into
+        output_dir straight from the stream. Checksums end up in
+        self.downloads[job_id].
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        zip_path = os.path.join(output_dir, f"{job_id}.zip")
+        download = ResumableDownload(zip_path, output_dir, extract, chunk_size, max_resumes)
+
+        download_start = time.perf_counter()
+        while True:
+            resp = self._request(
+                "GET",
+                f"/api/v1/jobs/{job_id}/files",
+                bucket="download",
+                params={"format": "zip"},
+                headers=download.range_headers(),
+                stream=True,
+                timeout=120,
+            )
+            action = download.accept(resp.status_code, resp.headers.get("Content-Range"))
+            if action != "write":
+                resp.close()
+                if action == "done":
+                    break
+                if action == "retry":
+                    continue
+                return None
+
+            try:
+                with download.open_part() as f:
+                    for chunk in resp.iter_content(chunk_size=chunk_size):
+                        download.write(f, chunk)
+                break
+            except (requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                if not download.interrupted():
+                    print(f"    Download of {job_id} failed after {max_resumes} resumes: {e}")
+                    return None
+                print(f"    Download interrupted at {download.offset} bytes, resuming: {e}")
+            finally:
+                resp.close()
+
+        self.downloads[job_id] = download.finish()
+        if spans is not None:
+            spans.record(
+                "download",
+                time.perf_counter() - download_start,
+                bytes=download.offset - download.resumed_from,
+                resumes=download.resumes,
+            )
+        return zip_path
 
     def assess(self, file_path: str, source_platform: str, target_platform: str) -> Dict[str, Any]:
         """Assess workflow for migration"""
-        with open(file_path, "rb") as f:
-            files = {"file": (os.path.basename(file_path), f)}
-            data = {
-                "sourcePlatform": source_platform,
-                "targetPlatform": target_platform,
-                "includeEstimation": "true",
-                "includeSecurityScan": "true",
-                "includeStatistics": "true",
-            }
-
-            resp = self.session.post(
-                f"{self.base_url}/api/v1/assess",
-                files=files,
-                data=data,
-                timeout=120,
-            )
+        data = {
+            "sourcePlatform": source_platform,
+            "targetPlatform": target_platform,
+            "includeEstimation": "true",
+            "includeSecurityScan": "true",
+            "includeStatistics": "true",
+        }
+        resp = self._request("POST", "/api/v1/assess", upload=file_path, bucket="upload", data=data, timeout=120)
 
         return resp.json()
 
@@ -151,21 +450,50 @@ def run_conversion_test(
     source_platform: str,
     target_platform: str,
     test_id: str,
+    cache: Optional[ConversionCache] = None,
+    output_root: str = ARTIFACTS_CONVERTED,
+    tier: str = "simple",
+    cancel: Optional[threading.Event] = None,
 ) -> Dict[str, Any]:
-    """Run a single conversion test"""
+    """Run a single conversion test
+
+    With a cache, an unchanged artifact already converted with the same
+    options is answered locally without uploading anything. cancel is passed
+    to wait_for_job; a cancelled test returns status "preempted".
+    """
     result = {
         "test_id": test_id,
         "source_platform": source_platform,
         "target_platform": target_platform,
         "source_file": source_file,
+        "tier": tier,
         "timestamp": datetime.now().isoformat(),
         "status": "pending",
     }
+    spans = Spans()
+    result["timings"] = spans.spans
+    output_dir = os.path.join(
+        output_root,
+        target_platform,
+        tier,
+        test_id,
+    )
 
     try:
+        key = None
+        if cache is not None:
+            source_sha256 = file_sha256(source_file)
+            key = cache_key(source_sha256, source_platform, target_platform, CONVERT_OPTIONS)
+            hit = cache.get(key)
+            if hit:
+                return _result_from_cache(result, hit, output_dir)
+
+        for phase, seconds in client.connection_timing().items():
+            spans.record(phase, seconds)
+
         # Start conversion
         print(f"    Starting conversion: {source_platform} -> {target_platform}")
-        conv_result = client.convert(source_file, source_platform, target_platform)
+        conv_result = client.convert(source_file, source_platform, target_platform, spans=spans, **CONVERT_OPTIONS)
 
         if "error" in conv_result:
             result["status"] = "error"
@@ -182,26 +510,58 @@ def run_conversion_test(
         print(f"    Job ID: {job_id}")
 
         # Wait for completion
-        job_status = client.wait_for_job(job_id, timeout=300)
+        job_status = client.wait_for_job(
+            job_id,
+            timeout=300,
+            tier=tier,
+            source_platform=source_platform,
+            target_platform=target_platform,
+            spans=spans,
+            cancel=cancel,
+        )
         result["job_status"] = job_status
 
         if job_status.get("status") == "completed":
             result["status"] = "success"
 
             # Download converted files
-            output_dir = os.path.join(
-                ARTIFACTS_CONVERTED,
-                target_platform,
-                "simple",
-                test_id,
-            )
-            zip_path = client.get_converted_files(job_id, output_dir)
-            if zip_path:
+            zip_path = client.get_converted_files(job_id, output_dir, spans=spans)
+            if not zip_path:
+                result["status"] = "error"
+                result["error"] = "Converted files could not be downloaded"
+            else:
                 result["output_file"] = zip_path
+                result["output_sha256"] = client.downloads[job_id]["sha256"]
+
+                # Structural check before the result counts (or is cached)
+                with spans.span("validate"):
+                    validation = validate_artifact(zip_path, target_platform, source_file)
+                result["validation"] = validation
+                if not validation["ok"]:
+                    result["status"] = "invalid"
+                    result["error"] = "; ".join(validation["errors"])
+                else:
+                    # Source vs converted actions, for the auto-heal stage
+                    with spans.span("diff"):
+                        diff = diff_artifacts(source_file, zip_path)
+                    result["diff"] = summarize(diff)
+
+            if key is not None and result["status"] == "success" and zip_path:
+                cache.put(key, job_status, zip_path, meta={
+                    "source_sha256": source_sha256,
+                    "source_platform": source_platform,
+                    "target_platform": target_platform,
+                    "options": CONVERT_OPTIONS,
+                    "api_version": API_VERSION,
+                    "job_id": job_id,
+                    "output_sha256": result.get("output_sha256"),
+                })
 
         elif job_status.get("status") == "failed":
             result["status"] = "failed"
             result["error"] = job_status.get("error", "Unknown error")
+        elif job_status.get("status") == "preempted":
+            result["status"] = "preempted"
         else:
             result["status"] = "timeout"
 
@@ -212,6 +572,24 @@ def run_conversion_test(
     return result
 
 
+def _result_from_cache(result: Dict[str, Any], hit: Dict[str, Any], output_dir: str) -> Dict[str, Any]:
+    """Fill a test result from a conversion cache hit"""
+    job_status = hit["job_status"]
+    job_id = hit["meta"].get("job_id") or job_status.get("jobId", "cached")
+    print(f"    Cache hit: job {job_id}")
+
+    result["status"] = "success"
+    result["cached"] = True
+    result["job_id"] = job_id
+    result["job_status"] = job_status
+    os.makedirs(output_dir, exist_ok=True)
+    zip_path = os.path.join(output_dir, f"{job_id}.zip")
+    shutil.copyfile(hit["zip_path"], zip_path)
+    result["output_file"] = zip_path
+    result["output_sha256"] = hit["meta"].get("output_sha256")
+    return result
+
+
 def main():
     """Main entry point"""
     print("=" * 60)
@@ -220,6 +598,7 @@ def main():
 
     # Create client
     client = FlowBotsClient()
+    cache = ConversionCache()
 
     # Health check
     print("\nChecking API health...")
@@ -232,28 +611,26 @@ def main():
 
     # List available artifacts
     print("\nAvailable artifacts:")
+    index = get_index(ARTIFACTS_SOURCE)
     for platform_dir, api_name in DIR_TO_API.items():
-        tier_dir = os.path.join(ARTIFACTS_SOURCE, platform_dir, "simple")
-        if os.path.exists(tier_dir):
-            count = len([f for f in os.listdir(tier_dir) if os.path.isfile(os.path.join(tier_dir, f))])
-            if count > 0:
-                print(f"  {platform_dir} ({api_name}): {count} artifacts")
+        count = index.count(platform_dir, "simple")
+        if count > 0:
+            print(f"  {platform_dir} ({api_name}): {count} artifacts")
 
     # Run test conversions
     print("\n" + "=" * 60)
     print("Running test conversions (first 3 per direction)...")
 
     results = []
+    store = ResultsStore(runner="flowbots_converter")
 
     # Test UiPath -> FlowBots (Node.js)
-    uipath_dir = os.path.join(ARTIFACTS_SOURCE, "uipath", "simple")
-    if os.path.exists(uipath_dir):
+    artifacts = index.list("uipath", "simple", ".nupkg")[:3]
+    if artifacts:
         print(f"\nTesting UiPath -> FlowBots:")
-        artifacts = sorted([f for f in os.listdir(uipath_dir) if f.endswith(".nupkg")])[:3]
 
-        for artifact in artifacts:
-            artifact_path = os.path.join(uipath_dir, artifact)
-            test_id = artifact.replace(".nupkg", "")
+        for artifact_path in artifacts:
+            test_id = os.path.basename(artifact_path).replace(".nupkg", "")
             print(f"  [{test_id}]")
 
             result = run_conversion_test(
@@ -262,19 +639,19 @@ def main():
                 "uipath",
                 "flowbots",
                 test_id,
+                cache=cache,
             )
             results.append(result)
+            store.add(result)
             print(f"    Result: {result['status']}")
 
     # Test PAD -> UiPath
-    pad_dir = os.path.join(ARTIFACTS_SOURCE, "pad", "simple")
-    if os.path.exists(pad_dir):
+    artifacts = index.list("pad", "simple", ".zip")[:3]
+    if artifacts:
         print(f"\nTesting PAD -> UiPath:")
-        artifacts = sorted([f for f in os.listdir(pad_dir) if f.endswith(".zip")])[:3]
 
-        for artifact in artifacts:
-            artifact_path = os.path.join(pad_dir, artifact)
-            test_id = artifact.replace(".zip", "")
+        for artifact_path in artifacts:
+            test_id = os.path.basename(artifact_path).replace(".zip", "")
             print(f"  [{test_id}]")
 
             result = run_conversion_test(
@@ -283,18 +660,21 @@ def main():
                 "powerAutomate",
                 "uipath",
                 test_id,
+                cache=cache,
             )
             results.append(result)
+            store.add(result)
             print(f"    Result: {result['status']}")
 
-    # Save results
-    os.makedirs(LOGS_DIR, exist_ok=True)
-    results_file = os.path.join(LOGS_DIR, f"conversion_results_{int(time.time())}.json")
-    with open(results_file, "w") as f:
-        json.dump(results, f, indent=2)
+    store.close()
 
     print(f"\n" + "=" * 60)
-    print(f"Results saved to: {results_file}")
+    print(f"Results saved to: {store.db_path} (run {store.run_id})")
+
+    latency_file = export_histogram(results, LOGS_DIR)
+    if latency_file:
+        print(f"Latency histogram: {latency_file}")
+        print_histogram_summary(results)
 
     # Summary
     statuses = {}
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""Generate source artifacts for every platform and tier
+
+One engine replaces running create_uipath_simple.py, create_pad_simple.py and
+create_blueprism_simple.py by hand, and extends them past the Simple tier:
+
+- TIER_SPECS describes each tier (test-ID prefix, step-count range, control
+  structure). build_specs() expands it into one spec per test, composing the
+  higher tiers from the Simple-tier building blocks (S01-S20).
+- An emitter per platform turns a spec into output files. Simple-tier specs
+  reuse the existing per-platform builders unchanged, so their output matches
+  the original scripts.
+- Specs are built on a process pool. A manifest records each output's spec
+  hash (spec + the templates it uses + emitter version) and the sha256 of
+  every file written; unchanged specs whose outputs still exist are skipped.
+  Builds are reproducible (see artifact_io), so the same spec always gives
+  the same sha256.
+
+Usage:
+    python generate_artifacts.py [--platforms uipath,pad,blueprism] [--tiers simple,moderate]
+                                 [--workers N] [--force] [--output DIR]
+"""
+
+import os
+import re
+import json
+import random
+import hashlib
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Tuple
+
+from artifact_io import write_atomic, seeded_uuid
+from create_uipath_simple import SIMPLE_TESTS, XAML_TEMPLATES, build_uipath_nupkg
+from create_pad_simple import PAD_SCRIPTS, build_pad_package
+from create_blueprism_simple import BP_TESTS, generate_bp_xml, build_bp_release_zip
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+ARTIFACTS_SOURCE = os.path.join(LAB_DIR, "artifacts_source")
+MANIFEST_FILE = os.path.join(LAB_DIR, "cache", "generate_manifest.json")
+TESTS_PER_TIER = 20
+
+# Tier spec table (see TEST_MATRIX.md tier definitions)
+TIER_SPECS = {
+    "simple": {"label": "Simple", "prefix": "S", "steps": (1, 1), "structure": "sequence"},
+    "moderate": {"label": "Moderate", "prefix": "M", "steps": (4, 8), "structure": "if"},
+    "complex": {"label": "Complex", "prefix": "C", "steps": (10, 20), "structure": "loop"},
+    "supercomplex": {"label": "SuperComplex", "prefix": "SC", "steps": (20, 50), "structure": "trycatch"},
+    "enterprise": {"label": "Enterprise", "prefix": "E", "steps": (50, 80), "structure": "subflows"},
+}
+
+# Steps per sub-workflow in the enterprise tier
+SUBFLOW_SIZE = 10
+
+
+def build_specs(tiers: List[str]) -> List[Dict[str, Any]]:
+    """One spec per test; higher tiers draw their steps from the Simple tier"""
+    specs = []
+    building_blocks = sorted(SIMPLE_TESTS)
+    for tier in tiers:
+        tier_spec = TIER_SPECS[tier]
+        for n in range(1, TESTS_PER_TIER + 1):
+            test_id = f"{tier_spec['prefix']}{n:02d}"
+            if tier == "simple":
+                steps = [test_id]
+            else:
+                rng = random.Random(f"{tier}:{test_id}")
+                steps = [rng.choice(building_blocks) for _ in range(rng.randint(*tier_spec["steps"]))]
+            name, description = SIMPLE_TESTS[steps[0]]
+            if tier != "simple":
+                description = f"{len(steps)} steps ({tier_spec['structure']}) starting with: {description}"
+            specs.append({
+                "test_id": test_id,
+                "tier": tier,
+                "name": name,
+                "description": description,
+                "structure": tier_spec["structure"],
+                "steps": steps,
+            })
+    return specs
+
+
+def project_name(spec: Dict[str, Any]) -> str:
+    """Simple_File_Create for the Simple tier, Moderate_M01_File_Create above it"""
+    if spec["tier"] == "simple":
+        return f"Simple_{spec['name']}"
+    return f"{TIER_SPECS[spec['tier']]['label']}_{spec['test_id']}_{spec['name']}"
+
+
+def chunks(steps: List[str], size: int) -> List[List[str]]:
+    return [steps[i:i + size] for i in range(0, len(steps), size)]
+
+
+class UiPathEmitter:
+    """UiPath .nupkg (Main.xaml + project.json)"""
+
+    platform = "uipath"
+    version = 2
+
+    XAML_HEADER = '''<Activity mc:Ignorable="sap sap2010" x:Class="{cls}"
+  xmlns="http://schemas.microsoft.com/netfx/2009/xaml/activities"
+  xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+  xmlns:sap="http://schemas.microsoft.com/netfx/2009/xaml/activities/presentation"
+  xmlns:sap2010="http://schemas.microsoft.com/netfx/2010/xaml/activities/presentation"
+  xmlns:x="http://schemas.microsoft.com/winfx/2006/xaml"
+  xmlns:ui="http://schemas.uipath.com/workflow/activities">
+  <Sequence DisplayName="{display}">
+{body}
+  </Sequence>
+</Activity>'''
+
+    BODY_PATTERN = re.compile(r'<Sequence DisplayName="[^"]*">(.*)</Sequence>\s*</Activity>\s*$', re.DOTALL)
+
+    def inputs(self, spec: Dict[str, Any]) -> List[str]:
+        return [XAML_TEMPLATES.get(step, XAML_TEMPLATES["S05"]) for step in spec["steps"]]
+
+    def step_xaml(self, index: int, step: str) -> str:
+        template = XAML_TEMPLATES.get(step, XAML_TEMPLATES["S05"])
+        body = self.BODY_PATTERN.search(template).group(1).strip("\n")
+        return f'<Sequence DisplayName="Step {index:02d}: {SIMPLE_TESTS[step][0]}">\n{body}\n</Sequence>'
+
+    def steps_xaml(self, steps: List[str], start: int = 1) -> str:
+        return "\n".join(self.step_xaml(i, step) for i, step in enumerate(steps, start))
+
+    def main_body(self, spec: Dict[str, Any]) -> Tuple[str, List[Tuple[str, str]]]:
+        """Main sequence body plus any extra workflow files"""
+        steps, structure = spec["steps"], spec["structure"]
+        if structure == "if":
+            half = max(1, len(steps) // 2)
+            body = (
+                '<If Condition="[System.IO.File.Exists(&quot;C:\\flowbots_lab\\input\\data.txt&quot;)]">\n'
+                f'<If.Then><Sequence>\n{self.steps_xaml(steps[:half])}\n</Sequence></If.Then>\n'
+                f'<If.Else><Sequence>\n{self.steps_xaml(steps[half:], half + 1)}\n</Sequence></If.Else>\n'
+                '</If>'
+            )
+            return body, []
+        if structure == "loop":
+            body = (
+                '<ui:ForEach x:TypeArguments="x:Int32" Values="[Enumerable.Range(1, 3)]">\n'
+                f'<Sequence>\n{self.steps_xaml(steps)}\n</Sequence>\n'
+                '</ui:ForEach>'
+            )
+            return body, []
+        if structure == "trycatch":
+            body = (
+                f'<TryCatch>\n<TryCatch.Try><Sequence>\n{self.steps_xaml(steps)}\n</Sequence></TryCatch.Try>\n'
+                '<TryCatch.Catches><Catch x:TypeArguments="x:Exception">'
+                '<ui:LogMessage Level="Error" Message="[&quot;Step failed&quot;]" />'
+                '</Catch></TryCatch.Catches>\n</TryCatch>'
+            )
+            return body, []
+        if structure == "subflows":
+            invokes, files = [], []
+            for n, group in enumerate(chunks(steps, SUBFLOW_SIZE), 1):
+                filename = f"Sub_{n:02d}.xaml"
+                start = (n - 1) * SUBFLOW_SIZE + 1
+                files.append((filename, self.XAML_HEADER.format(
+                    cls=f"Sub_{n:02d}", display=f"Sub {n:02d}", body=self.steps_xaml(group, start),
+                )))
+                invokes.append(f'<ui:InvokeWorkflowFile WorkflowFileName="{filename}" />')
+            return "\n".join(invokes), files
+        return self.steps_xaml(steps), []
+
+    def emit(self, spec: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+        name = project_name(spec)
+        if spec["tier"] == "simple":
+            xaml = XAML_TEMPLATES.get(spec["test_id"], XAML_TEMPLATES["S05"])
+            return [(f"{name}.nupkg", build_uipath_nupkg(name, spec["description"], xaml))]
+        body, extra_files = self.main_body(spec)
+        xaml = self.XAML_HEADER.format(cls=name, display=name.replace("_", " "), body=body)
+        return [(f"{name}.nupkg", build_uipath_nupkg(name, spec["description"], xaml, extra_files))]
+
+
+class PadEmitter:
+    """Power Automate Desktop .zip (Robin script + metadata.json)"""
+
+    platform = "pad"
+    version = 2
+
+    def inputs(self, spec: Dict[str, Any]) -> List[str]:
+        return [PAD_SCRIPTS[step][2] for step in spec["steps"]]
+
+    def steps_script(self, steps: List[str], start: int = 1) -> str:
+        lines = []
+        for i, step in enumerate(steps, start):
+            lines.append(f"# Step {i:02d}: {PAD_SCRIPTS[step][0]}")
+            lines.append(PAD_SCRIPTS[step][2].strip())
+        return "\n".join(lines)
+
+    def script(self, spec: Dict[str, Any]) -> str:
+        steps, structure = spec["steps"], spec["structure"]
+        if structure == "if":
+            half = max(1, len(steps) // 2)
+            return (
+                "IF (File.IfFile.Exists File: $'''C:\\\\flowbots_lab\\\\input\\\\data.txt''') THEN\n"
+                f"{self.steps_script(steps[:half])}\nELSE\n{self.steps_script(steps[half:], half + 1)}\nEND"
+            )
+        if structure == "loop":
+            return f"LOOP LoopIndex FROM 1 TO 3 STEP 1\n{self.steps_script(steps)}\nEND"
+        if structure == "trycatch":
+            return (
+                f"BLOCK OnError\nON BLOCK ERROR\n    LOG 'Step failed'\nEND\n"
+                f"{self.steps_script(steps)}\nEND"
+            )
+        if structure == "subflows":
+            functions, calls = [], []
+            for n, group in enumerate(chunks(steps, SUBFLOW_SIZE), 1):
+                start = (n - 1) * SUBFLOW_SIZE + 1
+                functions.append(f"FUNCTION Sub_{n:02d} GLOBAL\n{self.steps_script(group, start)}\nEND FUNCTION")
+                calls.append(f"CALL Sub_{n:02d}")
+            return "\n".join(calls) + "\n\n" + "\n\n".join(functions)
+        return self.steps_script(steps)
+
+    def emit(self, spec: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+        name = project_name(spec)
+        script = PAD_SCRIPTS[spec["test_id"]][2] if spec["tier"] == "simple" else self.script(spec)
+        return [(f"{name}.zip", build_pad_package(spec["test_id"], name, spec["description"], script))]
+
+
+class BluePrismEmitter:
+    """Blue Prism .bprelease (XML) plus its .bprelease.zip companion
+
+    Above the Simple tier every stage is linked (onsuccess, or ontrue/onfalse
+    for the Decision), the try/catch handler is a Recover -> log -> Resume
+    path, and each sub-workflow is a Normal page with its own Start and End
+    that a SubSheet stage on the Main Page calls by ID.
+    """
+
+    platform = "blueprism"
+    version = 3
+
+    # Catch handler, as in the UiPath and PAD emitters; Blue Prism logs to a file
+    LOG_STAGE = next(stage for key, (name, _, stages) in sorted(BP_TESTS.items())
+                     if name == "Log_Message" for stage in stages)
+
+    def inputs(self, spec: Dict[str, Any]) -> List[Any]:
+        return [BP_TESTS[step][2] for step in spec["steps"]]
+
+    def stages(self, steps: List[str], start: int = 1) -> List[Dict[str, str]]:
+        stages = []
+        for i, step in enumerate(steps, start):
+            for action in BP_TESTS[step][2]:
+                stages.append(dict(action, name=f"Step {i:02d} - {action['name']}"))
+        return stages
+
+    @staticmethod
+    def stage_ids(seed: str):
+        """Stage/page IDs for one artifact (distinct from generate_bp_xml's own)"""
+        return (str(seeded_uuid(f"{seed}:stages", n)) for n in itertools.count())
+
+    @staticmethod
+    def link(stages: List[Dict[str, str]], ids, then: str = "@end", page: str = None) -> List[Dict[str, str]]:
+        """Give stages IDs (on page), chain them with onsuccess and send the last to then"""
+        for stage in stages:
+            stage["stageid"] = next(ids)
+            if page:
+                stage["subsheetid"] = page
+        for stage, following in zip(stages, stages[1:] + [None]):
+            stage["onsuccess"] = following["stageid"] if following else then
+        return stages
+
+    def subpages(self, groups: List[Tuple[str, List[Dict[str, str]]]], ids) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """(stages, pages) for named groups of stages, each on its own page
+
+        The Main Page gets one linked SubSheet stage per page; each page runs
+        Start -> its stages -> End. Each page follows its SubSheet stage in
+        the stage list.
+        """
+        pages, calls, bodies = [], [], []
+        for name, stages in groups:
+            page = {"id": next(ids), "name": name}
+            pages.append(page)
+            calls.append({"name": name, "type": "SubSheet", "content": f"<processid>{page['id']}</processid>"})
+            end = {"name": "End", "type": "End", "content": "", "stageid": next(ids), "subsheetid": page["id"]}
+            body = self.link([{"name": "Start", "type": "Start", "content": ""}] + stages, ids, then=end["stageid"], page=page["id"])
+            bodies.append(body + [end])
+        self.link(calls, ids)
+        stages = [stage for call, body in zip(calls, bodies) for stage in [call] + body]
+        return stages, pages
+
+    def actions(self, spec: Dict[str, Any]) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """(stages, pages) for a spec above the Simple tier"""
+        steps, structure = spec["steps"], spec["structure"]
+        ids = self.stage_ids(project_name(spec))
+        if structure == "if":
+            half = max(1, len(steps) // 2)
+            decision = {"name": "Input Exists?", "type": "Decision", "stageid": next(ids),
+                        "content": '<decision expression="FileExists(&quot;C:\\flowbots_lab\\input\\data.txt&quot;)" />'}
+            then_stages = self.link(self.stages(steps[:half]), ids)
+            else_stages = self.link(self.stages(steps[half:], half + 1), ids)
+            decision["ontrue"] = then_stages[0]["stageid"] if then_stages else "@end"
+            decision["onfalse"] = else_stages[0]["stageid"] if else_stages else "@end"
+            return [decision] + then_stages + else_stages, []
+        if structure == "loop":
+            return self.link(
+                [{"name": "Loop Start", "type": "LoopStart", "content": '<groupid>loop1</groupid><looptype>ForEach</looptype>'}]
+                + self.stages(steps)
+                + [{"name": "Loop End", "type": "LoopEnd", "content": '<groupid>loop1</groupid>'}],
+                ids,
+            ), []
+        if structure == "trycatch":
+            # Page-level recovery: an exception in any step jumps to Recover
+            handler = self.link([
+                {"name": "Recover", "type": "Recover", "content": ""},
+                dict(self.LOG_STAGE, name="Log Failure"),
+                {"name": "Resume", "type": "Resume", "content": ""},
+            ], ids)
+            return self.link(self.stages(steps), ids) + handler, []
+        if structure == "subflows":
+            groups = [
+                (f"Sub {n:02d}", self.stages(group, (n - 1) * SUBFLOW_SIZE + 1))
+                for n, group in enumerate(chunks(steps, SUBFLOW_SIZE), 1)
+            ]
+            return self.subpages(groups, ids)
+        return self.link(self.stages(steps), ids), []
+
+    def emit(self, spec: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+        name = project_name(spec)
+        if spec["tier"] == "simple":
+            actions, pages = BP_TESTS[spec["test_id"]][2], []
+        else:
+            actions, pages = self.actions(spec)
+        xml_content = generate_bp_xml(
+            spec["test_id"], spec["name"], spec["description"], actions,
+            project_name=name, seed=name, pages=pages,
+        )
+        return [
+            (f"{name}.bprelease", xml_content.encode("utf-8")),
+            (f"{name}.bprelease.zip", build_bp_release_zip(spec["test_id"], name, spec["description"], xml_content)),
+        ]
+
+
+EMITTERS = {
+    emitter.platform: emitter
+    for emitter in [UiPathEmitter(), PadEmitter(), BluePrismEmitter()]
+}
+
+
+def spec_hash(emitter, spec: Dict[str, Any]) -> str:
+    """Changes whenever the spec, the templates it uses or the emitter change"""
+    payload = json.dumps(
+        {"platform": emitter.platform, "version": emitter.version, "spec": spec, "inputs": emitter.inputs(spec)},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_one(job: Tuple[str, Dict[str, Any], str]) -> Dict[str, str]:
+    """Emit one spec and write its files (runs in a pool worker); returns {path: sha256}"""
+    platform, spec, output_dir = job
+    os.makedirs(output_dir, exist_ok=True)
+    written = {}
+    for filename, data in EMITTERS[platform].emit(spec):
+        path = write_atomic(os.path.join(output_dir, filename), data)
+        written[path] = hashlib.sha256(data).hexdigest()
+    return written
+
+
+def load_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def save_manifest(path: str, manifest: Dict[str, Dict[str, Any]]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def generate(
+    platforms: List[str],
+    tiers: List[str],
+    output_root: str = ARTIFACTS_SOURCE,
+    manifest_path: str = MANIFEST_FILE,
+    workers: int = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Build every (platform, tier, test) artifact whose spec changed; returns counts"""
+    manifest = {} if force else load_manifest(manifest_path)
+    specs = build_specs(tiers)
+
+    jobs, hashes, skipped = [], {}, 0
+    for platform in platforms:
+        emitter = EMITTERS[platform]
+        for spec in specs:
+            key = f"{platform}/{spec['tier']}/{spec['test_id']}"
+            digest = spec_hash(emitter, spec)
+            entry = manifest.get(key)
+            if entry and entry["hash"] == digest and all(os.path.exists(p) for p in entry["files"]):
+                skipped += 1
+                continue
+            hashes[key] = digest
+            jobs.append((platform, spec, os.path.join(output_root, platform, spec["tier"])))
+
+    built = failed = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(build_one, job): job for job in jobs}
+            for future, (platform, spec, _) in futures.items():
+                key = f"{platform}/{spec['tier']}/{spec['test_id']}"
+                try:
+                    files = future.result()
+                except Exception as e:
+                    print(f"[{key}] ERROR: {e}")
+                    failed += 1
+                    continue
+                manifest[key] = {"hash": hashes[key], "files": sorted(files), "sha256": files}
+                built += 1
+        save_manifest(manifest_path, manifest)
+
+    return {"built": built, "skipped": skipped, "failed": failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate FLOWBOTS source artifacts")
+    parser.add_argument("--platforms", default=",".join(EMITTERS))
+    parser.add_argument("--tiers", default=",".join(TIER_SPECS))
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if specs are unchanged")
+    parser.add_argument("--output", default=ARTIFACTS_SOURCE)
+    args = parser.parse_args()
+
+    platforms = [p for p in args.platforms.split(",") if p]
+    tiers = [t for t in args.tiers.split(",") if t]
+    unknown = [p for p in platforms if p not in EMITTERS] + [t for t in tiers if t not in TIER_SPECS]
+    if unknown:
+        parser.error(f"unknown platform/tier: {', '.join(unknown)}")
+
+    manifest_path = MANIFEST_FILE if args.output == ARTIFACTS_SOURCE else os.path.join(args.output, ".generate_manifest.json")
+
+    print(f"Generating {', '.join(platforms)} x {', '.join(tiers)} in {args.output}")
+    print("=" * 60)
+    counts = generate(platforms, tiers, args.output, manifest_path, args.workers, args.force)
+    print("=" * 60)
+    print(f"Built {counts['built']}, unchanged {counts['skipped']}, failed {counts['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""SLA-aware priority scheduler for conversion jobs
+
+Implements the queue model from AUTOHEAL_PIPELINE.md in-process:
+
+- Priorities: urgent (15 min SLA), standard (1 h) and batch (24 h). A job's
+  deadline is its submit time plus its SLA.
+- Each target platform has a heap of pending jobs ordered earliest deadline
+  first (ties: higher priority, then submit order), and a fixed number of
+  concurrency slots. Dispatch takes the earliest deadline among platforms with
+  a free slot.
+- Preemption: an urgent job that finds its platform's slots full cancels the
+  running batch job with the latest deadline. That job is re-queued with its
+  original deadline. Cancellation is cooperative: the handler gets the job's
+  `cancel` event, and run_conversion_test stops polling when it is set. The
+  urgent job takes the slot at once, so the platform briefly runs one over its
+  cap until the batch job notices.
+- States: PENDING -> IN_PROGRESS -> VALIDATING -> COMPLETE. A failure is
+  classified with error_signatures. Healable and retryable failures go
+  through HEALING back to PENDING after a growing, jittered delay
+  (HEAL_BACKOFF), at most MAX_HEAL_ATTEMPTS times; anything
+  else goes to BLOCKED for manual review. Every transition is appended to a
+  journal and fsync'd, so a restarted scheduler resumes unfinished jobs.
+- SLA prediction: per-platform service time is an EWMA of observed job
+  durations. Walking each heap in deadline order gives each pending job a
+  predicted finish time, and jobs predicted to finish late are reported
+  (and alerted) before they miss.
+
+Usage:
+    python job_scheduler.py [--tier simple] [--priority batch] [--directions uipath:flowbots,...]
+                            [--slots N] [--limit N] [--journal PATH]
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import random
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field, fields
+from typing import Optional, Dict, Any, List, Callable
+
+from error_signatures import classify_result
+from checkpoint import truncate_torn_tail
+
+try:
+    from twilio_alert import send_alert
+except ImportError:
+    def send_alert(msg, priority="INFO", category=None): print(f"[{priority}] {msg}")
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+JOURNAL_FILE = os.path.join(LAB_DIR, "queue", "scheduler.journal")
+
+# Seconds from submit to deadline, and rank for tie-breaks (lower first)
+SLA_SECONDS = {"urgent": 15 * 60, "standard": 60 * 60, "batch": 24 * 60 * 60}
+PRIORITY_RANK = {"urgent": 0, "standard": 1, "batch": 2}
+
+PLATFORM_SLOTS = 2
+MAX_HEAL_ATTEMPTS = 3
+HEAL_BACKOFF = 5.0            # Seconds before the first heal retry; doubles per attempt
+DEFAULT_SERVICE_SECONDS = 60.0
+SERVICE_EWMA_ALPHA = 0.3
+SLA_CHECK_INTERVAL = 30.0
+
+PENDING = "PENDING"
+IN_PROGRESS = "IN_PROGRESS"
+VALIDATING = "VALIDATING"
+HEALING = "HEALING"
+BLOCKED = "BLOCKED"
+COMPLETE = "COMPLETE"
+FINAL_STATES = (COMPLETE, BLOCKED)
+
+TRANSITIONS = {
+    PENDING: {IN_PROGRESS},
+    IN_PROGRESS: {VALIDATING, HEALING, BLOCKED, PENDING},
+    VALIDATING: {COMPLETE, HEALING, BLOCKED},
+    HEALING: {PENDING, BLOCKED},
+    BLOCKED: {PENDING},
+    COMPLETE: set(),
+}
+
+
+@dataclass
+class Job:
+    """One conversion job and its scheduling state"""
+    job_id: str
+    source_file: str
+    source_platform: str
+    target_platform: str
+    test_id: str
+    tier: str = "simple"
+    priority: str = "standard"
+    submitted: float = field(default_factory=time.time)
+    deadline: float = 0.0
+    state: str = PENDING
+    heal_attempts: int = 0
+    preemptions: int = 0
+    not_before: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    heal_action: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_record(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name not in ("cancel", "result")}
+
+
+class StateJournal:
+    """Append-only JSON-lines log of job submissions and state transitions"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def append(self, entry: Dict[str, Any]):
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                # A torn line from a crash would merge with the next entry
+                truncate_torn_tail(self.path)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry, default=str) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def replay(self) -> Dict[str, Dict[str, Any]]:
+        """Latest record per job (torn or undecodable lines skipped)"""
+        jobs: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return jobs
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if "job" in entry:
+                    jobs[entry["job"]["job_id"]] = entry["job"]
+                elif entry.get("job_id") in jobs:
+                    jobs[entry["job_id"]].update(entry.get("fields", {}), state=entry["state"])
+        return jobs
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class JobScheduler:
+    """EDF heaps per target platform with slots, preemption and SLA prediction
+
+    Usage:
+        scheduler = JobScheduler(handler)
+        scheduler.submit(job)
+        scheduler.run()          # until every job is COMPLETE or BLOCKED
+
+    handler(job) -> result dict is called on a worker thread. Its "status"
+    decides the next state: "success" completes (after any "validation" in the
+    result passes), "preempted" re-queues, anything else is classified. A job
+    may be handled several times; its final outcome is job.result once run()
+    returns.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Job], Dict[str, Any]],
+        slots: Dict[str, int] = None,
+        default_slots: int = PLATFORM_SLOTS,
+        journal_path: Optional[str] = JOURNAL_FILE,
+        on_sla_risk: Callable[[List[Dict[str, Any]]], None] = None,
+    ):
+        self.handler = handler
+        self.slots = slots or {}
+        self.default_slots = default_slots
+        self.journal = StateJournal(journal_path) if journal_path else None
+        self.on_sla_risk = on_sla_risk
+        self.jobs: Dict[str, Job] = {}
+        self.service_seconds: Dict[str, float] = {}
+        self.stats = {"completed": 0, "blocked": 0, "healed": 0, "preempted": 0, "sla_missed": 0}
+        self._heaps: Dict[str, List[tuple]] = {}
+        self._delayed: List[tuple] = []   # (not_before, job_id) of heal retries
+        self._running: Dict[str, Dict[str, Job]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._last_sla_check = 0.0
+
+    # ------------------------------------------------------------ queueing
+
+    def platform_slots(self, platform: str) -> int:
+        return self.slots.get(platform, self.default_slots)
+
+    def submit(self, job: Job) -> Job:
+        """Queue a job (thread-safe); urgent jobs may preempt batch work
+
+        Raises ValueError if a job with the same job_id is already queued.
+        """
+        if not job.deadline:
+            job.deadline = job.submitted + SLA_SECONDS[job.priority]
+        with self._lock:
+            if job.job_id in self.jobs:
+                raise ValueError(f"{job.job_id}: already submitted")
+            self.jobs[job.job_id] = job
+            if self.journal:
+                self.journal.append({"ts": time.time(), "job": job.to_record()})
+            self._push(job)
+            if job.priority == "urgent":
+                self._preempt_for(job)
+        return job
+
+    def _push(self, job: Job):
+        entry = (job.deadline, PRIORITY_RANK[job.priority], next(self._seq), job.job_id)
+        heapq.heappush(self._heaps.setdefault(job.target_platform, []), entry)
+
+    def _defer(self, job: Job, delay: float):
+        """Re-queue a PENDING job once delay seconds have passed"""
+        job.not_before = time.time() + delay
+        heapq.heappush(self._delayed, (job.not_before, job.job_id))
+
+    def _release_delayed(self, now: float):
+        while self._delayed and self._delayed[0][0] <= now:
+            _, job_id = heapq.heappop(self._delayed)
+            job = self.jobs[job_id]
+            if job.state == PENDING:
+                self._push(job)
+
+    def _transition(self, job: Job, state: str, **fields):
+        if state not in TRANSITIONS[job.state]:
+            raise ValueError(f"{job.job_id}: illegal transition {job.state} -> {state}")
+        job.state = state
+        for name, value in fields.items():
+            setattr(job, name, value)
+        if self.journal:
+            self.journal.append({"ts": time.time(), "job_id": job.job_id, "state": state, "fields": fields})
+
+    def _preempt_for(self, job: Job):
+        running = self._running.get(job.target_platform, {})
+        if len(running) < self.platform_slots(job.target_platform):
+            return
+        victims = [j for j in running.values() if j.priority == "batch" and not j.cancel.is_set()]
+        if victims:
+            victim = max(victims, key=lambda j: j.deadline)
+            victim.cancel.set()
+            # Free its slot now; it is re-queued when the handler returns
+            del running[victim.job_id]
+            self.stats["preempted"] += 1
+            print(f"  Preempting {victim.job_id} for urgent {job.job_id}")
+
+    def _next_job(self) -> Optional[Job]:
+        """Pop the earliest-deadline job among platforms with a free slot"""
+        self._release_delayed(time.time())
+        best = None
+        for platform, heap in self._heaps.items():
+            while heap and self.jobs[heap[0][3]].state != PENDING:
+                heapq.heappop(heap)  # stale entry
+            if heap and len(self._running.get(platform, {})) < self.platform_slots(platform):
+                if best is None or heap[0] < self._heaps[best][0]:
+                    best = platform
+        if best is None:
+            return None
+        job = self.jobs[heapq.heappop(self._heaps[best])[3]]
+        job.cancel.clear()
+        self._running.setdefault(best, {})[job.job_id] = job
+        self._transition(job, IN_PROGRESS, started=time.time())
+        return job
+
+    # ------------------------------------------------------------ outcomes
+
+    def _finish(self, job: Job, result: Dict[str, Any]):
+        self._running.get(job.target_platform, {}).pop(job.job_id, None)
+        job.result = result
+        status = result.get("status")
+
+        if status == "preempted" or (job.cancel.is_set() and status != "success"):
+            job.preemptions += 1
+            self._transition(job, PENDING, preemptions=job.preemptions)
+            self._push(job)
+            return
+
+        elapsed = time.time() - (job.started or time.time())
+        previous = self.service_seconds.get(job.target_platform)
+        self.service_seconds[job.target_platform] = (
+            elapsed if previous is None else SERVICE_EWMA_ALPHA * elapsed + (1 - SERVICE_EWMA_ALPHA) * previous
+        )
+
+        if status == "success":
+            self._transition(job, VALIDATING)
+            validation = result.get("validation") or {"ok": True}
+            if validation.get("ok"):
+                self._complete(job)
+                return
+            result = dict(result, status="invalid", error="; ".join(validation.get("errors", [])))
+
+        signature = classify_result(result)
+        if signature.heal_action != "escalate" and job.heal_attempts < MAX_HEAL_ATTEMPTS:
+            self._transition(job, HEALING, heal_action=signature.heal_action, heal_attempts=job.heal_attempts + 1)
+            self.stats["healed"] += 1
+            # No heal strategies are automated yet: a heal is a tagged retry,
+            # held back so a transient API failure has time to clear
+            delay = HEAL_BACKOFF * 2 ** (job.heal_attempts - 1)
+            delay = delay / 2 + random.uniform(0, delay / 2)
+            self._transition(job, PENDING)
+            self._defer(job, delay)
+        else:
+            self._transition(job, BLOCKED, heal_action=signature.heal_action, finished=time.time())
+            self.stats["blocked"] += 1
+
+    def _complete(self, job: Job):
+        now = time.time()
+        self._transition(job, COMPLETE, finished=now)
+        self.stats["completed"] += 1
+        if now > job.deadline:
+            self.stats["sla_missed"] += 1
+
+    # ------------------------------------------------------------ prediction
+
+    def predict_sla_misses(self, now: float = None) -> List[Dict[str, Any]]:
+        """Pending and running jobs predicted to finish after their deadline"""
+        now = now or time.time()
+        at_risk = []
+        with self._lock:
+            for platform, heap in self._heaps.items():
+                service = self.service_seconds.get(platform, DEFAULT_SERVICE_SECONDS)
+                slots = self.platform_slots(platform)
+                # When each slot frees up, from the running jobs' expected ends
+                free_at = sorted(
+                    max(now, (j.started or now) + service) for j in self._running.get(platform, {}).values()
+                )
+                free_at = (free_at + [now] * slots)[:slots]
+                heapq.heapify(free_at)
+                for _, _, _, job_id in sorted(heap):
+                    job = self.jobs[job_id]
+                    if job.state != PENDING:
+                        continue
+                    finish = heapq.heappop(free_at) + service
+                    heapq.heappush(free_at, finish)
+                    if finish > job.deadline:
+                        at_risk.append({
+                            "job_id": job_id, "priority": job.priority, "platform": platform,
+                            "predicted_finish": finish, "late_by": round(finish - job.deadline, 1),
+                        })
+        return at_risk
+
+    def _check_sla(self):
+        now = time.time()
+        if now - self._last_sla_check < SLA_CHECK_INTERVAL:
+            return
+        self._last_sla_check = now
+        at_risk = self.predict_sla_misses(now)
+        if at_risk and self.on_sla_risk:
+            self.on_sla_risk(at_risk)
+
+    # ------------------------------------------------------------ running
+
+    def resume(self) -> int:
+        """Re-queue unfinished jobs from the journal; returns how many"""
+        if not self.journal:
+            return 0
+        resumed = 0
+        for record in self.journal.replay().values():
+            if record["state"] in FINAL_STATES or record["job_id"] in self.jobs:
+                continue
+            record["state"] = PENDING
+            job = Job(**record)
+            with self._lock:
+                self.jobs[job.job_id] = job
+                self._push(job)
+            resumed += 1
+        return resumed
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self.jobs.values() if job.state not in FINAL_STATES)
+
+    def run(self, workers: int = None) -> Dict[str, Job]:
+        """Dispatch until every job is COMPLETE or BLOCKED"""
+        if workers is None:
+            platforms = {job.target_platform for job in self.jobs.values()}
+            workers = sum(self.platform_slots(p) for p in platforms) + 1 or 1
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                with self._lock:
+                    while len(in_flight) < workers:
+                        job = self._next_job()
+                        if job is None:
+                            break
+                        print(f"  [{job.priority}] {job.job_id} -> {job.target_platform}")
+                        in_flight[pool.submit(self.handler, job)] = job
+                    if not in_flight and not self.pending():
+                        break
+                    idle = min(0.5, self._delayed[0][0] - time.time()) if self._delayed else 0.5
+                if in_flight:
+                    done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+                else:
+                    # Only delayed heal retries left; wait() on nothing returns at once
+                    time.sleep(max(0.01, idle))
+                    done = ()
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"status": "error", "error": str(e)}
+                    with self._lock:
+                        self._finish(job, result)
+                    print(f"  {job.job_id}: {job.state}")
+                self._check_sla()
+        if self.journal:
+            self.journal.close()
+        return self.jobs
+
+
+def alert_sla_risk(at_risk: List[Dict[str, Any]]):
+    urgent = [r for r in at_risk if r["priority"] == "urgent"]
+    worst = max(at_risk, key=lambda r: r["late_by"])
+    send_alert(
+        f"{len(at_risk)} jobs predicted to miss SLA ({len(urgent)} urgent); "
+        f"worst {worst['job_id']} late by {worst['late_by']:.0f}s",
+        "HIGH" if urgent else "MEDIUM",
+        category="sla risk",
+    )
+
+
+def main():
+    from flowbots_converter import (
+        FlowBotsClient, run_conversion_test, ARTIFACTS_SOURCE, DIR_TO_API,
+    )
+    from artifact_index import get_index, PLATFORM_EXT
+    from results_store import ResultsStore
+
+    parser = argparse.ArgumentParser(description="Run conversion jobs through the SLA scheduler")
+    parser.add_argument("--tier", default="simple")
+    parser.add_argument("--priority", default="batch", choices=sorted(SLA_SECONDS))
+    parser.add_argument("--directions", default="uipath:flowbots,pad:uipath",
+                        help="comma-separated source_dir:target_api pairs")
+    parser.add_argument("--slots", type=int, default=PLATFORM_SLOTS, help="concurrent jobs per target platform")
+    parser.add_argument("--limit", type=int, default=None, help="artifacts per direction")
+    parser.add_argument("--journal", default=JOURNAL_FILE)
+    parser.add_argument("--resume", action="store_true", help="re-queue unfinished jobs from the journal")
+    args = parser.parse_args()
+
+    client = FlowBotsClient()
+    store = ResultsStore(runner="job_scheduler")
+
+    def handler(job: Job) -> Dict[str, Any]:
+        result = run_conversion_test(
+            client, job.source_file, job.source_platform, job.target_platform, job.test_id,
+            tier=job.tier, cancel=job.cancel,
+        )
+        result["priority"] = job.priority
+        return result
+
+    scheduler = JobScheduler(handler, default_slots=args.slots, journal_path=args.journal,
+                             on_sla_risk=alert_sla_risk)
+    # (source, target, test) already in the journal: re-queued by resume() or
+    # already finished, so they are not submitted again under new job IDs
+    journaled = set()
+    if args.resume:
+        print(f"Resumed {scheduler.resume()} unfinished jobs")
+        if scheduler.journal:
+            journaled = {
+                (record["source_platform"], record["target_platform"], record["test_id"])
+                for record in scheduler.journal.replay().values()
+            }
+
+    index = get_index(ARTIFACTS_SOURCE)
+    for direction in args.directions.split(","):
+        source_dir, target = direction.split(":")
+        source_platform = DIR_TO_API.get(source_dir, source_dir)
+        # One artifact per test: the primary format only (not the .bprelease.zip companion)
+        for path in index.list(source_dir, args.tier, PLATFORM_EXT.get(source_dir))[:args.limit]:
+            test_id = os.path.basename(path).split(".")[0]
+            if (source_platform, target, test_id) in journaled:
+                continue
+            scheduler.submit(Job(
+                job_id=f"{source_dir}-{target}-{test_id}-{int(time.time())}",
+                source_file=path,
+                source_platform=source_platform,
+                target_platform=target,
+                test_id=test_id,
+                tier=args.tier,
+                priority=args.priority,
+            ))
+
+    jobs = scheduler.run()
+    # One row per job: its final outcome, not every heal retry
+    for job in jobs.values():
+        if job.result is not None:
+            store.add(job.result)
+    store.close()
+    states: Dict[str, int] = {}
+    for job in jobs.values():
+        states[job.state] = states.get(job.state, 0) + 1
+    print(f"\nStates: {states}")
+    print(f"Stats: {scheduler.stats}")
+    sys.exit(0 if not states.get(BLOCKED) else 1)
+
+
+if __name__ == "__main__":
+    main()
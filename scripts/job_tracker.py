@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Central status poller for all in-flight FLOWBOTS conversion jobs
+
+One JobTracker owns every jobId submitted through an AsyncFlowBotsClient and
+polls them from a single sweep loop instead of one wait_for_job loop per job.
+Callers await a per-job future. When the API offers a batch status endpoint a
+sweep is one request; otherwise due jobs are polled round-robin under a fixed
+request rate, so status traffic stays flat as concurrency grows. Batching is
+only given up when the endpoint is missing (get_job_statuses returns None);
+a failed probe falls back to round-robin for that sweep and probes again
+after a backoff.
+"""
+
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+
+from polling import PollSchedule
+from retry import backoff_delay
+
+if TYPE_CHECKING:
+    from flowbots_async import AsyncFlowBotsClient
+
+SWEEP_INTERVAL = 0.25         # Seconds between sweeps when nothing is due sooner
+MAX_POLLS_PER_SECOND = 4.0    # Status requests per second across all jobs (round-robin mode)
+DEFAULT_TIMEOUT = 300
+MAX_BACKOFF = 30.0            # Longest pause after consecutive batch status errors
+
+
+@dataclass
+class TrackedJob:
+    """Polling state for one in-flight job"""
+    job_id: str
+    tier: str
+    source_platform: Optional[str]
+    target_platform: Optional[str]
+    future: asyncio.Future
+    schedule: PollSchedule
+    deadline: float
+    started: float = field(default_factory=time.monotonic)
+    next_poll: float = 0.0
+    last_status: str = "pending"
+    polls: int = 0
+
+
+class JobTracker:
+    """Polls every tracked job from one scheduled sweep
+
+    Usage:
+        async with JobTracker(client) as tracker:
+            status = await tracker.wait(job_id, tier="simple")
+    """
+
+    def __init__(
+        self,
+        client: "AsyncFlowBotsClient",
+        sweep_interval: float = SWEEP_INTERVAL,
+        max_polls_per_second: float = MAX_POLLS_PER_SECOND,
+    ):
+        self.client = client
+        self.sweep_interval = sweep_interval
+        self.max_polls_per_second = max_polls_per_second
+        self.jobs: Dict[str, TrackedJob] = {}
+        self.batch_supported: Optional[bool] = None
+        self.status_requests = 0
+        self.status_errors = 0
+        # Round-robin order, least recently polled first (an ordered set of job IDs)
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+        self._not_before = 0.0
+        self._batch_retry_at = 0.0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "JobTracker":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def start(self):
+        """Start the sweep loop on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop sweeping; jobs still in flight resolve as cancelled"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for job in list(self.jobs.values()):
+            self._resolve(job, {"error": "cancelled", "message": "Job tracker stopped"})
+
+    def track(
+        self,
+        job_id: str,
+        tier: str = "simple",
+        source_platform: str = None,
+        target_platform: str = None,
+        timeout: int = DEFAULT_TIMEOUT,
+    ) -> asyncio.Future:
+        """Register a job; the returned future resolves to its final status"""
+        if job_id in self.jobs:
+            return self.jobs[job_id].future
+
+        schedule = self.client.poller.schedule(tier, source_platform, target_platform)
+        now = time.monotonic()
+        job = TrackedJob(
+            job_id=job_id,
+            tier=tier,
+            source_platform=source_platform,
+            target_platform=target_platform,
+            future=asyncio.get_running_loop().create_future(),
+            schedule=schedule,
+            deadline=now + timeout,
+            next_poll=now + schedule.next_delay(),
+        )
+        self.jobs[job_id] = job
+        self._order[job_id] = None
+        self.start()
+        self._wakeup.set()
+        return job.future
+
+    async def wait(self, job_id: str, **kwargs) -> Dict[str, Any]:
+        """Track a job and wait for its final status (drop-in for wait_for_job)"""
+        return await self.track(job_id, **kwargs)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs still in flight"""
+        return len(self.jobs)
+
+    def snapshot(self) -> Dict[str, int]:
+        """In-flight job counts by last seen status"""
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.last_status] = counts.get(job.last_status, 0) + 1
+        return counts
+
+    async def _run(self):
+        while True:
+            await self._sweep()
+            now = time.monotonic()
+            if self.jobs:
+                next_due = min(job.next_poll for job in self.jobs.values())
+                delay = min(self.sweep_interval, max(0.0, next_due - now))
+                delay = max(delay, self._not_before - now)
+            else:
+                delay = None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _due(self, now: float) -> List[TrackedJob]:
+        """Due jobs in round-robin order (least recently polled first)
+
+        In batch mode jobs due within the next sweep ride along, since one
+        request covers them all.
+        """
+        slack = self.sweep_interval if self.batch_supported else 0.0
+        due = []
+        for job_id in list(self._order):
+            job = self.jobs[job_id]
+            if now >= job.deadline:
+                self._resolve(job, {
+                    "error": "timeout",
+                    "message": f"Job did not complete within {int(job.deadline - job.started)}s",
+                })
+            elif now + slack >= job.next_poll:
+                due.append(job)
+        return due
+
+    async def _sweep(self):
+        now = time.monotonic()
+        if now < self._not_before:
+            return
+        due = self._due(now)
+        if not due:
+            return
+
+        if self.batch_supported is not False and now >= self._batch_retry_at:
+            try:
+                statuses = await self.client.get_job_statuses([job.job_id for job in due])
+            except Exception as e:
+                # A failed sweep must not end the loop: deadlines are enforced here
+                self.status_requests += 1
+                self.status_errors += 1
+                delay = backoff_delay(self.status_errors - 1, self.sweep_interval, MAX_BACKOFF)
+                if self.batch_supported:
+                    # Known batch endpoint having a bad moment: back off, keep batching
+                    self._not_before = now + delay
+                    print(f"    Batch status failed ({type(e).__name__}: {e}); retrying in {delay:.1f}s")
+                    return
+                # Unconfirmed endpoint: says nothing about whether it exists, so
+                # poll one by one for now and probe again after the backoff
+                self._batch_retry_at = now + delay
+                print(f"    Batch status failed ({type(e).__name__}: {e}); polling jobs one by one")
+            else:
+                self.status_requests += 1
+                self.status_errors = 0
+                if statuses is None:
+                    # 404/405/501: no batch endpoint on this server
+                    self.batch_supported = False
+                else:
+                    self.batch_supported = True
+                    for job in due:
+                        self._update(job, statuses.get(job.job_id))
+                    return
+
+        # Round-robin: spend at most one sweep's worth of the request budget,
+        # then hold the next sweep back until that budget has been earned
+        budget = max(1, int(self.max_polls_per_second * self.sweep_interval))
+        polled = due[:budget]
+        self._not_before = now + len(polled) / self.max_polls_per_second
+        for job in polled:
+            try:
+                status = await self.client.get_job_status(job.job_id)
+            except Exception as e:
+                status = {"status": job.last_status, "message": str(e)}
+            self.status_requests += 1
+            self._update(job, status)
+            if job.job_id in self._order:
+                self._order.move_to_end(job.job_id)
+
+    def _update(self, job: TrackedJob, status: Optional[Dict[str, Any]]):
+        job.polls += 1
+        if status is None:
+            status = {"status": job.last_status}
+        job.last_status = status.get("status", "unknown")
+
+        if job.last_status in ["completed", "failed"]:
+            if job.last_status == "completed":
+                self.client.poller.record(
+                    job.tier, job.source_platform, job.target_platform,
+                    time.monotonic() - job.started,
+                )
+            self._resolve(job, status)
+            return
+
+        retry_after = self.client.retry_after.pop(job.job_id, None)
+        job.next_poll = time.monotonic() + job.schedule.next_delay(retry_after)
+
+    def _resolve(self, job: TrackedJob, status: Dict[str, Any]):
+        self.jobs.pop(job.job_id, None)
+        self._order.pop(job.job_id, None)
+        self.client.retry_after.pop(job.job_id, None)
+        if not job.future.done():
+            job.future.set_result(status)
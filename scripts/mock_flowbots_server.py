@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""Local stand-in for the FLOWBOTS Conversion API, for offline benchmarking
+
+Implements the endpoints FlowBotsClient uses, with configurable latency,
+failure rates, worker capacity (queue depth) and output sizes:
+
+    GET  /health
+    GET  /convert/platforms
+    POST /api/v1/convert            -> 202 {"jobId", "status", "statusUrl", "filesUrl"}
+    GET  /api/v1/jobs/{id}          -> pending | in_progress | completed | failed
+    POST /api/v1/jobs/status        -> batch status (only with --batch-status)
+    GET  /api/v1/jobs/{id}/files    -> ZIP, honors Range
+    POST /api/v1/assess
+    GET  /__stats                   -> request and connection counters
+
+Job progress is computed from timestamps rather than background threads: each
+job is assigned the earliest free worker slot at submission and a sampled
+processing time, so status is a pure function of the clock.
+
+Usage:
+    python mock_flowbots_server.py --port 8765 --latency lognormal:0.0,0.8 --workers 4
+    FLOWBOTS_API_BASE=http://127.0.0.1:8765 python flowbots_converter.py
+"""
+
+import io
+import json
+import math
+import heapq
+import random
+import argparse
+import threading
+import time
+import uuid
+import zipfile
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+SOURCE_PLATFORMS = ["uipath", "automationAnywhere", "powerAutomate", "bluePrism", "flowbots"]
+TARGET_PLATFORMS = ["flowbots", "automationAnywhere", "powerAutomate", "powerAutomateCloud", "uipath"]
+
+
+def parse_distribution(spec: str):
+    """Parse a latency spec into a sampler returning seconds
+
+    fixed:S | uniform:LO,HI | exp:MEAN | lognormal:MU,SIGMA
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "exp":
+        return lambda rng: rng.expovariate(1 / values[0])
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class MockState:
+    """Jobs, worker slots and counters shared by all handler threads"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.sample_processing = parse_distribution(args.latency)
+        self.lock = threading.Lock()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.worker_free_at = [0.0] * args.workers
+        heapq.heapify(self.worker_free_at)
+        self.requests: Dict[str, int] = {}
+        self.connections = 0
+
+    def count(self, endpoint: str):
+        with self.lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def submit(self, source: str, target: str, upload_bytes: int) -> Dict[str, Any]:
+        with self.lock:
+            now = time.time()
+            queued = sum(1 for job in self.jobs.values() if job["start"] > now)
+            if self.args.queue_limit and queued >= self.args.queue_limit:
+                return None
+            start = max(now, heapq.heappop(self.worker_free_at))
+            end = start + self.sample_processing(self.rng)
+            heapq.heappush(self.worker_free_at, end)
+            job_id = str(uuid.uuid4())
+            self.jobs[job_id] = {
+                "jobId": job_id,
+                "sourcePlatform": source,
+                "targetPlatform": target,
+                "uploadBytes": upload_bytes,
+                "created": now,
+                "start": start,
+                "end": end,
+                "fails": self.rng.random() < self.args.failure_rate,
+            }
+            return self.jobs[job_id]
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        now = time.time()
+        if now < job["start"]:
+            state = "pending"
+        elif now < job["end"]:
+            state = "in_progress"
+        else:
+            state = "failed" if job["fails"] else "completed"
+        body = {
+            "jobId": job_id,
+            "status": state,
+            "sourcePlatform": job["sourcePlatform"],
+            "targetPlatform": job["targetPlatform"],
+        }
+        if state == "failed":
+            body["error"] = "EACCES: permission denied, open '/app/output/index.js'"
+        return body
+
+    def output_zip(self, job_id: str) -> bytes:
+        """Deterministic ZIP of roughly --output-size bytes for a job"""
+        job = self.jobs[job_id]
+        if "zip" not in job:
+            rng = random.Random(job_id)
+            buf = io.BytesIO()
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr("index.js", f"// Converted from {job['sourcePlatform']}\nmodule.exports = {{}};\n")
+                zf.writestr("package.json", json.dumps({"name": f"flowbots-{job_id[:8]}", "version": "1.0.0"}))
+                if self.args.output_size:
+                    zf.writestr("assets/payload.bin", rng.randbytes(self.args.output_size), zipfile.ZIP_STORED)
+            job["zip"] = buf.getvalue()
+        return job["zip"]
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: MockState = None
+
+    def setup(self):
+        super().setup()
+        with self.state.lock:
+            self.state.connections += 1
+
+    def log_message(self, fmt, *args):
+        if self.state.args.verbose:
+            super().log_message(fmt, *args)
+
+    def _send_json(self, code: int, body: Any, headers: Dict[str, str] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _simulate(self) -> bool:
+        """Apply request latency and random 5xx; returns False if an error was sent"""
+        args = self.state.args
+        if args.request_latency:
+            time.sleep(args.request_latency)
+        if args.error_rate and self.state.rng.random() < args.error_rate:
+            self._send_json(503, {"error": "Service Unavailable"}, {"Retry-After": "1"})
+            return False
+        return True
+
+    def _form_fields(self, body: bytes) -> Dict[str, Any]:
+        content_type = self.headers.get("Content-Type", "")
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        fields = {}
+        if message.is_multipart():
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                payload = part.get_payload(decode=True) or b""
+                fields[name] = payload if part.get_filename() else payload.decode("utf-8", "replace")
+        return fields
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip("/")
+        parts = path.strip("/").split("/")
+
+        if path == "/health":
+            self.state.count("health")
+            return self._send_json(200, {"status": "healthy", "mock": True})
+        if path == "/convert/platforms":
+            self.state.count("platforms")
+            return self._send_json(200, {"source": SOURCE_PLATFORMS, "target": TARGET_PLATFORMS})
+        if path == "/__stats":
+            with self.state.lock:
+                stats = {
+                    "requests": dict(self.state.requests),
+                    "connections": self.state.connections,
+                    "jobs": len(self.state.jobs),
+                }
+            return self._send_json(200, stats)
+
+        if len(parts) >= 4 and parts[:3] == ["api", "v1", "jobs"]:
+            job_id = parts[3]
+            if not self._simulate():
+                return
+            if len(parts) == 4:
+                self.state.count("status")
+                status = self.state.status(job_id)
+                if status is None:
+                    return self._send_json(404, {"error": "Job not found"})
+                headers = {}
+                if self.state.args.retry_after and status["status"] in ["pending", "in_progress"]:
+                    headers["Retry-After"] = str(self.state.args.retry_after)
+                return self._send_json(200, status, headers)
+            if len(parts) == 5 and parts[4] == "files":
+                self.state.count("files")
+                return self._send_files(job_id)
+
+        self._send_json(404, {"error": "Not found"})
+
+    def _send_files(self, job_id: str):
+        status = self.state.status(job_id)
+        if status is None or status["status"] != "completed":
+            return self._send_json(404, {"error": "Files not available"})
+        data = self.state.output_zip(job_id)
+
+        start, end, code = 0, len(data) - 1, 200
+        range_header = self.headers.get("Range", "")
+        if range_header.startswith("bytes="):
+            first, _, last = range_header[6:].partition("-")
+            start = int(first or 0)
+            end = int(last) if last else end
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            code = 206
+
+        chunk = data[start:end + 1]
+        self.send_response(code)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(len(chunk)))
+        self.send_header("Accept-Ranges", "bytes")
+        if code == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.end_headers()
+        self.wfile.write(chunk)
+
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip("/")
+        body = self._read_body()
+
+        if path == "/api/v1/convert":
+            self.state.count("convert")
+            if not self._simulate():
+                return
+            fields = self._form_fields(body)
+            source, target = fields.get("sourcePlatform"), fields.get("targetPlatform")
+            if "file" not in fields or source not in SOURCE_PLATFORMS or target not in TARGET_PLATFORMS:
+                return self._send_json(400, {"error": "Invalid request", "fields": sorted(fields)})
+            job = self.state.submit(source, target, len(fields["file"]))
+            if job is None:
+                return self._send_json(429, {"error": "Queue full"}, {"Retry-After": "5"})
+            job_id = job["jobId"]
+            return self._send_json(202, {
+                "jobId": job_id,
+                "status": "pending",
+                "statusUrl": f"/api/v1/jobs/{job_id}",
+                "filesUrl": f"/api/v1/jobs/{job_id}/files",
+            })
+
+        if path == "/api/v1/jobs/status" and self.state.args.batch_status:
+            self.state.count("batch_status")
+            if not self._simulate():
+                return
+            job_ids = json.loads(body or b"{}").get("jobIds", [])
+            jobs = [self.state.status(job_id) or {"jobId": job_id, "status": "unknown"} for job_id in job_ids]
+            return self._send_json(200, {"jobs": jobs})
+
+        if path == "/api/v1/assess":
+            self.state.count("assess")
+            if not self._simulate():
+                return
+            fields = self._form_fields(body)
+            size = len(fields.get("file", b""))
+            return self._send_json(200, {
+                "sourcePlatform": fields.get("sourcePlatform"),
+                "targetPlatform": fields.get("targetPlatform"),
+                "complexity": "simple" if size < 64 * 1024 else "complex",
+                "estimation": {"hours": max(1, math.ceil(size / 65536))},
+                "securityScan": {"issues": []},
+                "statistics": {"bytes": size},
+            })
+
+        self._send_json(404, {"error": "Not found"})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock FLOWBOTS Conversion API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="lognormal:-1.0,0.8",
+                        help="job processing time: fixed:S | uniform:LO,HI | exp:MEAN | lognormal:MU,SIGMA")
+    parser.add_argument("--request-latency", type=float, default=0.0, help="extra seconds per request")
+    parser.add_argument("--workers", type=int, default=4, help="jobs processed concurrently")
+    parser.add_argument("--queue-limit", type=int, default=0, help="max queued jobs before 429 (0 = unbounded)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of jobs ending failed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--output-size", type=int, default=64 * 1024, help="payload bytes in each output ZIP")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds on unfinished status")
+    parser.add_argument("--batch-status", action="store_true", help="serve POST /api/v1/jobs/status")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def make_server(args) -> ThreadingHTTPServer:
+    handler = type("BoundMockHandler", (MockHandler,), {"state": MockState(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(argv=None) -> ThreadingHTTPServer:
+    """Start a mock server on a background thread (port 0 picks a free port)"""
+    server = make_server(parse_args(argv))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    args = parse_args()
+    server = make_server(args)
+    print(f"Mock FLOWBOTS API listening on http://{args.host}:{server.server_port}")
+    print(f"  export FLOWBOTS_API_BASE=http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Adaptive job-status polling for FLOWBOTS conversion jobs
+
+Poll intervals start short relative to how long a job of the same tier and
+direction is expected to take, back off with jitter once that expectation is
+exceeded, and never undercut a server Retry-After hint.
+
+Learned durations are written at most every SAVE_INTERVAL seconds and once
+more at exit (or when the owner calls save()), not after every job.
+"""
+
+import os
+import json
+import atexit
+import random
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict
+
+from artifact_io import write_atomic
+
+# Seed expectations (seconds) per tier, used until a direction has history
+DEFAULT_EXPECTED_DURATION = {
+    "simple": 1.0,
+    "moderate": 5.0,
+    "complex": 20.0,
+    "supercomplex": 60.0,
+    "enterprise": 180.0,
+}
+FALLBACK_EXPECTED_DURATION = 10.0
+
+MIN_INTERVAL = 0.25      # Never poll faster than this
+MAX_INTERVAL = 30.0      # Never sleep longer than this between polls
+BACKOFF_FACTOR = 1.6     # Growth once a job is slower than expected
+JITTER = 0.2             # +/- fraction applied to every delay
+EWMA_ALPHA = 0.3         # Weight of the newest observed duration
+SAVE_INTERVAL = 30.0     # Seconds between history writes from record()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class PollSchedule:
+    """Sleep intervals for one job
+
+    Until the expected duration has elapsed the schedule polls every quarter of
+    it (clamped to MIN_INTERVAL..MAX_INTERVAL); after that each delay grows by
+    BACKOFF_FACTOR. Every delay gets +/- JITTER so parallel jobs spread out.
+    """
+
+    def __init__(
+        self,
+        expected: float,
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        rng: Optional[random.Random] = None,
+    ):
+        self.expected = expected
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.rng = rng or random
+        self.start = time.monotonic()
+        self.polls = 0
+        self._delay = self._clamp(expected / 4)
+
+    def _clamp(self, delay: float) -> float:
+        return min(self.max_interval, max(self.min_interval, delay))
+
+    def next_delay(self, retry_after: Optional[float] = None) -> float:
+        """Seconds to sleep before the next poll"""
+        self.polls += 1
+        elapsed = time.monotonic() - self.start
+        if elapsed >= self.expected:
+            self._delay = self._clamp(self._delay * BACKOFF_FACTOR)
+
+        delay = self._delay * (1 + self.rng.uniform(-JITTER, JITTER))
+        delay = self._clamp(delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class AdaptivePoller:
+    """Learns expected job duration per (tier, source, target) direction
+
+    Observed durations are folded into an exponentially weighted average and,
+    when history_path is set, persisted so the next run starts informed.
+    record() saves at most every save_interval seconds (never, with None);
+    unsaved changes are written at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        history_path: str = None,
+        alpha: float = EWMA_ALPHA,
+        save_interval: Optional[float] = SAVE_INTERVAL,
+    ):
+        self.history_path = history_path
+        self.alpha = alpha
+        self.save_interval = save_interval
+        self.history: Dict[str, float] = {}
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._save_lock = threading.Lock()
+        if history_path and os.path.exists(history_path):
+            try:
+                with open(history_path) as f:
+                    self.history = {k: float(v) for k, v in json.load(f).items()}
+            except (OSError, ValueError):
+                self.history = {}
+        if history_path:
+            atexit.register(self.save)
+
+    @staticmethod
+    def key(tier: str, source: str, target: str) -> str:
+        return f"{(tier or '').lower()}|{source or ''}|{target or ''}"
+
+    def expected_duration(self, tier: str, source: str = None, target: str = None) -> float:
+        """Expected seconds for a job in this direction"""
+        learned = self.history.get(self.key(tier, source, target))
+        if learned is not None:
+            return learned
+        return DEFAULT_EXPECTED_DURATION.get((tier or "").lower(), FALLBACK_EXPECTED_DURATION)
+
+    def schedule(self, tier: str, source: str = None, target: str = None) -> PollSchedule:
+        """Start a poll schedule for a new job"""
+        return PollSchedule(self.expected_duration(tier, source, target))
+
+    def record(self, tier: str, source: str, target: str, duration: float):
+        """Fold an observed job duration into the direction's expectation"""
+        key = self.key(tier, source, target)
+        previous = self.history.get(key)
+        if previous is None:
+            self.history[key] = duration
+        else:
+            self.history[key] = self.alpha * duration + (1 - self.alpha) * previous
+        self._dirty = True
+        if self.save_interval is not None and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def save(self):
+        """Persist learned expectations, if any changed (atomic replace)"""
+        if not self.history_path or not self._dirty:
+            return
+        with self._save_lock:
+            self._dirty = False
+            self._last_save = time.monotonic()
+            try:
+                os.makedirs(os.path.dirname(self.history_path) or ".", exist_ok=True)
+                write_atomic(self.history_path, json.dumps(dict(self.history), indent=2, sort_keys=True))
+            except OSError as e:
+                self._dirty = True
+                print(f"  Could not save poll history: {e}")
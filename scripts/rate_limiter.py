@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Token-bucket rate limiter shared by every FLOWBOTS client on this machine
+
+Uploads, status polls and downloads each have their own bucket (RATE_LIMITS).
+Bucket state (tokens, current rate, last refill, pause-until) lives in one
+small JSON file. Every read-modify-write happens under an exclusive lock on a
+sibling .lock file (msvcrt on Windows, fcntl elsewhere). That way several
+TestRunner workers, flowbots_converter.py and the scheduler share one budget
+instead of each spending the whole API limit.
+
+Rates adapt to what the API says:
+
+- 429: the bucket's rate is halved and the bucket pauses for Retry-After (or
+  one token interval).
+- X-RateLimit-Remaining / X-RateLimit-Reset (or the RateLimit-* draft names):
+  with nothing remaining, the bucket pauses until the reset; otherwise its
+  rate is capped at what the remaining quota allows until then.
+- Successful responses raise a reduced rate back by a tenth of the configured
+  rate each time (AIMD), never above the configured rate or the quota cap,
+  whether or not they carry rate-limit headers.
+
+Usage:
+    python rate_limiter.py      # show the current shared bucket state
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from typing import Optional, Dict, Any
+
+from polling import parse_retry_after
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+STATE_FILE = os.path.join(LAB_DIR, "cache", "rate_limits.json")
+
+# bucket -> (requests per second, burst size)
+RATE_LIMITS = {
+    "upload": (1.0, 5),
+    "poll": (10.0, 20),
+    "download": (2.0, 5),
+}
+MIN_RATE = 0.05
+RECOVERY_STEP = 0.1     # fraction of the configured rate regained per success
+MAX_PAUSE = 300.0
+
+
+class FileLock:
+    """Exclusive inter-process lock on a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a+b")
+        if sys.platform == "win32":
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10 s of contention; keep waiting
+                    continue
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if sys.platform == "win32":
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+def _header(headers, *names) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class RateLimiter:
+    """Cross-process token buckets with rates that adapt to API feedback"""
+
+    def __init__(self, state_path: str = STATE_FILE, limits: Dict[str, tuple] = None):
+        self.state_path = state_path
+        self.limits = RATE_LIMITS if limits is None else limits
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "throttled": 0}
+        self._lock = FileLock(state_path + ".lock")
+        self._thread_lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, state: Dict[str, Dict[str, float]]):
+        # Written in place under the lock; a torn file just resets the buckets
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    def _bucket(self, state: Dict[str, Any], name: str, now: float) -> Dict[str, float]:
+        rate, burst = self.limits[name]
+        bucket = state.setdefault(name, {"tokens": burst, "rate": rate, "updated": now, "paused_until": 0.0})
+        elapsed = max(0.0, now - bucket["updated"])
+        bucket["tokens"] = min(burst, bucket["tokens"] + elapsed * bucket["rate"])
+        bucket["updated"] = now
+        return bucket
+
+    def _update(self, fn):
+        """Run fn(state, now) under both locks and persist the state"""
+        with self._thread_lock, self._lock:
+            state = self._load()
+            now = time.time()
+            value = fn(state, now)
+            self._save(state)
+            return value
+
+    def acquire(self, name: str, tokens: float = 1.0) -> float:
+        """Block until the bucket has a token; returns seconds waited"""
+        if name not in self.limits:
+            return 0.0
+        waited = 0.0
+        while True:
+            def take(state, now):
+                bucket = self._bucket(state, name, now)
+                if now < bucket["paused_until"]:
+                    return bucket["paused_until"] - now
+                if bucket["tokens"] >= tokens:
+                    bucket["tokens"] -= tokens
+                    return 0.0
+                return (tokens - bucket["tokens"]) / bucket["rate"]
+
+            delay = self._update(take)
+            if delay <= 0:
+                self.stats["acquired"] += 1
+                self.stats["waited_seconds"] += waited
+                return waited
+            delay = min(delay, MAX_PAUSE)
+            time.sleep(delay)
+            waited += delay
+
+    def observe(self, name: str, status: int, headers=None):
+        """Adapt the bucket's rate to one response"""
+        if name not in self.limits:
+            return
+        headers = headers or {}
+        base_rate, _ = self.limits[name]
+        remaining = _header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset = _header(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        if status != 429 and remaining is None and reset is None:
+            if status < 400:
+                self._recover(name, base_rate)
+            return
+        recover = status < 400
+
+        def adapt(state, now):
+            bucket = self._bucket(state, name, now)
+            reset_in = None
+            if reset is not None:
+                try:
+                    value = float(reset)
+                    # Epoch seconds or a delta, depending on the server
+                    reset_in = value - now if value > 1e9 else value
+                except ValueError:
+                    reset_in = parse_retry_after(reset)
+            if status == 429:
+                self.stats["throttled"] += 1
+                bucket["rate"] = max(MIN_RATE, bucket["rate"] / 2)
+                bucket["tokens"] = 0.0
+                pause = parse_retry_after(headers.get("Retry-After"))
+                if pause is None:
+                    pause = reset_in if reset_in is not None else 1 / bucket["rate"]
+                bucket["paused_until"] = max(bucket["paused_until"], now + min(pause, MAX_PAUSE))
+            if remaining is not None and reset_in is not None and reset_in > 0:
+                try:
+                    left = float(remaining)
+                except ValueError:
+                    return
+                if left <= 0:
+                    bucket["tokens"] = 0.0
+                    bucket["paused_until"] = max(bucket["paused_until"], now + min(reset_in, MAX_PAUSE))
+                    return
+                # The quota caps the rate; within that cap, recover as usual
+                cap = min(base_rate, left / reset_in)
+                if recover:
+                    bucket["rate"] += base_rate * RECOVERY_STEP
+                bucket["rate"] = max(MIN_RATE, min(bucket["rate"], cap))
+            elif recover:
+                bucket["rate"] = min(base_rate, bucket["rate"] + base_rate * RECOVERY_STEP)
+
+        self._update(adapt)
+
+    def _recover(self, name: str, base_rate: float):
+        state = self._load()
+        if state.get(name, {}).get("rate", base_rate) >= base_rate:
+            return  # nothing to recover; skip the locked write
+
+        def raise_rate(state, now):
+            bucket = self._bucket(state, name, now)
+            bucket["rate"] = min(base_rate, bucket["rate"] + base_rate * RECOVERY_STEP)
+
+        self._update(raise_rate)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Current bucket state, refilled to now"""
+        def read(state, now):
+            return {name: dict(self._bucket(state, name, now)) for name in self.limits}
+        return self._update(read)
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> RateLimiter:
+    """Process-wide limiter on the machine-wide state file"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
+
+
+if __name__ == "__main__":
+    for name, bucket in shared_limiter().snapshot().items():
+        paused = max(0.0, bucket["paused_until"] - time.time())
+        print(f"{name:9} rate {bucket['rate']:.2f}/s  tokens {bucket['tokens']:.1f}  paused {paused:.0f}s")
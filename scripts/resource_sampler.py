@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Background resource sampler with a throttle signal for the runners
+
+A daemon thread samples system CPU, memory and free disk, plus this process
+and its children (CLI / RPA subprocesses), every `interval` seconds. Samples
+go into a fixed-size ring buffer, so memory use stays constant however long a
+run lasts.
+
+- throttle() averages the last few samples and returns -1 (too busy), +1 (room
+  to spare) or 0. recommended_workers() turns that into a worker count that
+  moves one step at a time, so concurrency does not oscillate.
+- An alert is sent when a threshold is crossed (ok -> breached), not on every
+  breached sample. The metric must recover past a hysteresis band before it
+  can alert again. Thresholds match send_resource_alert and
+  monitor_resources.ps1.
+
+psutil is used when installed; otherwise load average, sysconf and
+resource.getrusage give a coarser picture. Those fallbacks do not exist on
+Windows (the lab box), so there psutil is required: without it system CPU and
+memory cannot be measured, throttle() always holds and no CPU/memory alert
+can fire. start() warns loudly when that is the case. Without psutil the
+process memory figure is the peak RSS (proc_rss_peak_mb), not the current one.
+"""
+
+import os
+import sys
+import time
+import shutil
+import threading
+from collections import deque, namedtuple
+from typing import Optional, Dict, Any, List
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+SAMPLE_INTERVAL = 1.0
+BUFFER_SIZE = 600           # 10 minutes at 1 sample/s
+WINDOW = 5                  # samples averaged for the throttle signal
+
+# Alert thresholds (same as send_resource_alert)
+CPU_HIGH_PERCENT = 85
+MEM_HIGH_PERCENT = 90
+DISK_LOW_GB = 10
+# Scale back up only below these, and re-arm alerts only past them
+CPU_LOW_PERCENT = 60
+MEM_LOW_PERCENT = 75
+DISK_REARM_GB = 12
+
+# Minimum seconds between worker-count changes
+ADJUST_INTERVAL = 10.0
+
+Sample = namedtuple(
+    "Sample",
+    "timestamp cpu_percent mem_percent disk_free_gb proc_cpu_percent proc_rss_mb children proc_rss_peak_mb",
+)
+
+
+def _system_cpu() -> Optional[float]:
+    if psutil is not None:
+        return psutil.cpu_percent(interval=None)
+    try:
+        return min(100.0, os.getloadavg()[0] / (os.cpu_count() or 1) * 100)
+    except (AttributeError, OSError):
+        return None
+
+
+def _system_mem() -> Optional[float]:
+    if psutil is not None:
+        return psutil.virtual_memory().percent
+    try:
+        total = os.sysconf("SC_PHYS_PAGES")
+        return (1 - os.sysconf("SC_AVPHYS_PAGES") / total) * 100
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _disk_free_gb(path: str) -> Optional[float]:
+    try:
+        return shutil.disk_usage(path if os.path.exists(path) else os.getcwd()).free / (1024 ** 3)
+    except OSError:
+        return None
+
+
+class ResourceSampler:
+    """Ring buffer of resource samples, a throttle signal and threshold alerts"""
+
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL,
+        capacity: int = BUFFER_SIZE,
+        disk_path: str = LAB_DIR,
+        on_alert=None,
+    ):
+        self.interval = interval
+        self.disk_path = disk_path
+        # Called as on_alert(cpu, mem, disk) when a threshold is crossed
+        self.on_alert = on_alert
+        self.samples: deque = deque(maxlen=capacity)
+        self.alerts_sent = 0
+        self._breached = {"cpu": False, "mem": False, "disk": False}
+        self._workers: Optional[int] = None
+        self._last_adjust = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._proc = psutil.Process() if psutil is not None else None
+        self._last_cpu_time = (time.monotonic(), time.process_time())
+        # False once start() finds neither system CPU nor memory measurable
+        self.measurable = True
+
+    def __enter__(self) -> "ResourceSampler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            # Also primes psutil's cpu_percent baseline
+            self.measurable = _system_cpu() is not None or _system_mem() is not None
+            if not self.measurable:
+                print("=" * 60)
+                print("WARNING: cannot measure system CPU or memory on this machine")
+                print("  (install psutil: pip install psutil). Concurrency will not")
+                print("  adapt to load and no CPU/memory alert can fire.")
+                print("=" * 60)
+            self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval * 2)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Resource sampling failed: {e}")
+
+    def _process_usage(self) -> tuple:
+        """(cpu %, RSS MB, child count, peak RSS MB) for this process and its children
+
+        Without psutil only this process is seen, and only its peak RSS is
+        known; RSS MB and child count are then None.
+        """
+        if self._proc is not None:
+            procs = [self._proc]
+            try:
+                procs += self._proc.children(recursive=True)
+            except psutil.Error:
+                pass
+            cpu = rss = 0.0
+            for proc in procs:
+                try:
+                    cpu += proc.cpu_percent(interval=None)
+                    rss += proc.memory_info().rss
+                except psutil.Error:
+                    continue
+            return cpu, rss / (1024 * 1024), len(procs) - 1, None
+
+        now, cpu_time = time.monotonic(), time.process_time()
+        last_now, last_cpu = self._last_cpu_time
+        self._last_cpu_time = (now, cpu_time)
+        cpu = (cpu_time - last_cpu) / (now - last_now) * 100 if now > last_now else 0.0
+        peak_rss = None
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            peak_rss = peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+        return cpu, None, None, peak_rss
+
+    def sample(self) -> Sample:
+        """Take one sample now (also called by the background thread)"""
+        proc_cpu, proc_rss, children, proc_rss_peak = self._process_usage()
+        sample = Sample(
+            time.time(), _system_cpu(), _system_mem(), _disk_free_gb(self.disk_path),
+            proc_cpu, proc_rss, children, proc_rss_peak,
+        )
+        with self._lock:
+            self.samples.append(sample)
+        self._check_thresholds(sample)
+        return sample
+
+    def _check_thresholds(self, sample: Sample):
+        cpu, mem, disk = sample.cpu_percent, sample.mem_percent, sample.disk_free_gb
+        crossed = False
+        checks = [
+            ("cpu", cpu is not None and cpu > CPU_HIGH_PERCENT, cpu is not None and cpu < CPU_LOW_PERCENT),
+            ("mem", mem is not None and mem > MEM_HIGH_PERCENT, mem is not None and mem < MEM_LOW_PERCENT),
+            ("disk", disk is not None and disk < DISK_LOW_GB, disk is not None and disk > DISK_REARM_GB),
+        ]
+        for metric, breached, recovered in checks:
+            if breached and not self._breached[metric]:
+                self._breached[metric] = True
+                crossed = True
+            elif recovered:
+                self._breached[metric] = False
+
+        if crossed and self.on_alert is not None:
+            self.alerts_sent += 1
+            self.on_alert(round(cpu or 0, 1), round(mem or 0, 1), round(disk if disk is not None else 999, 1))
+
+    def recent(self, n: int = WINDOW) -> List[Sample]:
+        with self._lock:
+            return list(self.samples)[-n:]
+
+    def averages(self, n: int = WINDOW) -> Dict[str, Optional[float]]:
+        """Mean of each metric over the last n samples"""
+        recent = self.recent(n)
+        averages = {}
+        fields = ["cpu_percent", "mem_percent", "disk_free_gb", "proc_cpu_percent", "proc_rss_mb", "proc_rss_peak_mb"]
+        for field in fields:
+            values = [getattr(s, field) for s in recent if getattr(s, field) is not None]
+            averages[field] = sum(values) / len(values) if values else None
+        return averages
+
+    def throttle(self) -> int:
+        """-1 to shed load, +1 if there is headroom, 0 to hold"""
+        avg = self.averages()
+        cpu, mem = avg["cpu_percent"], avg["mem_percent"]
+        if cpu is None and mem is None:
+            return 0
+        if (cpu or 0) > CPU_HIGH_PERCENT or (mem or 0) > MEM_HIGH_PERCENT:
+            return -1
+        if (cpu or 0) < CPU_LOW_PERCENT and (mem or 0) < MEM_LOW_PERCENT:
+            return 1
+        return 0
+
+    def recommended_workers(self, max_workers: int) -> int:
+        """Worker count for now, stepped by at most one every ADJUST_INTERVAL"""
+        signal = self.throttle()
+        with self._lock:
+            if self._workers is None:
+                self._workers = max_workers
+            now = time.monotonic()
+            if now - self._last_adjust >= ADJUST_INTERVAL:
+                if signal:
+                    self._workers = max(1, min(max_workers, self._workers + signal))
+                    self._last_adjust = now
+            return min(self._workers, max_workers)
+
+    def summary(self) -> Dict[str, Any]:
+        """Peak and mean usage over the buffered samples"""
+        samples = self.recent(len(self.samples))
+        summary = {"samples": len(samples), "alerts": self.alerts_sent, "measurable": self.measurable}
+        for field in ["cpu_percent", "mem_percent", "proc_cpu_percent", "proc_rss_mb", "proc_rss_peak_mb"]:
+            values = [getattr(s, field) for s in samples if getattr(s, field) is not None]
+            if values:
+                summary[f"{field}_max"] = round(max(values), 1)
+                summary[f"{field}_mean"] = round(sum(values) / len(values), 1)
+        disks = [s.disk_free_gb for s in samples if s.disk_free_gb is not None]
+        if disks:
+            summary["disk_free_gb_min"] = round(min(disks), 1)
+        return summary
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with ResourceSampler() as sampler:
+        time.sleep(seconds)
+    for s in sampler.recent(len(sampler.samples)):
+        print(s)
+    print(sampler.summary())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of FLOWBOTS conversion results
+
+Results are keyed by the SHA-256 of the source artifact plus everything that
+can change the server's output: source platform, target platform, convert
+flags and API version. Each entry keeps the final job status JSON and the
+downloaded ZIP. Entries are evicted least-recently-used once the cache grows
+past its size budget.
+
+Usage:
+    python result_cache.py stats
+    python result_cache.py invalidate <cache-key | source-file>
+    python result_cache.py clear
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+from typing import Optional, Dict, Any
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+CACHE_DIR = os.path.join(LAB_DIR, "cache", "conversions")
+API_VERSION = "v1"
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def cache_key(
+    source_sha256: str,
+    source_platform: str,
+    target_platform: str,
+    options: Dict[str, Any] = None,
+    api_version: str = API_VERSION,
+) -> str:
+    """Stable key for one conversion request"""
+    material = json.dumps(
+        [source_sha256, source_platform, target_platform, options or {}, api_version],
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """LRU, size-bounded store of completed conversion results"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self.index: Dict[str, Dict[str, Any]] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path) as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+
+    def key_for(
+        self,
+        source_file: str,
+        source_platform: str,
+        target_platform: str,
+        options: Dict[str, Any] = None,
+    ) -> str:
+        return cache_key(file_sha256(source_file), source_platform, target_platform, options)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached {"job_status": ..., "zip_path": ...} for key, or None
+
+        An entry whose status or output ZIP is missing on disk is a miss
+        and is evicted, so a hit always has a ZIP to hand back.
+        """
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return None
+            entry_dir = self._entry_dir(key)
+            status_path = os.path.join(entry_dir, "status.json")
+            zip_path = os.path.join(entry_dir, "output.zip")
+            if not os.path.exists(status_path) or not os.path.exists(zip_path):
+                self._drop(key)
+                self._save_index()
+                return None
+            with open(status_path) as f:
+                job_status = json.load(f)
+            entry["last_access"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            self._save_index()
+            return {
+                "job_status": job_status,
+                "zip_path": zip_path,
+                "meta": dict(entry),
+            }
+
+    def put(
+        self,
+        key: str,
+        job_status: Dict[str, Any],
+        zip_path: Optional[str] = None,
+        meta: Dict[str, Any] = None,
+    ):
+        """Store a completed job's status and (optionally) its downloaded ZIP"""
+        with self._lock:
+            entry_dir = self._entry_dir(key)
+            os.makedirs(entry_dir, exist_ok=True)
+            with open(os.path.join(entry_dir, "status.json"), "w") as f:
+                json.dump(job_status, f, indent=2)
+            size = os.path.getsize(os.path.join(entry_dir, "status.json"))
+            if zip_path and os.path.exists(zip_path):
+                shutil.copyfile(zip_path, os.path.join(entry_dir, "output.zip"))
+                size += os.path.getsize(zip_path)
+
+            now = time.time()
+            self.index[key] = dict(meta or {}, size=size, created=now, last_access=now, hits=0)
+            self._evict()
+            self._save_index()
+
+    def _drop(self, key: str):
+        self.index.pop(key, None)
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def _evict(self):
+        total = sum(entry.get("size", 0) for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.index, key=lambda k: self.index[k].get("last_access", 0)):
+            total -= self.index[key].get("size", 0)
+            self._drop(key)
+            if total <= self.max_bytes:
+                break
+
+    def invalidate(self, key: str = None, source_sha256: str = None) -> int:
+        """Drop one key, every entry for a source hash, or (no args) everything"""
+        with self._lock:
+            if key is not None:
+                keys = [key] if key in self.index else []
+            elif source_sha256 is not None:
+                keys = [k for k, e in self.index.items() if e.get("source_sha256") == source_sha256]
+            else:
+                keys = list(self.index)
+            for k in keys:
+                self._drop(k)
+            self._save_index()
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self.index),
+                "bytes": sum(entry.get("size", 0) for entry in self.index.values()),
+                "max_bytes": self.max_bytes,
+                "hits": sum(entry.get("hits", 0) for entry in self.index.values()),
+            }
+
+
+def main():
+    """Cache maintenance commands"""
+    cache = ConversionCache()
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif command == "invalidate" and len(sys.argv) > 2:
+        target = sys.argv[2]
+        if os.path.isfile(target):
+            removed = cache.invalidate(source_sha256=file_sha256(target))
+        else:
+            removed = cache.invalidate(key=target)
+        print(f"Invalidated {removed} cache entries")
+    elif command == "clear":
+        print(f"Invalidated {cache.invalidate()} cache entries")
+    else:
+        print("Usage: python result_cache.py [stats | invalidate <cache-key | source-file> | clear]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Shared SQLite results store for all FLOWBOTS test runners
+
+TestRunner, run_conversions.py and flowbots_converter.py append every test
+result here as soon as it finishes, instead of writing one JSON file per test
+or one JSON list at the end of a run. Writes are buffered and committed in
+batches (WAL mode, so readers never block the runner). Aggregates such as pass
+rate per direction are single indexed queries.
+
+Usage:
+    python results_store.py [summary] [tier]
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from artifact_index import API_TO_DIR
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+RESULTS_DB = os.path.join(LAB_DIR, "results", "results.db")
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 5.0
+
+# Statuses that count as a pass (TestRunner uses PASS, the API runners success)
+PASS_STATUSES = ("PASS", "success")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    runner TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    tier TEXT,
+    source TEXT,
+    target TEXT,
+    status TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_tier ON results (tier);
+CREATE INDEX IF NOT EXISTS idx_results_direction ON results (source, target);
+CREATE INDEX IF NOT EXISTS idx_results_target ON results (target);
+CREATE INDEX IF NOT EXISTS idx_results_status ON results (status);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results (test_id, source, target);
+"""
+
+
+def platform_dir(name: Optional[str]) -> Optional[str]:
+    """Directory name for a platform given either naming scheme ("powerAutomate" -> "pad")"""
+    return API_TO_DIR.get(name, name)
+
+
+def new_run_id(runner: str) -> str:
+    return f"{runner}-{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+
+
+class ResultsStore:
+    """Append-only, batch-committed store of test results"""
+
+    def __init__(
+        self,
+        db_path: str = RESULTS_DB,
+        runner: str = "unknown",
+        run_id: str = None,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        on_commit=None,
+    ):
+        self.db_path = db_path
+        self.runner = runner
+        self.run_id = run_id or new_run_id(runner)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Called with the list of result dicts after each successful commit
+        self.on_commit = on_commit
+        self._pending: List[tuple] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(
+        self,
+        result: Dict[str, Any],
+        tier: str = None,
+        source: str = None,
+        target: str = None,
+    ):
+        """Queue one result; commits once the batch is full or stale
+
+        Platforms are stored as directory names ("pad", not "powerAutomate"),
+        whichever scheme the runner used, so a direction is one row in the
+        aggregates.
+        """
+        row = (
+            self.run_id,
+            self.runner,
+            result.get("test_id", "unknown"),
+            tier or result.get("tier"),
+            platform_dir(source or result.get("source_platform") or result.get("source")),
+            platform_dir(target or result.get("target_platform") or result.get("target")),
+            result.get("status", "unknown"),
+            result.get("timestamp") or datetime.now().isoformat(),
+            json.dumps(result, default=str),
+        )
+        with self._lock:
+            self._pending.append(row)
+            if (len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        """Commit any buffered results"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO results (run_id, runner, test_id, tier, source, target, status, timestamp, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._pending,
+                )
+            committed, self._pending = self._pending, []
+            if self.on_commit:
+                self.on_commit([json.loads(row[-1]) for row in committed])
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def status_counts(self, run_id: str = None) -> Dict[str, int]:
+        """Result counts by status, for one run or all runs"""
+        self.flush()
+        sql = "SELECT status, COUNT(*) FROM results"
+        params = ()
+        if run_id:
+            sql += " WHERE run_id = ?"
+            params = (run_id,)
+        return dict(self.conn.execute(sql + " GROUP BY status", params).fetchall())
+
+    def pass_rate_by_direction(self, tier: str = None, run_id: str = None) -> List[Dict[str, Any]]:
+        """Pass rate per (source, target), counting each test's latest result"""
+        self.flush()
+        where, params = [], []
+        if tier:
+            where.append("tier = ?")
+            params.append(tier)
+        if run_id:
+            where.append("run_id = ?")
+            params.append(run_id)
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        placeholders = ", ".join("?" for _ in PASS_STATUSES)
+        rows = self.conn.execute(
+            f"""
+            SELECT source, target, COUNT(*),
+                   SUM(CASE WHEN status IN ({placeholders}) THEN 1 ELSE 0 END)
+            FROM results
+            WHERE id IN (SELECT MAX(id) FROM results {where_sql} GROUP BY test_id, source, target)
+            GROUP BY source, target
+            ORDER BY source, target
+            """,
+            (*PASS_STATUSES, *params),
+        ).fetchall()
+        return [
+            {
+                "source": source,
+                "target": target,
+                "total": total,
+                "passed": passed,
+                "pass_rate": round(passed / total * 100, 1) if total else 0,
+            }
+            for source, target, total, passed in rows
+        ]
+
+    def latest(self, test_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent result for a test"""
+        self.flush()
+        row = self.conn.execute(
+            "SELECT data FROM results WHERE test_id = ? ORDER BY id DESC LIMIT 1", (test_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+def main():
+    """Print pass rate per direction"""
+    args = sys.argv[1:]
+    if args and args[0] == "summary":
+        args = args[1:]
+    tier = args[0] if args else None
+
+    with ResultsStore(runner="report") as store:
+        print(f"Results store: {store.db_path}")
+        print(f"Status counts: {store.status_counts()}")
+        print(f"\nPass rate per direction{f' ({tier})' if tier else ''}:")
+        for row in store.pass_rate_by_direction(tier=tier):
+            print(f"  {row['source']} -> {row['target']}: {row['passed']}/{row['total']} ({row['pass_rate']}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Bounded retries with jittered backoff, and a shared circuit breaker
+
+- Retryable: timeouts, dropped connections, HTTP 408/425/429 and 5xx. Other
+  HTTP errors (400, 401, 404, 413, ...) are permanent and returned at once.
+- At most MAX_ATTEMPTS tries (the pipeline's limit of 3). Between tries the
+  delay is "full jitter": uniform(0, min(MAX_DELAY, BASE_DELAY * 2**n)), or
+  the server's Retry-After when it asks for longer.
+- The circuit breaker watches the outcome of every call over a sliding
+  window. Once at least MIN_CALLS calls have failed at ERROR_RATE or worse, it
+  opens, and every caller pauses before sending anything. After COOLDOWN
+  seconds one probe call is let through (half-open): success closes the
+  circuit, failure re-opens it for another cooldown. One breaker is shared per
+  process (shared_breaker()), so a full outage costs one probe per cooldown
+  rather than a timeout per test.
+
+RetryPolicy.call_async and CircuitBreaker.before_call_async are the same
+logic for the asyncio client: they wait with asyncio.sleep, so a paused
+caller never blocks the event loop.
+"""
+
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from typing import Optional, Callable, Awaitable, Any
+
+from polling import parse_retry_after
+
+TRANSIENT_ERRORS = (TimeoutError, ConnectionError, asyncio.TimeoutError)
+try:
+    import requests
+    TRANSIENT_ERRORS += (
+        requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+        requests.exceptions.ChunkedEncodingError,
+    )
+except ImportError:
+    pass
+try:
+    import aiohttp
+    TRANSIENT_ERRORS += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+except ImportError:
+    pass
+
+MAX_ATTEMPTS = 3
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# Circuit breaker
+WINDOW_SECONDS = 60.0
+MIN_CALLS = 10
+ERROR_RATE = 0.5
+COOLDOWN = 30.0
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit is open"""
+
+
+def is_retryable_status(status: int) -> bool:
+    return status in RETRYABLE_STATUS
+
+
+def response_status(resp) -> int:
+    """HTTP status of a requests (status_code) or aiohttp (status) response"""
+    status = getattr(resp, "status_code", None)
+    return getattr(resp, "status", 200) if status is None else status
+
+
+def backoff_delay(attempt: int, base: float = BASE_DELAY, cap: float = MAX_DELAY) -> float:
+    """Full-jitter delay before retry number `attempt` (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Open on a high error rate; pause callers until a probe succeeds"""
+
+    def __init__(
+        self,
+        window: float = WINDOW_SECONDS,
+        min_calls: int = MIN_CALLS,
+        error_rate: float = ERROR_RATE,
+        cooldown: float = COOLDOWN,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.trips = 0
+        self._calls: deque = deque()   # (timestamp, ok)
+        self._failures = 0
+        self._probing = False
+        self._cond = threading.Condition()
+
+    def _expire(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window:
+            _, ok = self._calls.popleft()
+            if not ok:
+                self._failures -= 1
+
+    def _admit(self, now: float) -> Optional[float]:
+        """None if a call may go ahead (taking the probe when half-open), else seconds to wait
+
+        Caller holds self._cond.
+        """
+        if self.state == "closed":
+            return None
+        if self.state == "open" and now - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return None
+        return self.cooldown - (now - self.opened_at) if self.state == "open" else self.cooldown
+
+    def _bounded(self, wait: float, now: float, deadline: Optional[float]) -> float:
+        if deadline is not None:
+            if now >= deadline:
+                raise CircuitOpenError(f"circuit open for {now - self.opened_at:.0f}s")
+            wait = min(wait, deadline - now)
+        return max(0.05, wait)
+
+    def before_call(self, max_wait: Optional[float] = None):
+        """Block while the circuit is open; raise CircuitOpenError after max_wait"""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._admit(now)
+                if wait is None:
+                    return
+                self._cond.wait(self._bounded(wait, now, deadline))
+
+    async def before_call_async(self, max_wait: Optional[float] = None):
+        """before_call for coroutines; polls instead of blocking the event loop"""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                wait = self._admit(now)
+            if wait is None:
+                return
+            await asyncio.sleep(self._bounded(wait, now, deadline))
+
+    def record(self, ok: bool):
+        """Record the outcome of a call made after before_call()"""
+        now = time.monotonic()
+        with self._cond:
+            if self.state == "half_open" and self._probing:
+                self._probing = False
+                if ok:
+                    self.state = "closed"
+                    self._calls.clear()
+                    self._failures = 0
+                    print("Circuit closed: API is answering again")
+                else:
+                    self._open(now)
+                self._cond.notify_all()
+                return
+            self._calls.append((now, ok))
+            if not ok:
+                self._failures += 1
+            self._expire(now)
+            if (self.state == "closed" and len(self._calls) >= self.min_calls
+                    and self._failures / len(self._calls) >= self.error_rate):
+                self._open(now)
+
+    def abandon(self):
+        """The call made after before_call() failed locally before reaching the API
+
+        Counts nothing; a pending half-open probe is released so another
+        caller can probe instead of every caller waiting forever.
+        """
+        with self._cond:
+            if self._probing:
+                self._probing = False
+                self._cond.notify_all()
+
+    def _open(self, now: float):
+        self.state = "open"
+        self.opened_at = now
+        self.trips += 1
+        print(f"Circuit open: pausing API calls for {self.cooldown:.0f}s")
+
+
+_shared_breaker: Optional[CircuitBreaker] = None
+_shared_lock = threading.Lock()
+
+
+def shared_breaker() -> CircuitBreaker:
+    """Process-wide breaker used by every client that does not bring its own"""
+    global _shared_breaker
+    with _shared_lock:
+        if _shared_breaker is None:
+            _shared_breaker = CircuitBreaker()
+        return _shared_breaker
+
+
+class RetryPolicy:
+    """Call a function that returns an HTTP response, retrying transient failures
+
+    fn() must make one attempt and either return an object with status_code
+    or status (and optionally headers) or raise. The final response is returned even
+    if it is an error, so callers keep their own status handling; the final
+    transient exception is re-raised.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = MAX_ATTEMPTS,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self.sleep = sleep
+        self.stats = {"calls": 0, "retries": 0, "gave_up": 0}
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        self.stats["calls"] += 1
+        for attempt in range(self.max_attempts):
+            if self.breaker is not None:
+                self.breaker.before_call()
+            try:
+                resp = fn()
+            except TRANSIENT_ERRORS:
+                delay = self._after_error(attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._abandon()
+                raise
+            else:
+                delay = self._after_response(resp, attempt)
+                if delay is None:
+                    return resp
+            self.sleep(delay)
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """call() for a coroutine function; backoff and breaker waits use asyncio.sleep"""
+        self.stats["calls"] += 1
+        for attempt in range(self.max_attempts):
+            if self.breaker is not None:
+                await self.breaker.before_call_async()
+            try:
+                resp = await fn()
+            except TRANSIENT_ERRORS:
+                delay = self._after_error(attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._abandon()
+                raise
+            else:
+                delay = self._after_response(resp, attempt)
+                if delay is None:
+                    return resp
+            await asyncio.sleep(delay)
+
+    def _abandon(self):
+        # Not an API failure (missing upload, bad URL, lock file error,
+        # cancellation): free the probe slot so the breaker cannot wedge half-open
+        if self.breaker is not None:
+            self.breaker.abandon()
+
+    def _after_error(self, attempt: int) -> Optional[float]:
+        """Delay before retrying a transient exception, or None to re-raise it"""
+        if self.breaker is not None:
+            self.breaker.record(False)
+        if attempt + 1 >= self.max_attempts:
+            self.stats["gave_up"] += 1
+            return None
+        return self._delay(attempt)
+
+    def _after_response(self, resp: Any, attempt: int) -> Optional[float]:
+        """Delay before retrying a response, or None to return it"""
+        status = response_status(resp)
+        transient = is_retryable_status(status)
+        if self.breaker is not None:
+            # 429 is the server pacing us, not failing
+            self.breaker.record(not transient or status == 429)
+        if not transient:
+            return None
+        if attempt + 1 >= self.max_attempts:
+            self.stats["gave_up"] += 1
+            return None
+        headers = getattr(resp, "headers", None) or {}
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        close = getattr(resp, "close", None)
+        if close:
+            close()
+        return self._delay(attempt, retry_after)
+
+    def _delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay * 4))
+        self.stats["retries"] += 1
+        return delay
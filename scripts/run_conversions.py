@@ -5,12 +5,22 @@ import os
 import sys
 import json
 import time
+import threading
 import requests
 from datetime import datetime
 from pathlib import Path
 
+from artifact_index import get_index
+from results_store import ResultsStore
+from job_scheduler import JobScheduler, Job, alert_sla_risk
+from retry import RetryPolicy, shared_breaker
+from rate_limiter import shared_limiter
+from artifact_io import write_atomic
+from flowbots_converter import DIR_TO_API
+
 # Configuration
-API_BASE = "https://api.flowbotsai.com"
+# Override with FLOWBOTS_API_BASE (e.g. http://127.0.0.1:8765 for mock_flowbots_server.py)
+API_BASE = os.environ.get("FLOWBOTS_API_BASE", "https://api.flowbotsai.com").rstrip("/")
 APP_URL = "https://app.flowbotsai.com"
 LAB_DIR = r"C:\flowbots_lab"
 ARTIFACTS_SOURCE = os.path.join(LAB_DIR, "artifacts_source")
@@ -18,6 +28,14 @@ ARTIFACTS_CONVERTED = os.path.join(LAB_DIR, "artifacts_converted")
 RUNS_DIR = os.path.join(LAB_DIR, "runs")
 LOGS_DIR = os.path.join(LAB_DIR, "logs")
 
+# Endpoint discovery runs once per session and is cached on disk for a day
+DISCOVERY_FILE = os.path.join(LAB_DIR, "cache", "api_discovery.json")
+DISCOVERY_TTL = 24 * 60 * 60
+OPENAPI_PATHS = ["/openapi.json", "/api/v1/openapi.json", "/docs/openapi.json"]
+V1_CONVERT = "/api/v1/convert"
+# Older candidates, probed without a body (anything but 404 means the route exists)
+LEGACY_CONVERT_ENDPOINTS = ["/convert", "/api/convert", "/api/v1/convert", "/workflow/convert"]
+
 # Platform mapping
 PLATFORMS = {
     "uipath": {"name": "UiPath", "ext": ".nupkg"},
@@ -38,6 +56,11 @@ CONVERSION_MATRIX = [
     ("uipath", "flowbots"), ("pad", "flowbots"), ("aa", "flowbots"), ("blueprism", "flowbots"),
 ]
 
+# Retries transient API failures; pauses every request while the API is down
+RETRY = RetryPolicy(breaker=shared_breaker())
+# Uploads share the machine-wide "upload" bucket with every other client
+LIMITER = shared_limiter()
+
 # Simple tier tests
 SIMPLE_TESTS = [f"S{i:02d}" for i in range(1, 21)]
 
@@ -55,34 +78,173 @@ def ensure_dirs():
 
 
 def find_artifact(source_platform, tier, test_id):
-    """Find source artifact file"""
-    tier_dir = os.path.join(ARTIFACTS_SOURCE, source_platform, tier.lower())
-    if not os.path.exists(tier_dir):
-        return None
+    """Find source artifact file (O(1) lookup in the shared artifact index)"""
+    return get_index(ARTIFACTS_SOURCE).find(source_platform, tier, test_id)
+
 
-    # Look for matching file
-    for f in os.listdir(tier_dir):
-        if test_id.lower() in f.lower() or f"Simple_{test_id}" in f:
-            return os.path.join(tier_dir, f)
+_discovery = None
+_discovery_lock = threading.Lock()
 
-    # Try pattern matching
-    for f in os.listdir(tier_dir):
-        if f.endswith(PLATFORMS.get(source_platform, {}).get("ext", ".zip")):
-            # Get test number from filename
-            parts = f.replace(".zip", "").replace(".nupkg", "").replace(".bprelease", "").split("_")
-            for part in parts:
-                if part.upper() == test_id.upper():
-                    return os.path.join(tier_dir, f)
 
+def _openapi_convert(spec):
+    """(path, form fields, platforms) for the convert operation in an OpenAPI spec"""
+    for path, operations in sorted(spec.get("paths", {}).items(), key=lambda item: len(item[0])):
+        if "convert" not in path or "{" in path or "post" not in operations:
+            continue
+        content = operations["post"].get("requestBody", {}).get("content", {})
+        schema = next(iter(content.values()), {}).get("schema", {})
+        properties = schema.get("properties", {})
+        fields = {"source": "source", "target": "target"}
+        platforms = {}
+        for name, prop in properties.items():
+            for role in ["source", "target"]:
+                if name.lower().startswith(role):
+                    fields[role] = name
+                    if prop.get("enum"):
+                        platforms[role] = prop["enum"]
+        return path, fields, _platform_lists(platforms)
     return None
 
 
+def _platform_lists(body):
+    """{"source": [...], "target": [...]} from a platforms listing, or None
+
+    Accepts the v1 shape ({"source": [...], "target": [...]}) and close
+    variants (keys such as "sourcePlatforms", entries such as {"id": ...}).
+    Anything else is None, so callers do not filter directions on it.
+    """
+    if not isinstance(body, dict):
+        return None
+    platforms = {}
+    for role in ["source", "target"]:
+        key = role if role in body else next((k for k in body if str(k).lower().startswith(role)), None)
+        values = body.get(key)
+        if not isinstance(values, list) or not values:
+            return None
+        names = []
+        for value in values:
+            if isinstance(value, dict):
+                value = next((value[k] for k in ("id", "name", "value") if isinstance(value.get(k), str)), None)
+            if not isinstance(value, str):
+                return None
+            names.append(value)
+        platforms[role] = names
+    return platforms
+
+
+def _load_discovery():
+    try:
+        with open(DISCOVERY_FILE, "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("api_base") != API_BASE or not cached.get("convert"):
+        return None
+    if time.time() - cached.get("discovered_at", 0) > DISCOVERY_TTL:
+        return None
+    if cached.get("platforms") is not None and _platform_lists(cached["platforms"]) != cached["platforms"]:
+        return None
+    return cached
+
+
+def discover_api(force=False):
+    """Convert endpoint, form fields and supported platforms (once per session)
+
+    Tries, in order: the disk cache, the OpenAPI spec, /convert/platforms
+    (the v1 API), then a body-less GET of each legacy candidate. Only a
+    successful discovery is cached on disk.
+    """
+    with _discovery_lock:
+        return _discover(force)
+
+
+def _discover(force):
+    global _discovery
+    if _discovery is not None and not force:
+        return _discovery
+    cached = None if force else _load_discovery()
+    if cached:
+        _discovery = cached
+        return cached
+
+    info = {
+        "api_base": API_BASE,
+        "discovered_at": time.time(),
+        "health": None,
+        "convert": None,
+        "fields": {"source": "source", "target": "target"},
+        "platforms": None,
+        "method": None,
+    }
+
+    def get(path):
+        try:
+            return RETRY.call(lambda: requests.get(f"{API_BASE}{path}", timeout=30))
+        except requests.exceptions.RequestException:
+            return None
+
+    resp = get("/health")
+    if resp is not None:
+        info["health"] = resp.status_code
+
+    for path in OPENAPI_PATHS:
+        resp = get(path)
+        if resp is None or resp.status_code != 200:
+            continue
+        try:
+            found = _openapi_convert(resp.json())
+        except ValueError:
+            continue
+        if found:
+            info["convert"], info["fields"], info["platforms"] = found
+            info["method"] = f"openapi:{path}"
+            break
+
+    if not info["convert"]:
+        resp = get("/convert/platforms")
+        if resp is not None and resp.status_code == 200:
+            info["convert"] = V1_CONVERT
+            info["fields"] = {"source": "sourcePlatform", "target": "targetPlatform"}
+            try:
+                info["platforms"] = _platform_lists(resp.json())
+            except ValueError:
+                pass
+            info["method"] = "platforms"
+            if info["platforms"] is None:
+                # Usable for this session, but not worth pinning for DISCOVERY_TTL
+                log("API discovery: unexpected /convert/platforms body; not filtering directions")
+
+    if not info["convert"]:
+        for path in LEGACY_CONVERT_ENDPOINTS:
+            resp = get(path)
+            if resp is not None and resp.status_code != 404:
+                info["convert"] = path
+                info["method"] = "probe"
+                break
+
+    if info["convert"] and not (info["method"] == "platforms" and info["platforms"] is None):
+        os.makedirs(os.path.dirname(DISCOVERY_FILE), exist_ok=True)
+        write_atomic(DISCOVERY_FILE, json.dumps(info, indent=2))
+        log(f"API discovery ({info['method']}): convert at {info['convert']}")
+    _discovery = info
+    return info
+
+
+def invalidate_discovery():
+    """Forget the discovered endpoint (e.g. after it starts returning 404)"""
+    global _discovery
+    _discovery = None
+    if os.path.exists(DISCOVERY_FILE):
+        os.remove(DISCOVERY_FILE)
+
+
 def convert_artifact(source_file, source_platform, target_platform, test_id):
     """
     Convert an artifact using FLOWBOTS API.
 
-    This is a placeholder for the actual conversion API call.
-    The actual implementation will depend on the FLOWBOTS API structure.
+    The endpoint comes from discover_api(), so each artifact is uploaded
+    exactly once. Directions the API does not list are skipped without an
+    upload.
     """
     result = {
         "test_id": test_id,
@@ -94,56 +256,56 @@ def convert_artifact(source_file, source_platform, target_platform, test_id):
     }
 
     try:
-        # Read source file
-        with open(source_file, "rb") as f:
-            file_content = f.read()
-
-        # Try to find the correct API endpoint
-        # Common patterns for conversion APIs:
-        endpoints_to_try = [
-            f"{API_BASE}/convert",
-            f"{API_BASE}/api/convert",
-            f"{API_BASE}/api/v1/convert",
-            f"{API_BASE}/workflow/convert",
-        ]
-
-        for endpoint in endpoints_to_try:
-            try:
-                # Attempt multipart form upload
-                files = {
-                    "file": (os.path.basename(source_file), file_content),
-                }
-                data = {
-                    "source": source_platform,
-                    "target": target_platform,
-                }
-
-                resp = requests.post(endpoint, files=files, data=data, timeout=60)
-
-                if resp.status_code == 200:
-                    result["status"] = "success"
-                    result["endpoint"] = endpoint
-                    result["response"] = resp.text[:500]
-                    break
-                elif resp.status_code == 404:
-                    continue
-                else:
-                    result["status"] = "error"
-                    result["error"] = f"HTTP {resp.status_code}: {resp.text[:200]}"
-                    break
-
-            except requests.exceptions.Timeout:
-                result["status"] = "timeout"
-                result["error"] = "Request timed out"
-            except Exception as e:
-                result["status"] = "error"
-                result["error"] = str(e)
-
-        # If no endpoint worked, mark as needs_investigation
-        if result["status"] == "pending":
+        api = discover_api()
+        if not api["convert"]:
             result["status"] = "needs_api_discovery"
-            result["note"] = "Need to discover correct API endpoint structure"
-
+            result["note"] = "No convert endpoint found via OpenAPI, /convert/platforms or probing"
+            return result
+
+        # The v1 API takes its own platform names; legacy endpoints take directory names
+        if api["fields"]["source"] == "sourcePlatform":
+            source_name = DIR_TO_API.get(source_platform, source_platform)
+            target_name = DIR_TO_API.get(target_platform, target_platform)
+        else:
+            source_name, target_name = source_platform, target_platform
+
+        platforms = api.get("platforms") or {}
+        if (platforms.get("source") and source_name not in platforms["source"]) or \
+                (platforms.get("target") and target_name not in platforms["target"]):
+            result["status"] = "unsupported"
+            result["note"] = f"API does not list {source_name} -> {target_name}"
+            return result
+
+        endpoint = f"{API_BASE}{api['convert']}"
+        data = {
+            api["fields"]["source"]: source_name,
+            api["fields"]["target"]: target_name,
+        }
+
+        def upload():
+            # Streamed from disk; reopened if the retry policy sends it again
+            LIMITER.acquire("upload")
+            with open(source_file, "rb") as f:
+                files = {"file": (os.path.basename(source_file), f)}
+                resp = requests.post(endpoint, files=files, data=data, timeout=60)
+            LIMITER.observe("upload", resp.status_code, resp.headers)
+            return resp
+
+        resp = RETRY.call(upload)
+        result["endpoint"] = endpoint
+
+        if resp.status_code in (200, 202):
+            result["status"] = "success"
+            result["response"] = resp.text[:500]
+        else:
+            result["status"] = "error"
+            result["error"] = f"HTTP {resp.status_code}: {resp.text[:200]}"
+            if resp.status_code == 404:
+                invalidate_discovery()
+
+    except requests.exceptions.Timeout:
+        result["status"] = "timeout"
+        result["error"] = "Request timed out"
     except Exception as e:
         result["status"] = "error"
         result["error"] = str(e)
@@ -158,38 +320,54 @@ def run_simple_tier():
 
     ensure_dirs()
 
+    index = get_index(ARTIFACTS_SOURCE)
+    store = ResultsStore(runner="run_conversions")
+
+    def handler(job):
+        result = convert_artifact(job.source_file, job.source_platform, job.target_platform, job.test_id)
+        result["tier"] = "simple"
+        log(f"      {job.test_id} {job.source_platform} -> {job.target_platform}: {result['status']}")
+        return result
+
+    # Batch priority; one journal of state transitions per run
+    scheduler = JobScheduler(
+        handler,
+        journal_path=os.path.join(RUNS_DIR, f"{store.run_id}.journal"),
+        on_sla_risk=alert_sla_risk,
+    )
+
     # For each conversion direction
     for source, target in CONVERSION_MATRIX:
         # Skip if source artifacts don't exist
-        source_dir = os.path.join(ARTIFACTS_SOURCE, source, "simple")
-        if not os.path.exists(source_dir):
+        artifacts = index.list(source, "simple", PLATFORMS[source]["ext"])
+        if not artifacts:
             log(f"  Skipping {source} -> {target}: no source artifacts")
             continue
 
-        log(f"\n  Testing {source.upper()} -> {target.upper()}")
-
-        # Find and list available artifacts
-        artifacts = [f for f in os.listdir(source_dir) if os.path.isfile(os.path.join(source_dir, f))]
-        log(f"    Found {len(artifacts)} artifacts")
-
-        # Test each artifact
-        for artifact_file in artifacts[:5]:  # Limit to first 5 for initial run
-            artifact_path = os.path.join(source_dir, artifact_file)
-            test_id = artifact_file.split(".")[0]
-
-            log(f"    Testing: {test_id}")
-
-            result = convert_artifact(artifact_path, source, target, test_id)
-            results.append(result)
-
-            log(f"      Status: {result['status']}")
-
-    # Save results
-    results_file = os.path.join(LOGS_DIR, f"simple_tier_results_{int(time.time())}.json")
-    with open(results_file, "w") as f:
-        json.dump(results, f, indent=2)
-
-    log(f"\nResults saved to: {results_file}")
+        log(f"  Queueing {source.upper()} -> {target.upper()} ({len(artifacts)} artifacts)")
+
+        # Queue each artifact
+        for artifact_path in artifacts[:5]:  # Limit to first 5 for initial run
+            test_id = os.path.basename(artifact_path).split(".")[0]
+            scheduler.submit(Job(
+                job_id=f"{source}-{target}-{test_id}",
+                source_file=artifact_path,
+                source_platform=source,
+                target_platform=target,
+                test_id=test_id,
+                tier="simple",
+                priority="batch",
+            ))
+
+    # Heal retries re-run a job; only its final outcome is recorded
+    for job in scheduler.run().values():
+        if job.result is not None:
+            results.append(job.result)
+            store.add(job.result)
+    log(f"Scheduler: {scheduler.stats}")
+
+    store.close()
+    log(f"\nResults saved to: {store.db_path} (run {store.run_id})")
 
     # Summary
     statuses = {}
@@ -212,13 +390,12 @@ def main():
 
     # Check available artifacts
     log("\nChecking available artifacts:")
+    index = get_index(ARTIFACTS_SOURCE)
     for platform in PLATFORMS:
         for tier in ["simple", "moderate", "complex", "supercomplex", "enterprise"]:
-            tier_dir = os.path.join(ARTIFACTS_SOURCE, platform, tier)
-            if os.path.exists(tier_dir):
-                count = len([f for f in os.listdir(tier_dir) if os.path.isfile(os.path.join(tier_dir, f))])
-                if count > 0:
-                    log(f"  {platform}/{tier}: {count} artifacts")
+            count = index.count(platform, tier)
+            if count > 0:
+                log(f"  {platform}/{tier}: {count} artifacts")
 
     # Run Simple tier
     log("\n" + "=" * 60)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Synthetic large workflows for measuring how conversion time scales with size
+
+Builds UiPath XAML (.nupkg), PAD Robin scripts (.zip) and Blue Prism process
+XML (.bprelease) with a given number of activities, nesting depth, variable
+count and sub-workflow count. Activities are the Simple-tier building blocks
+(S01-S20 in order, repeated), rendered with the generate_artifacts emitters and
+generate_bp_xml.
+
+    activities    building-block steps in the workflow
+    depth         each block of BLOCK_SIZE steps sits this many containers deep
+                  (Sequence / IF); Blue Prism stages are flat, so depth is
+                  ignored there
+    variables     variables declared on the main workflow
+    subflows      blocks spread round-robin over this many invoked sub-workflows
+
+The ladder command writes one artifact per size to
+artifacts_source/<platform>/synthetic/ and, with --run, converts each one and
+records upload/processing/total time against size in
+results/synthetic_scaling_<timestamp>.json. The growth exponent between rungs
+(log t2/t1 / log n2/n1) shows where the engine stops scaling linearly.
+
+Usage:
+    python synthetic_workflows.py ladder [--platforms uipath,pad,blueprism] [--sizes 10,100,1000]
+                                         [--depth 3] [--variables 10] [--subflows 0] [--run]
+"""
+
+import os
+import json
+import math
+import argparse
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+
+from artifact_io import write_atomic
+from create_uipath_simple import SIMPLE_TESTS, build_uipath_nupkg
+from create_pad_simple import build_pad_package
+from create_blueprism_simple import generate_bp_xml
+from generate_artifacts import UiPathEmitter, PadEmitter, BluePrismEmitter, chunks
+
+try:
+    from flowbots_converter import FlowBotsClient, DIR_TO_API, run_conversion_test
+    from results_store import ResultsStore
+except ImportError:
+    FlowBotsClient = None
+
+# Configuration
+LAB_DIR = r"C:\flowbots_lab"
+ARTIFACTS_SOURCE = os.path.join(LAB_DIR, "artifacts_source")
+RESULTS_DIR = os.path.join(LAB_DIR, "results")
+TIER = "synthetic"
+
+LADDER = [10, 30, 100, 300, 1000, 3000, 10000]
+BLOCK_SIZE = 10
+DEFAULT_DEPTH = 3
+DEFAULT_VARIABLES = 10
+DEFAULT_SUBFLOWS = 0
+
+# Growth exponent above which a rung is reported as nonlinear
+NONLINEAR_EXPONENT = 1.2
+
+# Artifact file extension per platform
+EXTENSIONS = {"uipath": ".nupkg", "pad": ".zip", "blueprism": ".bprelease"}
+
+_uipath = UiPathEmitter()
+_pad = PadEmitter()
+_blueprism = BluePrismEmitter()
+
+
+def synthetic_spec(
+    activities: int,
+    depth: int = DEFAULT_DEPTH,
+    variables: int = DEFAULT_VARIABLES,
+    subflows: int = DEFAULT_SUBFLOWS,
+) -> Dict[str, Any]:
+    """Spec for one synthetic workflow"""
+    blocks = sorted(SIMPLE_TESTS)
+    return {
+        "test_id": f"N{activities:05d}",
+        "tier": TIER,
+        "name": f"Synthetic_N{activities:05d}_D{depth}_V{variables}_W{subflows}",
+        "description": f"{activities} activities, depth {depth}, {variables} variables, {subflows} sub-workflows",
+        "activities": activities,
+        "depth": max(1, depth),
+        "variables": variables,
+        "subflows": subflows,
+        "steps": [blocks[i % len(blocks)] for i in range(activities)],
+    }
+
+
+def distribute(spec: Dict[str, Any]) -> Tuple[List[Tuple[int, List[str]]], List[List[Tuple[int, List[str]]]]]:
+    """Split steps into numbered blocks: (main blocks, blocks per sub-workflow)"""
+    blocks = [
+        (i * BLOCK_SIZE + 1, block)
+        for i, block in enumerate(chunks(spec["steps"], BLOCK_SIZE))
+    ]
+    if not spec["subflows"]:
+        return blocks, []
+    subflows = [blocks[n::spec["subflows"]] for n in range(spec["subflows"])]
+    return [], [sub for sub in subflows if sub]
+
+
+def uipath_blocks(blocks: List[Tuple[int, List[str]]], depth: int) -> str:
+    parts = []
+    for start, steps in blocks:
+        xaml = _uipath.steps_xaml(steps, start)
+        for level in range(depth - 1, 0, -1):
+            xaml = f'<Sequence DisplayName="Block {start:05d} L{level}">\n{xaml}\n</Sequence>'
+        parts.append(xaml)
+    return "\n".join(parts)
+
+
+def build_uipath(spec: Dict[str, Any]) -> bytes:
+    main_blocks, subflows = distribute(spec)
+    variables = ""
+    if spec["variables"]:
+        declared = "\n".join(
+            f'      <Variable x:TypeArguments="x:String" Name="var_{i:04d}" Default="value {i}" />'
+            for i in range(1, spec["variables"] + 1)
+        )
+        variables = f"    <Sequence.Variables>\n{declared}\n    </Sequence.Variables>\n"
+
+    extra_files, invokes = [], []
+    for n, blocks in enumerate(subflows, 1):
+        filename = f"Sub_{n:03d}.xaml"
+        extra_files.append((filename, _uipath.XAML_HEADER.format(
+            cls=f"Sub_{n:03d}", display=f"Sub {n:03d}", body=uipath_blocks(blocks, spec["depth"]),
+        )))
+        invokes.append(f'<ui:InvokeWorkflowFile WorkflowFileName="{filename}" />')
+
+    body = variables + uipath_blocks(main_blocks, spec["depth"]) + "\n".join(invokes)
+    xaml = _uipath.XAML_HEADER.format(cls=spec["name"], display=spec["name"].replace("_", " "), body=body)
+    return build_uipath_nupkg(spec["name"], spec["description"], xaml, extra_files)
+
+
+def pad_blocks(blocks: List[Tuple[int, List[str]]], depth: int) -> str:
+    parts = []
+    for start, steps in blocks:
+        script = _pad.steps_script(steps, start)
+        for _ in range(depth - 1):
+            script = f"IF 1 = 1 THEN\n{script}\nEND"
+        parts.append(script)
+    return "\n".join(parts)
+
+
+def build_pad(spec: Dict[str, Any]) -> bytes:
+    main_blocks, subflows = distribute(spec)
+    lines = [f"SET var_{i:04d} TO $'''value {i}'''" for i in range(1, spec["variables"] + 1)]
+    lines.extend(f"CALL Sub_{n:03d}" for n in range(1, len(subflows) + 1))
+    if main_blocks:
+        lines.append(pad_blocks(main_blocks, spec["depth"]))
+    for n, blocks in enumerate(subflows, 1):
+        lines.append(f"\nFUNCTION Sub_{n:03d} GLOBAL\n{pad_blocks(blocks, spec['depth'])}\nEND FUNCTION")
+    return build_pad_package(spec["test_id"], spec["name"], spec["description"], "\n".join(lines))
+
+
+def build_blueprism(spec: Dict[str, Any]) -> bytes:
+    main_blocks, subflows = distribute(spec)
+    actions = [
+        {"name": f"var_{i:04d}", "type": "Data",
+         "content": f"<datatype>text</datatype><initialvalue>value {i}</initialvalue>"}
+        for i in range(1, spec["variables"] + 1)
+    ]
+    # Main Page: the main blocks, then one linked SubSheet call per sub-workflow page
+    ids = _blueprism.stage_ids(spec["name"])
+    groups = [
+        (f"Sub {n:03d}", [stage for start, steps in blocks for stage in _blueprism.stages(steps, start)])
+        for n, blocks in enumerate(subflows, 1)
+    ]
+    paged, pages = _blueprism.subpages(groups, ids)
+    main = [stage for start, steps in main_blocks for stage in _blueprism.stages(steps, start)]
+    actions.extend(_blueprism.link(main, ids, then=paged[0]["stageid"] if paged else "@end"))
+    actions.extend(paged)
+    xml_content = generate_bp_xml(
+        spec["test_id"], spec["name"], spec["description"], actions,
+        project_name=spec["name"], seed=spec["name"], pages=pages,
+    )
+    return xml_content.encode("utf-8")
+
+
+BUILDERS = {
+    "uipath": build_uipath,
+    "pad": build_pad,
+    "blueprism": build_blueprism,
+}
+
+
+def generate_ladder(
+    platforms: List[str],
+    sizes: List[int],
+    output_root: str = ARTIFACTS_SOURCE,
+    **shape,
+) -> List[Tuple[str, Dict[str, Any], str]]:
+    """Write one synthetic artifact per (platform, size); returns (platform, spec, path)"""
+    written = []
+    for platform in platforms:
+        output_dir = os.path.join(output_root, platform, TIER)
+        os.makedirs(output_dir, exist_ok=True)
+        for size in sizes:
+            spec = synthetic_spec(size, **shape)
+            path = os.path.join(output_dir, spec["name"] + EXTENSIONS[platform])
+            write_atomic(path, BUILDERS[platform](spec))
+            written.append((platform, spec, path))
+            print(f"  {platform:<10} {size:>6} activities  {os.path.getsize(path):>10,} bytes  {os.path.basename(path)}")
+    return written
+
+
+def growth_exponents(rows: List[Dict[str, Any]]) -> None:
+    """Annotate each successful row with the growth exponent from the previous rung"""
+    previous = {}
+    for row in rows:
+        if row["status"] != "success" or not row.get("total_ms"):
+            continue
+        prev = previous.get(row["platform"])
+        if prev:
+            row["exponent"] = round(
+                math.log(row["total_ms"] / prev["total_ms"]) / math.log(row["activities"] / prev["activities"]), 2
+            )
+            row["nonlinear"] = row["exponent"] > NONLINEAR_EXPONENT
+        previous[row["platform"]] = row
+
+
+def run_ladder(artifacts: List[Tuple[str, Dict[str, Any], str]], target: str) -> List[Dict[str, Any]]:
+    """Convert each synthetic artifact and record time against size"""
+    client = FlowBotsClient()
+    rows = []
+    with ResultsStore(runner="synthetic_workflows") as store:
+        for platform, spec, path in artifacts:
+            print(f"\n[{platform} {spec['test_id']}] {spec['description']}")
+            result = run_conversion_test(
+                client, path, DIR_TO_API[platform], target, spec["test_id"], tier=TIER,
+            )
+            result["activities"] = spec["activities"]
+            store.add(result)
+
+            timings = result.get("timings", {})
+            phases = [timings[p]["ms"] for p in ["upload", "queue_wait", "processing", "download"] if p in timings]
+            rows.append({
+                "platform": platform,
+                "activities": spec["activities"],
+                "depth": spec["depth"],
+                "variables": spec["variables"],
+                "subflows": spec["subflows"],
+                "bytes": os.path.getsize(path),
+                "status": result["status"],
+                "upload_ms": timings.get("upload", {}).get("ms"),
+                "processing_ms": timings.get("processing", {}).get("ms"),
+                "total_ms": sum(phases) if phases else None,
+                "error": result.get("error"),
+            })
+            print(f"    {result['status']}  total={rows[-1]['total_ms']}ms")
+
+    growth_exponents(rows)
+    return rows
+
+
+def print_scaling(rows: List[Dict[str, Any]]):
+    print(f"\n{'platform':<10} {'activities':>10} {'bytes':>12} {'total ms':>10} {'ms/activity':>12} {'exponent':>9}")
+    for row in rows:
+        total = row["total_ms"]
+        per_activity = f"{total / row['activities']:.2f}" if total else "-"
+        exponent = row.get("exponent", "-")
+        flag = "  <- nonlinear" if row.get("nonlinear") else ""
+        print(
+            f"{row['platform']:<10} {row['activities']:>10} {row['bytes']:>12,} "
+            f"{total if total is not None else '-':>10} {per_activity:>12} {exponent:>9}{flag}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic large-workflow generator")
+    parser.add_argument("command", choices=["ladder"])
+    parser.add_argument("--platforms", default=",".join(BUILDERS))
+    parser.add_argument("--sizes", default=",".join(map(str, LADDER)))
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--variables", type=int, default=DEFAULT_VARIABLES)
+    parser.add_argument("--subflows", type=int, default=DEFAULT_SUBFLOWS)
+    parser.add_argument("--output", default=ARTIFACTS_SOURCE)
+    parser.add_argument("--run", action="store_true", help="convert each rung and record time vs size")
+    parser.add_argument("--target", default="flowbots")
+    args = parser.parse_args()
+
+    platforms = [p for p in args.platforms.split(",") if p]
+    sizes = sorted(int(s) for s in args.sizes.split(",") if s)
+
+    print(f"Generating synthetic ladder {sizes} in {args.output}")
+    print("=" * 60)
+    artifacts = generate_ladder(
+        platforms, sizes, args.output,
+        depth=args.depth, variables=args.variables, subflows=args.subflows,
+    )
+
+    if not args.run:
+        return
+    if FlowBotsClient is None:
+        print("requests not installed; cannot run conversions")
+        return
+
+    rows = run_ladder(artifacts, args.target)
+    print_scaling(rows)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"synthetic_scaling_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump({"target": args.target, "rows": rows}, f, indent=2)
+    print(f"\nScaling results: {path}")
+
+
+if __name__ == "__main__":
+    main()
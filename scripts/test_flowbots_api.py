@@ -7,7 +7,8 @@ import os
 from datetime import datetime
 
 # FLOWBOTS endpoints
-API_BASE = "https://api.flowbotsai.com"
+# Override with FLOWBOTS_API_BASE (e.g. http://127.0.0.1:8765 for mock_flowbots_server.py)
+API_BASE = os.environ.get("FLOWBOTS_API_BASE", "https://api.flowbotsai.com").rstrip("/")
 APP_URL = "https://app.flowbotsai.com"
 OUTPUT_DIR = r"C:\flowbots_lab\api_tests"
 
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Checks for retry.py that need no network
+
+Usage:
+    python -m pytest test_retry.py
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from retry import RetryPolicy, CircuitBreaker, CircuitOpenError
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class AsyncResponse:
+    """aiohttp-style response: status, not status_code"""
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+
+def tripped_breaker(cooldown: float = 0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker(min_calls=2, cooldown=cooldown)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_probe_raising_non_transient_error_releases_breaker():
+    breaker = tripped_breaker()
+    policy = RetryPolicy(breaker=breaker, sleep=lambda _: None)
+
+    def probe():
+        raise ValueError("bad upload path")
+
+    with pytest.raises(ValueError):
+        policy.call(probe)
+
+    # The next caller must get to probe rather than wait forever
+    done = threading.Event()
+
+    def next_call():
+        breaker.before_call(max_wait=2)
+        done.set()
+
+    thread = threading.Thread(target=next_call, daemon=True)
+    thread.start()
+    thread.join(3)
+    assert done.is_set()
+    breaker.record(True)
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens():
+    breaker = tripped_breaker(cooldown=0.2)
+    breaker.before_call(max_wait=1)
+    assert breaker.state == "half_open"
+    breaker.record(False)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call(max_wait=0.01)
+
+
+def test_retries_transient_status_then_returns_final_response():
+    responses = iter([Response(503), Response(503), Response(200)])
+    policy = RetryPolicy(sleep=lambda _: None)
+    assert policy.call(lambda: next(responses)).status_code == 200
+    assert policy.stats["retries"] == 2
+
+
+def test_permanent_status_is_not_retried():
+    calls = []
+    policy = RetryPolicy(sleep=lambda _: None)
+    resp = policy.call(lambda: calls.append(1) or Response(404))
+    assert resp.status_code == 404 and len(calls) == 1
+
+
+def test_call_async_retries_aiohttp_style_responses():
+    responses = iter([AsyncResponse(503), AsyncResponse(200)])
+    policy = RetryPolicy(base_delay=0.0)
+
+    async def attempt():
+        return next(responses)
+
+    assert asyncio.run(policy.call_async(attempt)).status == 200
+    assert policy.stats["retries"] == 1
+
+
+def test_call_async_waits_for_breaker_and_releases_cancelled_probe():
+    breaker = tripped_breaker()
+    policy = RetryPolicy(breaker=breaker, base_delay=0.0)
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    async def ok():
+        return AsyncResponse(200)
+
+    async def scenario():
+        with pytest.raises(asyncio.CancelledError):
+            await policy.call_async(cancelled)
+        return await asyncio.wait_for(policy.call_async(ok), 2)
+
+    assert asyncio.run(scenario()).status == 200
+    assert breaker.state == "closed"
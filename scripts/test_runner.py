@@ -2,20 +2,33 @@
 """FLOWBOTS E2E Test Runner - Uses Claude CLI (Max subscription)"""
 
 import subprocess
-import json
 import os
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from pathlib import Path
 import sys
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from artifact_index import get_index
+from checkpoint import CheckpointJournal
+from results_store import ResultsStore, RESULTS_DB
+from resource_sampler import ResourceSampler
+
 # Import alert helper
 try:
-    from twilio_alert import send_alert, send_test_result, send_failure_alert
+    from twilio_alert import send_alert, send_test_result, send_failure_alert, send_recovery_alert, send_resource_alert
 except ImportError:
     def send_alert(msg, priority="INFO"): print(f"[{priority}] {msg}")
     def send_test_result(tier, passed, total): pass
     def send_failure_alert(test_id, error): pass
+    def send_recovery_alert(): pass
+    def send_resource_alert(cpu, mem, disk): pass
 
 # Test matrix - all conversion directions
 PLATFORMS = ["uipath", "pad", "pacloud", "aa", "blueprism", "flowbots"]
@@ -40,15 +53,124 @@ TESTS_PER_TIER = {
     "enterprise": ["E{:02d}".format(i) for i in range(1, 21)],
 }
 
+# Worker pool sizing: each Claude CLI test is a separate node process that
+# mostly waits on the network, but RPA validation shares the same 1-core/4 GB box
+MAX_WORKERS = 4
+CLI_MEMORY_MB = 400         # Approximate resident size of one claude CLI process
+MEMORY_RESERVE_MB = 1024    # Kept free for RPA platforms and the OS
+CPU_HIGH_PERCENT = 85       # Hold back new tests above this CPU load
+
+
+def available_memory_mb():
+    """Available physical memory in MB, or None if it can't be measured"""
+    if psutil is not None:
+        return psutil.virtual_memory().available / (1024 * 1024)
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def concurrency_cap(max_workers: int = MAX_WORKERS, sampler: ResourceSampler = None) -> int:
+    """How many CLI tests may run right now, given CPU and memory headroom
+
+    With a sampler, its smoothed throttle signal replaces the instantaneous
+    CPU check, so the cap steps down and back up instead of flapping.
+    """
+    cap = min(max_workers, 2 * (os.cpu_count() or 1))
+
+    mem = available_memory_mb()
+    if mem is not None:
+        cap = min(cap, int((mem - MEMORY_RESERVE_MB) // CLI_MEMORY_MB))
+
+    if sampler is not None:
+        cap = min(cap, sampler.recommended_workers(max_workers))
+    elif psutil is not None and psutil.cpu_percent(interval=None) > CPU_HIGH_PERCENT:
+        cap = min(cap, 1)
+
+    return max(1, cap)
+
+
 class TestRunner:
-    def __init__(self, results_dir: str = "C:\\flowbots_lab\\runs"):
+    def __init__(
+        self,
+        results_dir: str = "C:\\flowbots_lab\\runs",
+        workers: int = 1,
+        resume: bool = False,
+        results_db: str = RESULTS_DB,
+    ):
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(parents=True, exist_ok=True)
         self.results = []
         self.consecutive_failures = 0
+        self.workers = workers
+        self._lock = threading.Lock()
+
+        # Completed tests are journaled so a crashed run can pick up where it stopped
+        self.journal = CheckpointJournal(str(self.results_dir / "checkpoint.journal"))
+        self.resume = resume
+        if resume:
+            self.journal.load()
+        else:
+            self.journal.reset()
+
+        # Results go to the shared store; tests are checkpointed only once
+        # their result is committed, so a crash never skips an unsaved result
+        self.store = ResultsStore(results_db, runner="test_runner", on_commit=self._checkpoint)
+
+        # Samples CPU/memory/disk during runs; drives the parallel cap and
+        # raises resource alerts only when a threshold is crossed
+        self.sampler = ResourceSampler(on_alert=send_resource_alert)
+
+    @staticmethod
+    def tier_queue(tier: str) -> list:
+        """(test_id, source, target) for every test in a tier, in run order"""
+        return [
+            (f"FB-{tier.upper()}-{source.upper()}-to-{target.upper()}-{test_num}", source, target)
+            for source, target in CONVERSIONS
+            for test_num in TESTS_PER_TIER[tier]
+        ]
+
+    def report_resume_point(self, tiers: list = TIERS):
+        """Print where a resumed run picks up"""
+        if not self.resume:
+            return
+        next_test = next(
+            (test_id for tier in tiers for test_id, _, _ in self.tier_queue(tier) if test_id not in self.journal),
+            None,
+        )
+        print(f"Resuming from checkpoint: {len(self.journal)} tests already complete")
+        print(f"  Last completed: {self.journal.last_test_id or '-'}")
+        print(f"  Next test:      {next_test or '- (nothing left)'}")
+        if len(self.journal):
+            send_recovery_alert()
+
+    def complete(self, result: dict, tier: str, source: str, target: str):
+        """Persist a finished test's result (checkpointed once committed)"""
+        self.save_result(result, tier, source, target)
+
+    def _checkpoint(self, committed: list):
+        for result in committed:
+            self.journal.record(result.get("test_id", "unknown"), result["status"])
+
+    def _track_outcome(self, test_id: str, passed: bool, error: str = ""):
+        """Update consecutive_failures (in completion order) and alert on a streak"""
+        with self._lock:
+            if passed:
+                self.consecutive_failures = 0
+                return
+            self.consecutive_failures += 1
+            alert = self.consecutive_failures >= 3
+        if alert:
+            send_failure_alert(test_id, error[:100])
 
     def run_single_test(self, test_id: str, source: str, target: str, tier: str) -> dict:
         """Run single test via Claude CLI (uses Max subscription, $0)"""
+        artifact = get_index().find(source, tier, test_id.rsplit("-", 1)[-1])
+        if artifact:
+            find_step = f"Use source artifact {artifact}"
+        else:
+            find_step = f"Find source artifact at C:\\flowbots_lab\\artifacts_source\\{source}\\{tier}\\"
         prompt = f"""Execute FLOWBOTS conversion test:
 - Test ID: {test_id}
 - Source Platform: {source}
@@ -56,7 +178,7 @@ class TestRunner:
 - Tier: {tier}
 
 Steps:
-1. Find source artifact at C:\\flowbots_lab\\artifacts_source\\{source}\\{tier}\\
+1. {find_step}
 2. Upload to flowbotsai.com and convert to {target}
 3. Download converted artifact to C:\\flowbots_lab\\artifacts_converted\\{target}\\{tier}\\
 4. Validate the converted artifact runs in target platform
@@ -75,12 +197,10 @@ Steps:
             )
 
             if result.returncode == 0:
-                self.consecutive_failures = 0
+                self._track_outcome(test_id, True)
                 return {"test_id": test_id, "status": "PASS", "output": result.stdout}
             else:
-                self.consecutive_failures += 1
-                if self.consecutive_failures >= 3:
-                    send_failure_alert(test_id, result.stderr[:100])
+                self._track_outcome(test_id, False, result.stderr)
                 return {"test_id": test_id, "status": "FAIL", "error": result.stderr}
 
         except subprocess.TimeoutExpired:
@@ -89,29 +209,33 @@ Steps:
             return {"test_id": test_id, "status": "ERROR", "error": str(e)}
 
     def run_tier(self, tier: str) -> dict:
-        """Run all tests for a tier"""
-        tests = TESTS_PER_TIER[tier]
-        results = []
-        passed = 0
+        """Run all tests for a tier (skipping any already in the checkpoint journal)"""
+        self.sampler.start()
+        queue = self.tier_queue(tier)
+        done_before = [self.journal.completed[test_id] for test_id, _, _ in queue if test_id in self.journal]
+        queue = [test for test in queue if test[0] not in self.journal]
+        if done_before:
+            print(f"Skipping {len(done_before)} {tier} tests completed in a previous run")
 
-        for source, target in CONVERSIONS:
-            for test_num in tests:
-                test_id = f"FB-{tier.upper()}-{source.upper()}-to-{target.upper()}-{test_num}"
+        if self.workers > 1:
+            results = self._run_parallel(tier, queue)
+        else:
+            results = []
+            for test_id, source, target in queue:
                 print(f"Running: {test_id}")
 
                 result = self.run_single_test(test_id, source, target, tier)
                 results.append(result)
 
-                if result["status"] == "PASS":
-                    passed += 1
-
                 # Save result immediately
-                self.save_result(result)
+                self.complete(result, tier, source, target)
 
                 # Brief pause between tests
                 time.sleep(1)
 
-        total = len(results)
+        self.store.flush()
+        total = len(results) + len(done_before)
+        passed = sum(1 for r in results if r["status"] == "PASS") + done_before.count("PASS")
         send_test_result(tier, passed, total)
 
         return {
@@ -119,19 +243,51 @@ Steps:
             "total": total,
             "passed": passed,
             "failed": total - passed,
-            "pass_rate": round(passed / total * 100, 1) if total > 0 else 0
+            "pass_rate": round(passed / total * 100, 1) if total > 0 else 0,
+            "resources": self.sampler.summary(),
         }
 
-    def save_result(self, result: dict):
-        """Save test result to file"""
-        test_id = result.get("test_id", "unknown")
-        filepath = self.results_dir / f"{test_id}.json"
-        with open(filepath, "w") as f:
-            json.dump(result, f, indent=2)
+    def _run_parallel(self, tier: str, queue: list) -> list:
+        """Run tests on up to self.workers threads, each driving one CLI process
+
+        Before each submission the cap is re-read from concurrency_cap(), so the
+        pool shrinks when CPU or memory headroom runs out and grows back after.
+        """
+        results = []
+        in_flight = {}
+
+        def collect(done):
+            for future in done:
+                result = future.result()
+                _, source, target = in_flight.pop(future)
+                results.append(result)
+                self.complete(result, tier, source, target)
+                print(f"Done: {result['test_id']} - {result['status']}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for test_id, source, target in queue:
+                while in_flight and len(in_flight) >= concurrency_cap(self.workers, self.sampler):
+                    done, _ = wait(in_flight, timeout=5, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                print(f"Running: {test_id} ({len(in_flight) + 1} in flight)")
+                future = pool.submit(self.run_single_test, test_id, source, target, tier)
+                in_flight[future] = (test_id, source, target)
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        return results
+
+    def save_result(self, result: dict, tier: str = None, source: str = None, target: str = None):
+        """Append test result to the shared results store"""
+        self.store.add(result, tier=tier, source=source, target=target)
 
     def run_all(self):
         """Run all tiers"""
         send_alert("Starting FLOWBOTS E2E testing - 2,900 tests", "INFO")
+        self.report_resume_point()
 
         for tier in TIERS:
             print(f"\n{'='*60}")
@@ -141,16 +297,29 @@ Steps:
             tier_result = self.run_tier(tier)
             print(f"\n{tier.upper()} complete: {tier_result['passed']}/{tier_result['total']} ({tier_result['pass_rate']}%)")
 
+        self.sampler.stop()
         send_alert("FLOWBOTS E2E testing complete!", "INFO")
 
 
 if __name__ == "__main__":
-    runner = TestRunner()
+    args = sys.argv[1:]
+    workers = 1
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    resume = "--resume" in args
+    if resume:
+        args.remove("--resume")
+
+    runner = TestRunner(workers=workers, resume=resume)
 
-    if len(sys.argv) > 1:
-        tier = sys.argv[1].lower()
+    if args:
+        tier = args[0].lower()
         if tier in TIERS:
+            runner.report_resume_point([tier])
             runner.run_tier(tier)
+            runner.sampler.stop()
         else:
             print(f"Unknown tier: {tier}. Available: {TIERS}")
     else:
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Per-phase latency spans for conversion jobs and per-run latency histograms
+
+A Spans object travels with one conversion job through FlowBotsClient and
+collects perf_counter-based timings for each phase:
+
+    dns, connect     name resolution and TCP connect to the API host
+    upload           POST /api/v1/convert until the 202 (bytes, bytes_per_sec)
+    queue_wait       202 until the job is first seen in_progress
+    processing       in_progress (or 202 if never seen) until completed/failed
+    download         GET /files body streamed to disk (bytes, bytes_per_sec)
+
+Span dicts are stored on each result record under "timings"; build_histogram()
+folds a run's results into fixed-bucket histograms per tier, direction and
+phase.
+"""
+
+import os
+import json
+import time
+import socket
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000, 300000]
+
+PHASES = ["dns", "connect", "upload", "queue_wait", "processing", "download"]
+
+
+class Spans:
+    """Named timing spans for one job"""
+
+    def __init__(self):
+        self.spans: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time the enclosed block as `name`"""
+        start = time.perf_counter()
+        entry = dict(attrs)
+        try:
+            yield entry
+        finally:
+            self.record(name, time.perf_counter() - start, **entry)
+
+    def record(self, name: str, seconds: float, **attrs):
+        """Record a span measured elsewhere"""
+        entry = {"ms": round(seconds * 1000, 3)}
+        entry.update(attrs)
+        if "bytes" in entry and seconds > 0:
+            entry["bytes_per_sec"] = round(entry["bytes"] / seconds, 1)
+        self.spans[name] = entry
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self.spans)
+
+
+def measure_connect(base_url: str, timeout: float = 10) -> Dict[str, float]:
+    """Time DNS resolution and a TCP connect to the API host, in seconds
+
+    requests does not expose its connection setup, so this probes once on a
+    separate socket; the result is reused for every job of a client.
+    """
+    parsed = urlparse(base_url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+
+    start = time.perf_counter()
+    infos = socket.getaddrinfo(parsed.hostname, port, type=socket.SOCK_STREAM)
+    dns = time.perf_counter() - start
+
+    family, socktype, proto, _, address = infos[0]
+    start = time.perf_counter()
+    with socket.socket(family, socktype, proto) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+    connect = time.perf_counter() - start
+    return {"dns": dns, "connect": connect}
+
+
+def _bucket(ms: float) -> str:
+    for bound in BUCKETS_MS:
+        if ms <= bound:
+            return f"<={bound}"
+    return f">{BUCKETS_MS[-1]}"
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def build_histogram(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Latency histograms per "tier|source->target" and phase from result records"""
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    for result in results:
+        timings = result.get("timings")
+        if not timings:
+            continue
+        key = f"{result.get('tier', 'unknown')}|{result.get('source_platform')}->{result.get('target_platform')}"
+        direction = samples.setdefault(key, {})
+        for phase, span in timings.items():
+            if "ms" in span:
+                direction.setdefault(phase, []).append(span["ms"])
+
+    histogram = {}
+    for key, phases in samples.items():
+        histogram[key] = {}
+        for phase, values in phases.items():
+            counts = {}
+            for ms in values:
+                bucket = _bucket(ms)
+                counts[bucket] = counts.get(bucket, 0) + 1
+            histogram[key][phase] = {
+                "count": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "max_ms": max(values),
+                "buckets": counts,
+            }
+    return histogram
+
+
+def export_histogram(results: List[Dict[str, Any]], logs_dir: str) -> Optional[str]:
+    """Write the run's latency histogram to logs_dir; returns the path"""
+    histogram = build_histogram(results)
+    if not histogram:
+        return None
+    os.makedirs(logs_dir, exist_ok=True)
+    path = os.path.join(logs_dir, f"latency_{datetime.now().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump({"buckets_ms": BUCKETS_MS, "directions": histogram}, f, indent=2)
+    return path
+
+
+def print_histogram_summary(results: List[Dict[str, Any]]):
+    """One line of p50/p95 per direction and phase"""
+    for key, phases in sorted(build_histogram(results).items()):
+        print(f"  {key}")
+        for phase in PHASES:
+            if phase in phases:
+                stats = phases[phase]
+                print(f"    {phase:<11} n={stats['count']:<4} p50={stats['p50_ms']:.0f}ms p95={stats['p95_ms']:.0f}ms")
@@ -1,8 +1,23 @@
 #!/usr/bin/env python3
-"""Twilio SMS alert helper for FLOWBOTS E2E testing"""
+"""Twilio SMS alert helper for FLOWBOTS E2E testing
+
+send_alert() and the helpers below queue alerts on a shared AlertDispatcher
+and return immediately; a background thread sends them through one reused
+Twilio client, rate-limited per priority and with bursts coalesced into
+summaries. Set FLOWBOTS_ALERT_SINK=log (or console) to run offline; without
+Twilio credentials or the twilio package, alerts go to the log sink.
+"""
 
 import os
-from twilio.rest import Client
+import atexit
+import threading
+
+try:
+    from twilio.rest import Client
+except ImportError:
+    Client = None
+
+from alert_dispatcher import AlertDispatcher, ConsoleSink, LogSink
 
 # Twilio credentials from environment variables
 ACCOUNT_SID = os.environ.get("TWILIO_ACCOUNT_SID", "")
@@ -10,29 +25,62 @@ AUTH_TOKEN = os.environ.get("TWILIO_AUTH_TOKEN", "")
 FROM_NUMBER = os.environ.get("TWILIO_FROM_NUMBER", "+18666209504")
 TO_NUMBER = os.environ.get("TWILIO_TO_NUMBER", "+12055328682")
 
-def send_alert(message: str, priority: str = "INFO"):
-    """Send SMS alert via Twilio
+# Offline alert log (FLOWBOTS_ALERT_SINK=log, or no Twilio available)
+LAB_DIR = r"C:\flowbots_lab"
+ALERT_LOG = os.path.join(LAB_DIR, "logs", "alerts.log")
+
+
+class TwilioSink:
+    """SMS sink; one Twilio client is created on first use and reused"""
+
+    def __init__(self):
+        self._client = None
+
+    def send(self, message: str, priority: str) -> bool:
+        if self._client is None:
+            self._client = Client(ACCOUNT_SID, AUTH_TOKEN)
+        self._client.messages.create(
+            body=f"[{priority}] FLOWBOTS: {message}",
+            from_=FROM_NUMBER,
+            to=TO_NUMBER
+        )
+        print(f"Alert sent: [{priority}] {message}")
+        return True
+
+
+def default_sink():
+    """Sink named by FLOWBOTS_ALERT_SINK, else Twilio when usable, else the log"""
+    choice = os.environ.get("FLOWBOTS_ALERT_SINK", "").lower()
+    if choice == "console":
+        return ConsoleSink()
+    if choice != "log" and Client is not None and ACCOUNT_SID:
+        return TwilioSink()
+    return LogSink(ALERT_LOG)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> AlertDispatcher:
+    """Process-wide dispatcher, drained at exit"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = AlertDispatcher(default_sink())
+            atexit.register(_dispatcher.close)
+        return _dispatcher
+
+
+def send_alert(message: str, priority: str = "INFO", category: str = None):
+    """Queue an SMS alert (returns without waiting for delivery)
 
     Args:
         message: Alert message text
         priority: INFO, MEDIUM, HIGH, or CRITICAL
+        category: alerts sharing a category are coalesced into one summary
     """
-    try:
-        client = Client(ACCOUNT_SID, AUTH_TOKEN)
-
-        # Always send HIGH and CRITICAL alerts
-        # For lower priority, could add filtering logic
-        if priority in ["HIGH", "CRITICAL", "INFO", "MEDIUM"]:
-            client.messages.create(
-                body=f"[{priority}] FLOWBOTS: {message}",
-                from_=FROM_NUMBER,
-                to=TO_NUMBER
-            )
-            print(f"Alert sent: [{priority}] {message}")
-            return True
-    except Exception as e:
-        print(f"Failed to send alert: {e}")
-        return False
+    return get_dispatcher().submit(message, priority, category)
 
 def send_test_result(tier: str, passed: int, total: int):
     """Send test batch completion alert"""
@@ -53,13 +101,13 @@ def send_resource_alert(cpu: float, mem: float, disk: float):
 
     if alerts:
         message = "Resource critical: " + ", ".join(alerts)
-        return send_alert(message, "HIGH")
+        return send_alert(message, "HIGH", category="resource alerts")
     return False
 
 def send_failure_alert(test_id: str, error: str):
     """Send test failure alert"""
     message = f"Test {test_id} failed: {error[:100]}"
-    return send_alert(message, "MEDIUM")
+    return send_alert(message, "MEDIUM", category="failures")
 
 def send_recovery_alert():
     """Send recovery started alert"""
@@ -70,5 +118,6 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         msg = " ".join(sys.argv[1:])
         send_alert(msg, "INFO")
+        get_dispatcher().close()
     else:
         print("Usage: python twilio_alert.py <message>")
@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""Normalized workflow IR and source-vs-converted semantic diff
+
+Each platform format is parsed into one tree of Nodes:
+
+- action nodes carry a canonical op ("file.write", "assign", "wait", ...) and
+  a target (assigned variable or file path), so a UiPath Assign, a Robin SET
+  and a Blue Prism Calculation stage all read as assign(<variable>)
+- block nodes ("if", "loop", "try", "catch", "subflow") hold their children
+  in order. Plain sequences are spliced into their parent, If/Else branches
+  are kept as one list, and invoked workflows / called functions / sub-pages
+  are inlined as "subflow" blocks.
+
+The ops tables cover what the generators emit (create_*_simple.py and
+generate_artifacts.py). Unknown actions keep a lowercased name, so they still
+diff but never match another platform's name.
+
+Every conversion crosses platforms, so each platform's idioms are normalized
+to one form:
+
+- value-only Robin actions (random number, text, date/time) with an output
+  variable read as assign(<variable>), like the UiPath Assign expressions
+- an assign folds into the next one when that one reads it (A = f(); B = g(A)
+  is B = g(f())) or overwrites it unread (a declared default), so temporaries
+  and split steps do not show as differences
+- a Robin File.IfFile/Folder.IfFolder check whose block only sets variables is
+  the check alone (PAD's way to store the result)
+- writes to a file in a logs folder are log actions (PAD and Blue Prism have
+  no log action)
+- XAML that uses a namespace prefix it never declares (mc:Ignorable) is still
+  read
+
+diff_trees() compares two trees in linear time. Every subtree gets a hash and
+a size up front; identical subtrees are matched by hash without descending.
+Child lists are aligned by trimming the common prefix/suffix, anchoring on
+hashes that occur once on each side (as in patience diff), then matching
+repeated hashes in order inside each gap. Whatever is left in a gap is paired
+by position: same-op blocks are diffed recursively, other pairs are reported
+as changed, and leftovers as missing (source only) or extra (converted only).
+
+Usage:
+    python workflow_ir.py <source_artifact> <converted_artifact> [--json]
+"""
+
+import os
+import re
+import sys
+import json
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
+
+XAML_BLOCKS = {
+    "Activity": "sequence", "Sequence": "sequence", "Flowchart": "sequence",
+    "If": "if", "Switch": "if", "ForEach": "loop", "While": "loop", "DoWhile": "loop",
+    "TryCatch": "try", "Catch": "catch",
+}
+XAML_OPS = {
+    "WriteTextFile": "file.write", "AppendWriteLine": "file.append", "ReadTextFile": "file.read",
+    "DeleteFile": "file.delete", "CreateDirectory": "folder.create", "PathExists": "path.exists",
+    "Assign": "assign", "MessageBox": "dialog.message", "LogMessage": "log", "WriteLine": "log",
+    "SetToClipboard": "clipboard.set", "GetFromClipboard": "clipboard.get",
+    "GetEnvironmentVariable": "env.get", "Delay": "wait",
+}
+# XAML attributes holding the path an action works on
+XAML_PATH_ATTRS = ["FileName", "Path", "DirectoryName", "PathName"]
+# Elements that carry data rather than act
+XAML_IGNORED = {"Variable", "InArgument", "OutArgument", "InOutArgument", "Literal", "Members", "Property",
+                "TextExpression", "Reference", "AssemblyReference"}
+
+ROBIN_OPS = {
+    "File.WriteText": "file.write", "File.ReadTextFromFile": "file.read", "File.Delete": "file.delete",
+    "File.IfFile": "path.exists", "Folder.Create": "folder.create", "Folder.IfFolder": "path.exists",
+    "Display.ShowMessageDialog": "dialog.message", "Clipboard.SetText": "clipboard.set",
+    "Clipboard.GetText": "clipboard.get", "System.GetEnvironmentVariable": "env.get",
+    "Variables.GenerateRandomNumber": "random", "Text.Join": "text.join", "Text.GetLength": "text.length",
+    "Text.ChangeCase": "text.case", "DateTime.GetCurrentDateTime": "datetime.now",
+    "Text.ConvertDateTimeToText": "datetime.format",
+}
+ROBIN_ACTION = re.compile(r"^([A-Z][A-Za-z0-9]*\.[A-Za-z0-9]+)(\.[A-Za-z0-9]+)*\b")
+ROBIN_LITERAL = re.compile(r"\$'''(.*?)'''")
+ROBIN_OUTPUT = re.compile(r"=>\s*([A-Za-z_]\w*)")
+# Parts of an action line that are not values: output bindings, parameter
+# names and enum options (Text.CaseOption.UpperCase)
+ROBIN_NOT_READ = re.compile(r"\w+=>\s*\w+|\b\w+:(?=\s)|\b[A-Z]\w*(\.[A-Z]\w*)+")
+# Ops that only compute a value; UiPath writes these as Assign expressions,
+# so with an output variable they read as assign(<variable>)
+VALUE_OPS = {"random", "text.join", "text.length", "text.case", "datetime.now", "datetime.format"}
+ROBIN_BLOCKS = [
+    (re.compile(r"^IF\b.*\bTHEN$"), "if"),
+    (re.compile(r"^SWITCH\b"), "if"),
+    (re.compile(r"^(LOOP|WHILE)\b"), "loop"),
+    (re.compile(r"^ON BLOCK ERROR\b"), "catch"),
+    (re.compile(r"^BLOCK\b"), "try"),
+]
+ROBIN_END = re.compile(r"^END( IF| LOOP| SWITCH| BLOCK)?$")
+
+BP_OPS = {
+    "File - Write Text": "file.write", "File - Append Text": "file.append", "File - Read Text": "file.read",
+    "File - Delete": "file.delete", "Folder - Create": "folder.create", "File - Exists": "path.exists",
+    "Folder - Exists": "path.exists", "Show Message": "dialog.message", "Set Clipboard": "clipboard.set",
+    "Get Clipboard": "clipboard.get", "Get Environment Variable": "env.get",
+}
+# Ops whose target is a path rather than a variable
+PATH_OPS = ("file", "folder", "path")
+# PAD and Blue Prism have no log action; flows write a file in a logs folder
+LOG_FILE = re.compile(r"[\\/]logs?[\\/][^\\/]+\.(txt|log)$")
+
+BP_SKIPPED = {"Start", "End", "Data", "Collection", "Anchor", "Note", "Block", "ChoiceEnd", "SubSheetInfo"}
+
+
+class Node:
+    """One action or block in the IR"""
+
+    __slots__ = ("kind", "op", "target", "children", "hash", "size", "reads")
+
+    def __init__(self, kind: str, op: str, target: str = None, children: List["Node"] = None):
+        self.kind = kind
+        self.op = op
+        self.target = target
+        self.children = children if children is not None else []
+        self.hash = None
+        self.size = 1
+        self.reads = ""   # expression text of an assign, for folding
+
+    def add(self, node: "Node"):
+        """Append a child, splicing plain sequences into this block"""
+        if node.kind == "block" and node.op == "sequence":
+            self.children.extend(node.children)
+        else:
+            self.children.append(node)
+
+    def describe(self) -> str:
+        return f"{self.op}({self.target})" if self.target else self.op
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {"op": self.op}
+        if self.target:
+            entry["target"] = self.target
+        if self.kind == "block":
+            entry["children"] = [child.to_dict() for child in self.children]
+        return entry
+
+
+def action(op: str, target: str = None) -> Node:
+    if target and op.split(".")[0] in PATH_OPS:
+        target = re.sub(r"\\+", r"\\", target.strip().strip('"')).lower()
+        if op in ("file.write", "file.append") and LOG_FILE.search(target):
+            return Node("action", "log")
+    elif target:
+        target = target.strip().strip("[]").lower()
+    return Node("action", op, target or None)
+
+
+def block(op: str) -> Node:
+    return Node("block", op)
+
+
+def assign(variable: str, expression: str = "") -> Node:
+    """assign(variable) remembering the expression it reads (see fold_assigns)"""
+    node = action("assign", variable)
+    node.reads = expression or ""
+    return node
+
+
+def fold_assigns(children: List[Node]) -> List[Node]:
+    """Drop an assign the next assign makes redundant
+
+    - a temporary the next expression reads: A = f(); B = g(A) is written
+      B = g(f()) on other platforms
+    - a dead store: the next assign sets the same variable without reading it
+      (e.g. a declared default overwritten at once)
+    """
+    folded: List[Node] = []
+    for node in children:
+        while node.kind == "action" and node.op == "assign" and folded:
+            last = folded[-1]
+            if not (last.kind == "action" and last.op == "assign" and last.target):
+                break
+            reads = re.search(rf"(?<![\w.]){re.escape(last.target)}(?!\w)", node.reads, re.I)
+            if (last.target != node.target) != bool(reads):
+                break
+            folded.pop()
+            if reads:
+                # The temporary's expression is now part of this one
+                node.reads = f"{node.reads} {last.reads}"
+        folded.append(node)
+    return folded
+
+
+def finalize(node: Node) -> Node:
+    """Hash and size every subtree; catch handlers go last in a try block"""
+    if node.kind == "block":
+        node.children = fold_assigns(node.children)
+        if node.op == "try":
+            node.children.sort(key=lambda child: child.kind == "block" and child.op == "catch")
+        for child in node.children:
+            finalize(child)
+        node.size = 1 + sum(child.size for child in node.children)
+        node.hash = hash((node.op, tuple(child.hash for child in node.children)))
+    else:
+        node.hash = hash((node.op, node.target))
+    return node
+
+
+# ---------------------------------------------------------------- parsers
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def from_xaml(root: ET.Element, workflows: Dict[str, bytes] = None, _seen: frozenset = frozenset()) -> Node:
+    """IR for a XAML workflow; workflows maps file names for InvokeWorkflowFile"""
+    workflows = workflows or {}
+    tree = block("sequence")
+
+    def walk(elem: ET.Element, parent: Node):
+        name = _local(elem.tag)
+        if "." in name:
+            # Property element of a block (If.Then, Sequence.Variables, ...)
+            for child in elem:
+                walk(child, parent)
+        elif name == "Variable":
+            if elem.get("Default") is not None:
+                parent.add(assign(elem.get("Name"), elem.get("Default")))
+        elif name in XAML_BLOCKS:
+            node = block(XAML_BLOCKS[name])
+            for child in elem:
+                walk(child, node)
+            parent.add(node)
+        elif name == "InvokeWorkflowFile":
+            filename = elem.get("WorkflowFileName", "").replace("\\", "/").rsplit("/", 1)[-1]
+            if filename in workflows and filename not in _seen:
+                sub = from_xaml(_parse_xaml(workflows[filename]), workflows, _seen | {filename})
+                sub.op = "subflow"
+                parent.add(sub)
+            else:
+                parent.add(action("call", filename))
+        elif name not in XAML_IGNORED:
+            op = XAML_OPS.get(name, name.lower())
+            if op == "assign":
+                out = next((e for e in elem.iter() if _local(e.tag) == "OutArgument"), None)
+                value = next((e for e in elem.iter() if _local(e.tag) == "InArgument"), None)
+                parent.add(assign(out.text if out is not None else None,
+                                  value.text or "" if value is not None else elem.get("Value", "")))
+                return
+            target = next((elem.get(attr) for attr in XAML_PATH_ATTRS if elem.get(attr)), None)
+            parent.add(action(op, target))
+
+    walk(root, tree)
+    return tree
+
+
+def from_robin(lines) -> Node:
+    """IR for a Robin (Power Automate Desktop) script; CALLs are inlined"""
+    tree = block("sequence")
+    stack = [tree]
+    functions: Dict[str, Node] = {}
+    calls: List[Tuple[Node, int, str]] = []
+    checks = set()   # ids of File.IfFile.Exists-style blocks
+
+    for raw in lines:
+        line = (raw.decode("utf-8", "replace") if isinstance(raw, bytes) else raw).strip()
+        if not line or line.startswith("#") or line.startswith("ELSE"):
+            continue
+        if line.startswith("FUNCTION "):
+            function = block("subflow")
+            functions[line.split()[1]] = function
+            stack.append(function)
+            continue
+        if line == "END FUNCTION" or ROBIN_END.match(line):
+            if len(stack) > 1:
+                node = stack.pop()
+                # Check + SET flag is how PAD stores a path check in a variable
+                if id(node) in checks and all(c.kind == "action" and c.op == "assign" for c in node.children):
+                    stack[-1].children.remove(node)
+            continue
+        parent = stack[-1]
+        opened = next((op for pattern, op in ROBIN_BLOCKS if pattern.match(line)), None)
+        if opened:
+            node = block(opened)
+            parent.add(node)
+            stack.append(node)
+        elif line.startswith("SET "):
+            variable, _, expression = line[4:].partition(" TO ")
+            parent.add(assign(variable.strip(), expression))
+        elif line.startswith("WAIT"):
+            parent.add(action("wait"))
+        elif line.startswith("LOG"):
+            parent.add(action("log"))
+        elif line.startswith("CALL "):
+            calls.append((parent, len(parent.children), line.split()[1]))
+            parent.add(action("call", line.split()[1]))
+        else:
+            match = ROBIN_ACTION.match(line)
+            if not match:
+                continue
+            op = ROBIN_OPS.get(match.group(1), match.group(1).lower())
+            outputs = ROBIN_OUTPUT.findall(line)
+            if op in VALUE_OPS and outputs:
+                parent.add(assign(outputs[-1], ROBIN_NOT_READ.sub(" ", line[match.end():])))
+                continue
+            literal = ROBIN_LITERAL.search(line)
+            path = literal.group(1) if literal and op.split(".")[0] in PATH_OPS else None
+            parent.add(action(op, path))
+            if ".If" in match.group(0):
+                # File.IfFile.Exists ... END is a check plus a conditional block
+                node = block("if")
+                parent.add(node)
+                stack.append(node)
+                checks.add(id(node))
+
+    for parent, index, name in calls:
+        if name in functions:
+            parent.children[index] = functions[name]
+    return tree
+
+
+def from_bprelease(stream) -> Node:
+    """IR for a Blue Prism release; SubSheet stages start a subflow"""
+    tree = block("sequence")
+    stack = [tree]
+    for _, elem in ET.iterparse(stream, events=("end",)):
+        if _local(elem.tag) != "stage":
+            continue
+        stage_type = elem.get("type")
+        content = {_local(child.tag): child for child in elem}
+        elem.clear()
+        if stage_type in BP_SKIPPED:
+            continue
+        parent = stack[-1]
+        if stage_type == "SubSheet":
+            del stack[1:]
+            node = block("subflow")
+            tree.add(node)
+            stack.append(node)
+        elif stage_type in ("Decision", "ChoiceStart"):
+            node = block("if")
+            parent.add(node)
+            stack.append(node)
+        elif stage_type == "LoopStart":
+            node = block("loop")
+            parent.add(node)
+            stack.append(node)
+        elif stage_type == "LoopEnd":
+            while len(stack) > 1 and stack.pop().op != "loop":
+                pass
+        elif stage_type == "Recover":
+            # Everything so far in this block is the protected part
+            node = block("try")
+            node.children, parent.children = parent.children, [node]
+            handler = block("catch")
+            node.add(handler)
+            stack[-1:] = [parent, node, handler]
+        elif stage_type == "Resume":
+            if stack[-1].op == "catch":
+                del stack[-2:]
+        elif stage_type == "Calculation":
+            calc = content.get("calculation")
+            if calc is None:
+                parent.add(action("assign"))
+            else:
+                parent.add(assign(calc.get("stage"), calc.get("expression", "")))
+        elif stage_type == "Wait":
+            parent.add(action("wait"))
+        elif stage_type == "Action" and "action" in content:
+            act = content["action"]
+            name = act.get("name", "")
+            path = next(
+                (i.get("expr") for i in act if _local(i.tag) == "input" and "Path" in i.get("name", "")), None,
+            )
+            parent.add(action(BP_OPS.get(name, name.lower()), path))
+        else:
+            parent.add(action(stage_type.lower()))
+    return tree
+
+
+def _parse_xaml(data: bytes) -> ET.Element:
+    """Parse XAML, declaring any namespace prefix the document uses but never binds
+
+    Hand-written XAML often uses mc:Ignorable without xmlns:mc; the prefix
+    does not change what the workflow does, so it is bound to a placeholder.
+    """
+    try:
+        return ET.fromstring(data)
+    except ET.ParseError as e:
+        if "unbound prefix" not in str(e):
+            raise
+    text = data.decode("utf-8", "replace")
+    declared = set(re.findall(r"xmlns:([\w.-]+)\s*=", text)) | {"xml", "xmlns"}
+    used = set(re.findall(r"</?([A-Za-z_][\w.-]*):[A-Za-z_]", text))
+    used |= set(re.findall(r"\s([A-Za-z_][\w.-]*):[A-Za-z_][\w.-]*\s*=", text))
+    missing = sorted(used - declared)
+    declarations = "".join(f' xmlns:{prefix}="urn:undeclared:{prefix}"' for prefix in missing)
+    root_tag = re.search(r"<[A-Za-z_][\w.:-]*", re.sub(r"<\?.*?\?>|<!--.*?-->", "", text, flags=re.S))
+    start = text.index(root_tag.group(0)) + len(root_tag.group(0))
+    return ET.fromstring(text[:start] + declarations + text[start:])
+
+
+def load_ir(path: str) -> Node:
+    """Parse a workflow artifact (.nupkg/.zip/.xaml/.pad/.bprelease) into a finalized IR tree
+
+    Raises ValueError if it holds no workflow this module can read.
+    """
+    lower = path.lower()
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            names = [n for n in zf.namelist() if not n.endswith("/")]
+            by_base = {n.rsplit("/", 1)[-1]: n for n in names}
+            xaml = {base: zf.read(name) for base, name in by_base.items() if base.lower().endswith(".xaml")}
+            if xaml:
+                main = "Main.xaml"
+                if "project.json" in by_base:
+                    main = json.loads(zf.read(by_base["project.json"])).get("main", main).rsplit("/", 1)[-1]
+                if main not in xaml:
+                    main = sorted(xaml)[0]
+                return finalize(from_xaml(_parse_xaml(xaml[main]), xaml, frozenset([main])))
+            for base, name in by_base.items():
+                if base.lower().endswith(".pad"):
+                    return finalize(from_robin(zf.read(name).splitlines()))
+                if base.lower().endswith(".bprelease"):
+                    with zf.open(name) as stream:
+                        return finalize(from_bprelease(stream))
+        raise ValueError(f"{path}: no XAML, Robin or Blue Prism workflow inside")
+    if lower.endswith(".xaml"):
+        with open(path, "rb") as f:
+            return finalize(from_xaml(_parse_xaml(f.read())))
+    if lower.endswith(".bprelease"):
+        with open(path, "rb") as f:
+            return finalize(from_bprelease(f))
+    if lower.endswith((".pad", ".txt", ".robin")):
+        with open(path, "rb") as f:
+            return finalize(from_robin(f))
+    raise ValueError(f"{path}: unsupported workflow format")
+
+
+# ---------------------------------------------------------------- diff
+
+def _unique_anchors(a: List[Node], b: List[Node]) -> List[Tuple[int, int]]:
+    """In-order (i, j) pairs for hashes occurring exactly once on each side"""
+    counts: Dict[int, List[int]] = {}
+    for i, node in enumerate(a):
+        entry = counts.setdefault(node.hash, [0, 0, i, -1])
+        entry[0] += 1
+    for j, node in enumerate(b):
+        entry = counts.get(node.hash)
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+    anchors, last_j = [], -1
+    for i, node in enumerate(a):
+        ca, cb, ai, bj = counts[node.hash]
+        if ca == 1 and cb == 1 and bj > last_j:
+            anchors.append((i, bj))
+            last_j = bj
+    return anchors
+
+
+def _match_gap(a: List[Node], b: List[Node], a0: int, a1: int, b0: int, b1: int) -> List[Tuple]:
+    """Pairs for a[a0:a1] vs b[b0:b1]: hash matches in order, then by position"""
+    positions: Dict[int, deque] = {}
+    for j in range(b0, b1):
+        positions.setdefault(b[j].hash, deque()).append(j)
+    matches, last_j = [], b0 - 1
+    for i in range(a0, a1):
+        queue = positions.get(a[i].hash)
+        while queue and queue[0] <= last_j:
+            queue.popleft()
+        if queue:
+            last_j = queue.popleft()
+            matches.append((i, last_j))
+
+    pairs = []
+    prev_i, prev_j = a0, b0
+    for i, j in matches + [(a1, b1)]:
+        left, right = list(range(prev_i, i)), list(range(prev_j, j))
+        for k in range(max(len(left), len(right))):
+            pairs.append((left[k] if k < len(left) else None, right[k] if k < len(right) else None))
+        if i < a1:
+            pairs.append((i, j))
+        prev_i, prev_j = i + 1, j + 1
+    return pairs
+
+
+def align(a: List[Node], b: List[Node]) -> List[Tuple[Optional[int], Optional[int]]]:
+    """Align two child lists; (i, None) is missing, (None, j) extra"""
+    start = 0
+    while start < len(a) and start < len(b) and a[start].hash == b[start].hash:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1].hash == b[end_b - 1].hash:
+        end_a -= 1
+        end_b -= 1
+
+    pairs = [(i, i) for i in range(start)]
+    prev_i, prev_j = start, start
+    middle = _unique_anchors(a[start:end_a], b[start:end_b])
+    for i, j in [(i + start, j + start) for i, j in middle] + [(end_a, end_b)]:
+        pairs.extend(_match_gap(a, b, prev_i, i, prev_j, j))
+        if i < end_a:
+            pairs.append((i, j))
+        prev_i, prev_j = i + 1, j + 1
+    offset = len(b) - len(a)
+    pairs.extend((i, i + offset) for i in range(end_a, len(a)))
+    return pairs
+
+
+def diff_trees(source: Node, converted: Node) -> Dict[str, Any]:
+    """Missing, extra and changed actions between two finalized IR trees"""
+    report = {"matched": 0, "missing": [], "extra": [], "changed": []}
+
+    def compare(a: Node, b: Node, path: str):
+        for i, j in align(a.children, b.children):
+            x = a.children[i] if i is not None else None
+            y = b.children[j] if j is not None else None
+            where = f"{path}/{i if i is not None else j}"
+            if x is None:
+                report["extra"].append({"path": where, "converted": y.describe(), "actions": y.size})
+            elif y is None:
+                report["missing"].append({"path": where, "source": x.describe(), "actions": x.size})
+            elif x.hash == y.hash:
+                report["matched"] += x.size
+            elif x.kind == y.kind == "block" and x.op == y.op:
+                report["matched"] += 1
+                compare(x, y, f"{where}:{x.op}")
+            elif x.kind == y.kind == "action":
+                report["changed"].append({"path": where, "source": x.describe(), "converted": y.describe()})
+            else:
+                report["missing"].append({"path": where, "source": x.describe(), "actions": x.size})
+                report["extra"].append({"path": where, "converted": y.describe(), "actions": y.size})
+
+    if source.hash == converted.hash:
+        report["matched"] = source.size
+    else:
+        compare(source, converted, "")
+    report["equivalent"] = not (report["missing"] or report["extra"] or report["changed"])
+    return report
+
+
+def diff_artifacts(source_path: str, converted_path: str) -> Dict[str, Any]:
+    """diff_trees for two artifact files
+
+    Never raises: if either file cannot be parsed, or the comparison itself
+    fails on an unexpected shape, the report says so ("equivalent" is None
+    and "error" names the file or the failure). The diff is advisory, so a
+    converted artifact that validated must not turn into an error here.
+    """
+    def failed(message: str) -> Dict[str, Any]:
+        return {"equivalent": None, "matched": 0, "missing": [], "extra": [], "changed": [], "error": message}
+
+    trees = []
+    for path in (source_path, converted_path):
+        try:
+            trees.append(load_ir(path))
+        except (ValueError, KeyError, OSError, ET.ParseError, zipfile.BadZipFile) as e:
+            return failed(str(e) if path in str(e) else f"{path}: {e}")
+        except Exception as e:
+            # Unexpected content (a non-dict project.json, an odd XML root, ...)
+            return failed(f"{path}: {type(e).__name__}: {e}")
+    try:
+        return diff_trees(*trees)
+    except Exception as e:
+        return failed(f"diff failed: {type(e).__name__}: {e}")
+
+
+def summarize(report: Dict[str, Any], limit: int = 10) -> Dict[str, Any]:
+    """Counts plus the first few entries of each list, for result records"""
+    summary = {"equivalent": report["equivalent"], "matched": report["matched"]}
+    if report.get("error"):
+        summary["error"] = report["error"]
+    for kind in ["missing", "extra", "changed"]:
+        summary[kind] = len(report[kind])
+        if report[kind]:
+            summary[f"{kind}_sample"] = report[kind][:limit]
+    return summary
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2:
+        print(__doc__)
+        return
+    report = diff_trees(load_ir(args[0]), load_ir(args[1]))
+    if "--json" in sys.argv:
+        print(json.dumps(report, indent=2))
+    else:
+        for kind in ["missing", "extra", "changed"]:
+            for entry in report[kind]:
+                detail = " -> ".join(entry[k] for k in ["source", "converted"] if k in entry)
+                print(f"{kind.upper():8} {entry['path']:20} {detail}")
+        print(f"{os.path.basename(args[0])} vs {os.path.basename(args[1])}: {report['matched']} matched, "
+              f"{len(report['missing'])} missing, {len(report['extra'])} extra, {len(report['changed'])} changed")
+    sys.exit(0 if report["equivalent"] else 1)
+
+
+if __name__ == "__main__":
+    main()
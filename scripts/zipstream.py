@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Incremental ZIP extraction from a byte stream
+
+StreamingZipExtractor is fed a ZIP download chunk by chunk and writes each
+entry to disk as soon as its bytes arrive, walking local file headers instead
+of the central directory at the end of the archive. A SHA-256 and CRC check is
+computed for every entry on the way through, so no second pass over the zip is
+needed.
+
+Entries that cannot be delimited from the stream alone (stored with a trailing
+data descriptor, or an unsupported compression method) set `unsupported`; the
+caller should then fall back to extract_zip_file() once the download is done.
+"""
+
+import os
+import struct
+import hashlib
+import zipfile
+import zlib
+from typing import Optional, Dict, Any, List
+
+LOCAL_HEADER_SIG = 0x04034B50
+CENTRAL_DIR_SIG = 0x02014B50
+END_OF_CENTRAL_DIR_SIG = 0x06054B50
+DATA_DESCRIPTOR_SIG = 0x08074B50
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+ZIP64_EXTRA_ID = 0x0001
+
+STORED = 0
+DEFLATED = 8
+
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+
+def safe_join(root: str, name: str) -> str:
+    """Join an archive member name under root, refusing paths that escape it"""
+    path = os.path.normpath(os.path.join(root, name))
+    root = os.path.normpath(root)
+    if os.path.isabs(name) or os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Unsafe path in archive: {name}")
+    return path
+
+
+def _extra_field(extra: bytes, header_id: int) -> Optional[bytes]:
+    """Payload of one extra-field record, or None if absent"""
+    pos = 0
+    while pos + 4 <= len(extra):
+        field_id, size = struct.unpack_from("<HH", extra, pos)
+        if field_id == header_id:
+            return extra[pos + 4:pos + 4 + size]
+        pos += 4 + size
+    return None
+
+
+class StreamingZipExtractor:
+    """Extracts ZIP entries into dest_dir as chunks are fed in"""
+
+    def __init__(self, dest_dir: str):
+        self.dest_dir = dest_dir
+        self.files: List[Dict[str, Any]] = []
+        self.unsupported: Optional[str] = None
+        self.done = False
+        self._buf = bytearray()
+        self._entry: Optional[Dict[str, Any]] = None
+        self._out = None
+        self._sha = None
+        self._crc = 0
+        self._size = 0
+        self._remaining = 0
+        self._inflate = None
+        self._await_descriptor = False
+
+    def feed(self, chunk: bytes):
+        """Consume the next chunk of the archive"""
+        if self.done or self.unsupported:
+            return
+        self._buf += chunk
+        while not self.done and not self.unsupported:
+            if self._await_descriptor:
+                if not self._read_descriptor():
+                    return
+            elif self._entry is None:
+                if not self._read_header():
+                    return
+            elif not self._read_data():
+                return
+
+    def close(self):
+        """Release and remove any half-written entry (e.g. when the download is abandoned)"""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+            path = (self._entry or {}).get("path")
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def _read_header(self) -> bool:
+        if len(self._buf) < 4:
+            return False
+        (sig,) = struct.unpack_from("<I", self._buf)
+        if sig in (CENTRAL_DIR_SIG, END_OF_CENTRAL_DIR_SIG):
+            self.done = True
+            self._buf.clear()
+            return False
+        if sig != LOCAL_HEADER_SIG:
+            self.unsupported = f"unexpected signature 0x{sig:08x}"
+            return False
+        if len(self._buf) < LOCAL_HEADER.size:
+            return False
+
+        (_, _, flags, method, _, _, crc, csize, usize, name_len, extra_len) = LOCAL_HEADER.unpack_from(self._buf)
+        header_len = LOCAL_HEADER.size + name_len + extra_len
+        if len(self._buf) < header_len:
+            return False
+
+        raw_name = bytes(self._buf[LOCAL_HEADER.size:LOCAL_HEADER.size + name_len])
+        name = raw_name.decode("utf-8" if flags & FLAG_UTF8 else "cp437")
+        extra = bytes(self._buf[LOCAL_HEADER.size + name_len:header_len])
+        del self._buf[:header_len]
+
+        if csize == 0xFFFFFFFF or usize == 0xFFFFFFFF:
+            usize, csize = self._zip64_sizes(extra, usize, csize)
+
+        has_descriptor = bool(flags & FLAG_DATA_DESCRIPTOR)
+        if method not in (STORED, DEFLATED):
+            self.unsupported = f"{name}: compression method {method}"
+            return False
+        if method == STORED and has_descriptor:
+            self.unsupported = f"{name}: stored entry with data descriptor"
+            return False
+
+        self._entry = {
+            "name": name,
+            "method": method,
+            "crc": crc,
+            "compressed_size": csize,
+            "size": usize,
+            "has_descriptor": has_descriptor,
+            "zip64": _extra_field(extra, ZIP64_EXTRA_ID) is not None,
+        }
+        self._sha = hashlib.sha256()
+        self._crc = 0
+        self._size = 0
+        self._remaining = csize
+        self._inflate = zlib.decompressobj(-15) if method == DEFLATED else None
+
+        path = safe_join(self.dest_dir, name)
+        self._entry["path"] = path
+        if name.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._out = open(path, "wb")
+        return True
+
+    @staticmethod
+    def _zip64_sizes(extra: bytes, usize: int, csize: int):
+        fields = _extra_field(extra, ZIP64_EXTRA_ID) or b""
+        offset = 0
+        if usize == 0xFFFFFFFF and len(fields) >= offset + 8:
+            (usize,) = struct.unpack_from("<Q", fields, offset)
+            offset += 8
+        if csize == 0xFFFFFFFF and len(fields) >= offset + 8:
+            (csize,) = struct.unpack_from("<Q", fields, offset)
+        return usize, csize
+
+    def _write(self, data: bytes):
+        if not data:
+            return
+        self._sha.update(data)
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        if self._out is not None:
+            self._out.write(data)
+
+    def _read_data(self) -> bool:
+        entry = self._entry
+        if entry["has_descriptor"]:
+            # Deflate streams mark their own end; whatever follows is the descriptor
+            data = bytes(self._buf)
+            self._buf.clear()
+            self._write(self._inflate.decompress(data))
+            if not self._inflate.eof:
+                return False
+            self._buf[:0] = self._inflate.unused_data
+            self._await_descriptor = True
+            return True
+
+        take = min(self._remaining, len(self._buf))
+        data = bytes(self._buf[:take])
+        del self._buf[:take]
+        self._remaining -= take
+        self._write(self._inflate.decompress(data) if self._inflate else data)
+        if self._remaining:
+            return False
+        if self._inflate:
+            self._write(self._inflate.flush())
+        self._finish_entry(entry["crc"])
+        return True
+
+    def _read_descriptor(self) -> bool:
+        size_len = 8 if self._entry["zip64"] else 4
+        if len(self._buf) < 4:
+            return False
+        (sig,) = struct.unpack_from("<I", self._buf)
+        skip = 4 if sig == DATA_DESCRIPTOR_SIG else 0
+        need = skip + 4 + 2 * size_len
+        if len(self._buf) < need:
+            return False
+        (crc,) = struct.unpack_from("<I", self._buf, skip)
+        del self._buf[:need]
+        self._await_descriptor = False
+        self._finish_entry(crc)
+        return True
+
+    def _finish_entry(self, expected_crc: int):
+        entry = self._entry
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+        if not entry["name"].endswith("/"):
+            self.files.append({
+                "name": entry["name"],
+                "path": entry["path"],
+                "size": self._size,
+                "sha256": self._sha.hexdigest(),
+                "crc_ok": (self._crc & 0xFFFFFFFF) == expected_crc,
+            })
+        self._entry = None
+        self._inflate = None
+
+
+def extract_zip_file(zip_path: str, dest_dir: str) -> List[Dict[str, Any]]:
+    """Extract a finished ZIP from disk, hashing each entry (fallback path)"""
+    files = []
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            path = safe_join(dest_dir, info.filename)
+            if info.is_dir():
+                os.makedirs(path, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            sha = hashlib.sha256()
+            crc = 0
+            with zf.open(info) as src, open(path, "wb") as out:
+                for block in iter(lambda: src.read(1024 * 1024), b""):
+                    sha.update(block)
+                    crc = zlib.crc32(block, crc)
+                    out.write(block)
+            files.append({
+                "name": info.filename,
+                "path": path,
+                "size": info.file_size,
+                "sha256": sha.hexdigest(),
+                "crc_ok": (crc & 0xFFFFFFFF) == info.CRC,
+            })
+    return files